@@ -3,12 +3,22 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, status, HTTPException, Request
 from fastapi.responses import ORJSONResponse
 import os
+from datetime import datetime
 import psycopg2 as ps
 from routes import index
-from database import Base, engine
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
 from routes.auth import limiter
+from middleware.upload_limit import UploadLimitMiddleware
+from middleware.query_instrumentation import QueryInstrumentationMiddleware
+from apscheduler.schedulers.background import BackgroundScheduler
+from utils.task_counters import reconcile_task_counters
+from utils.activity_partitions import maintain_activity_partitions
+from utils.blob_store import sweep_blobs
+import mailer
+from utils.activity import start_activity_writer, stop_activity_writer
+from utils.notification_broker import broker as notification_broker
+from routes.notifications import send_notification_to_user
 
 load_dotenv()
 
@@ -18,6 +28,12 @@ app.state.limiter = limiter
 # Add SlowAPI middleware
 app.add_middleware(SlowAPIMiddleware)
 
+# Reject oversized uploads before the multipart body is parsed
+app.add_middleware(UploadLimitMiddleware)
+
+# Per-request SQL counts: Server-Timing header, N+1 / budget logging
+app.add_middleware(QueryInstrumentationMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,8 +59,64 @@ except Exception as e:
     print(e)
     raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database connection failed")
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic: run `alembic upgrade head` before starting.
+
+# Background jobs
+scheduler = BackgroundScheduler()
+
+
+@app.on_event("startup")
+def start_background_jobs():
+    # Rebuild task counters on boot and periodically afterwards to correct
+    # drift. Every worker schedules it; only the one holding the leader lock
+    # runs it.
+    scheduler.add_job(
+        reconcile_task_counters,
+        "interval",
+        minutes=int(os.getenv("COUNTER_RECONCILE_MINUTES", "60")),
+        next_run_time=datetime.now(),
+        id="reconcile_task_counters",
+        replace_existing=True,
+    )
+    # Create upcoming activity_logs partitions and apply retention.
+    scheduler.add_job(
+        maintain_activity_partitions,
+        "interval",
+        hours=int(os.getenv("ACTIVITY_PARTITION_MAINTENANCE_HOURS", "24")),
+        next_run_time=datetime.now(),
+        id="maintain_activity_partitions",
+        replace_existing=True,
+    )
+    # Remove attachment blobs nothing references any more.
+    scheduler.add_job(
+        sweep_blobs,
+        "interval",
+        minutes=int(os.getenv("BLOB_SWEEP_MINUTES", "60")),
+        id="sweep_blobs",
+        replace_existing=True,
+    )
+    scheduler.start()
+    mailer.start_mail_workers()
+    start_activity_writer()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    scheduler.shutdown(wait=False)
+    mailer.stop_mail_workers()
+    stop_activity_writer()
+
+
+@app.on_event("startup")
+async def start_notification_broker():
+    # Subscribe this worker and deliver to the websockets it holds.
+    await notification_broker.start(send_notification_to_user)
+
+
+@app.on_event("shutdown")
+async def stop_notification_broker():
+    await notification_broker.stop()
+
 
 @app.get('/')
 async def root():
@@ -1,20 +1,122 @@
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from utils import metrics
+from utils.query_stats import instrument_queries
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# asyncpg driver for the async routes; override when the sync URL carries
+# psycopg2-only query options (e.g. sslmode).
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or make_url(DATABASE_URL).set(
+    drivername="postgresql+asyncpg"
+)
 
-engine = create_engine(DATABASE_URL)
+# Pool sizing is per uvicorn worker and per engine: the database sees up to
+# workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections in total.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+
+class PoolWaitMixin:
+    """Records how long callers wait for a connection from the pool."""
+
+    metrics_name = "db.pool"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            metrics.incr(f"{self.metrics_name}.checkout_failed")
+            raise
+        finally:
+            metrics.observe(
+                f"{self.metrics_name}.checkout_wait", time.perf_counter() - start
+            )
+
+
+class InstrumentedQueuePool(PoolWaitMixin, QueuePool):
+    metrics_name = "db.pool"
+
+
+class InstrumentedAsyncQueuePool(PoolWaitMixin, AsyncAdaptedQueuePool):
+    metrics_name = "db.async_pool"
+
+
+def instrument_pool(engine, name):
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr(f"{name}.connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr(f"{name}.checkouts")
+        if engine.pool.overflow() > 0:
+            metrics.incr(f"{name}.overflow_checkouts")
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.observe(f"{name}.hold_time", time.perf_counter() - checked_out_at)
+
+    metrics.register_gauge(
+        name,
+        lambda: {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+            "idle": engine.pool.checkedin(),
+            "max_overflow": DB_MAX_OVERFLOW,
+        },
+    )
+
+
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_pool(engine, "db.pool")
+instrument_queries(engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+instrument_pool(async_engine.sync_engine, "db.async_pool")
+instrument_queries(async_engine.sync_engine)
+
 Base = declarative_base()
 
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,18 +1,44 @@
 from email.message import EmailMessage
+from datetime import datetime
 import smtplib
 import os
+import json
+import queue
+import threading
+import time
 from urllib.parse import quote_plus
 
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
+EMAIL_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+EMAIL_PORT = int(os.getenv("SMTP_PORT", "587"))
 EMAIL_HOST_USER = os.getenv("SMTP_USER")
 EMAIL_HOST_PASSWORD = os.getenv("SMTP_PASS")
+# Disable for plain local SMTP stand-ins (e.g. aiosmtpd) that have no TLS.
+EMAIL_USE_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "").rstrip("/")
 
+# Delivery subsystem: messages are queued and sent by a few worker threads,
+# each keeping one authenticated SMTP connection open between messages.
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "2"))
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", "1000"))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BASE_DELAY = float(os.getenv("MAIL_RETRY_BASE_DELAY", "2"))
+MAIL_IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", "60"))
+MAIL_DEAD_LETTER_PATH = os.getenv("MAIL_DEAD_LETTER_PATH", "mail_dead_letters.jsonl")
 
-def send_email(
+_queue = queue.Queue(maxsize=MAIL_QUEUE_SIZE)
+_workers = []
+_workers_lock = threading.Lock()
+_dead_letter_lock = threading.Lock()
+_stop = threading.Event()
+# Messages waiting out a retry delay: id(msg) -> (timer, msg, purpose, attempts)
+_retries = {}
+_retries_lock = threading.Lock()
+
+
+def _build_message(
     to: str, subject: str, body_text: str | None = None, body_html: str | None = None
-) -> bool:
+) -> EmailMessage:
     if not to or "@" not in to:
         raise ValueError(f"Invalid recipient email: {to}")
 
@@ -25,12 +51,179 @@ def send_email(
         msg.set_content(body_text)
     if body_html:
         msg.add_alternative(body_html, subtype="html")
+    return msg
 
-    with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT) as server:
-        server.ehlo()
+
+def _open_connection() -> smtplib.SMTP:
+    server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT, timeout=30)
+    server.ehlo()
+    if EMAIL_USE_STARTTLS:
         server.starttls()
+        server.ehlo()
+    if EMAIL_HOST_USER and EMAIL_HOST_PASSWORD:
         server.login(EMAIL_HOST_USER, EMAIL_HOST_PASSWORD)
-        server.send_message(msg)
+    return server
+
+
+def _close_connection(server):
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _dead_letter(msg: EmailMessage, purpose: str | None, attempts: int, error: str):
+    # Metadata only: bodies carry reset links, verification and invite
+    # tokens and OTPs. To resend, issue a fresh token for the recipient.
+    record = {
+        "to": msg["To"],
+        "subject": msg["Subject"],
+        "purpose": purpose,
+        "attempts": attempts,
+        "error": error,
+        "failed_at": datetime.utcnow().isoformat(),
+    }
+    with _dead_letter_lock:
+        with open(MAIL_DEAD_LETTER_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    print(f"Email to {msg['To']} moved to dead letters after {attempts} attempts: {error}")
+
+
+def _enqueue(msg: EmailMessage, purpose: str | None, attempts: int = 0):
+    try:
+        _queue.put_nowait((msg, purpose, attempts))
+    except queue.Full:
+        _dead_letter(msg, purpose, attempts, "mail queue full")
+
+
+def _retry_or_dead_letter(msg: EmailMessage, purpose: str | None, attempts: int, error: str):
+    if attempts >= MAIL_MAX_ATTEMPTS or _stop.is_set():
+        _dead_letter(msg, purpose, attempts, error)
+        return
+    delay = MAIL_RETRY_BASE_DELAY * (2 ** (attempts - 1))
+    timer = threading.Timer(delay, _retry_due, args=(id(msg),))
+    timer.daemon = True
+    with _retries_lock:
+        _retries[id(msg)] = (timer, msg, purpose, attempts)
+    timer.start()
+
+
+def _retry_due(key: int):
+    with _retries_lock:
+        pending = _retries.pop(key, None)
+    if pending is None:
+        return  # already dead-lettered by stop_mail_workers
+    _, msg, purpose, attempts = pending
+    if _stop.is_set():
+        _dead_letter(msg, purpose, attempts, "mailer stopped before retry")
+    else:
+        _enqueue(msg, purpose, attempts)
+
+
+def _worker():
+    server = None
+    last_used = 0.0
+    while not _stop.is_set() or not _queue.empty():
+        try:
+            batch = [_queue.get(timeout=1)]
+        except queue.Empty:
+            if server is not None and time.monotonic() - last_used > MAIL_IDLE_TIMEOUT:
+                _close_connection(server)
+                server = None
+            continue
+
+        # Drain whatever else is already waiting and send it over the same
+        # connection.
+        while len(batch) < MAIL_BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        for msg, purpose, attempts in batch:
+            attempts += 1
+            try:
+                sent = False
+                if server is not None:
+                    try:
+                        server.send_message(msg)
+                        sent = True
+                    except smtplib.SMTPServerDisconnected:
+                        # The server dropped the kept-alive connection. That
+                        # says nothing about this message, so reconnect and
+                        # send it again within the same attempt.
+                        _close_connection(server)
+                        server = None
+                if not sent:
+                    server = _open_connection()
+                    server.send_message(msg)
+                last_used = time.monotonic()
+            except smtplib.SMTPRecipientsRefused as e:
+                # Permanent per-recipient failure, retrying will not help.
+                _dead_letter(msg, purpose, attempts, str(e))
+            except Exception as e:
+                _close_connection(server)
+                server = None
+                _retry_or_dead_letter(msg, purpose, attempts, str(e))
+            finally:
+                _queue.task_done()
+
+    _close_connection(server)
+
+
+def start_mail_workers():
+    with _workers_lock:
+        if _workers:
+            return
+        _stop.clear()
+        for i in range(MAIL_WORKERS):
+            worker = threading.Thread(target=_worker, name=f"mailer-{i}", daemon=True)
+            worker.start()
+            _workers.append(worker)
+
+
+def stop_mail_workers(timeout: float = 10):
+    """Drain the queue, then close the workers' SMTP connections.
+
+    Messages still waiting out a retry delay, or left queued when the
+    workers do not finish in time, go to the dead letter file.
+    """
+    with _workers_lock:
+        _stop.set()
+        with _retries_lock:
+            pending = list(_retries.values())
+            _retries.clear()
+        for timer, msg, purpose, attempts in pending:
+            timer.cancel()
+            _dead_letter(msg, purpose, attempts, "mailer stopped before retry")
+        for worker in _workers:
+            worker.join(timeout)
+        _workers.clear()
+        while True:
+            try:
+                msg, purpose, attempts = _queue.get_nowait()
+            except queue.Empty:
+                break
+            _dead_letter(msg, purpose, attempts, "mailer stopped before delivery")
+            _queue.task_done()
+
+
+def send_email(
+    to: str,
+    subject: str,
+    body_text: str | None = None,
+    body_html: str | None = None,
+    purpose: str | None = None,
+) -> bool:
+    """Queue a message for delivery; returns once it is queued, not sent."""
+    msg = _build_message(to, subject, body_text, body_html)
+    start_mail_workers()
+    _enqueue(msg, purpose)
     return True
 
 
@@ -81,4 +274,4 @@ def generate_email(
         text = f"Message: {token}"
         html = f"<p>{token}</p>"
 
-    return send_email(to, subject, text, html)
+    return send_email(to, subject, text, html, purpose)
@@ -1,9 +1,13 @@
 from fastapi import Depends, status, HTTPException
 from fastapi.responses import JSONResponse
 import jwt
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_async_db
 from models import User
+from schema.user import CurrentUser
+from middleware.principal_cache import get_principal, put_principal
 import os
 from dotenv import load_dotenv
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -12,15 +16,8 @@ load_dotenv()
 
 security = HTTPBearer()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    token = credentials.credentials
+def _decode_token(token: str):
     try:
         payload = jwt.decode(token, os.getenv("JWT_SECRET"), algorithms=[os.getenv("ALGORITHM")])
         user_id: str = payload.get("userId")
@@ -34,12 +31,38 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
-    
-    user = db.query(User).filter(User.id == user_id).first()
+    return payload
+
+
+def _cache_principal(token: str, payload: dict, user):
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    return user
+
+    principal = CurrentUser.model_validate(user)
+    put_principal(token, principal, payload.get("exp"))
+    return principal
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+    token = credentials.credentials
+    principal = get_principal(token)
+    if principal is not None:
+        return principal
+
+    payload = _decode_token(token)
+    user = db.query(User).filter(User.id == payload["userId"]).first()
+    return _cache_principal(token, payload, user)
+
+
+async def get_current_user_async(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
+    token = credentials.credentials
+    principal = get_principal(token)
+    if principal is not None:
+        return principal
+
+    payload = _decode_token(token)
+    result = await db.execute(select(User).where(User.id == payload["userId"]))
+    return _cache_principal(token, payload, result.scalars().first())
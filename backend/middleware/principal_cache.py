@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils import metrics
+
+# Bounded LRU of verified bearer token -> CurrentUser principal.
+# Invalidation is per worker process, so PRINCIPAL_CACHE_TTL also bounds how
+# long another worker may serve a stale profile after an update.
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # token -> (expires_at, principal)
+_tokens_by_user = {}  # user id -> set of tokens
+
+
+def _drop(token):
+    entry = _entries.pop(token, None)
+    if entry is None:
+        return
+    user_id = str(entry[1].id)
+    tokens = _tokens_by_user.get(user_id)
+    if tokens is not None:
+        tokens.discard(token)
+        if not tokens:
+            del _tokens_by_user[user_id]
+
+
+def get_principal(token: str):
+    now = time.time()
+    with _lock:
+        entry = _entries.get(token)
+        if entry is not None:
+            if entry[0] > now:
+                _entries.move_to_end(token)
+                metrics.incr("auth.principal_cache.hit")
+                return entry[1]
+            _drop(token)
+    metrics.incr("auth.principal_cache.miss")
+    return None
+
+
+def put_principal(token: str, principal, token_exp=None):
+    expires_at = time.time() + PRINCIPAL_CACHE_TTL
+    if token_exp is not None:
+        expires_at = min(expires_at, token_exp)
+    with _lock:
+        _drop(token)
+        _entries[token] = (expires_at, principal)
+        _tokens_by_user.setdefault(str(principal.id), set()).add(token)
+        while len(_entries) > PRINCIPAL_CACHE_SIZE:
+            _drop(next(iter(_entries)))
+
+
+def invalidate_user(user_id):
+    """Forget every cached token of a user (profile/password change, delete)."""
+    with _lock:
+        for token in list(_tokens_by_user.get(str(user_id), ())):
+            _drop(token)
+    metrics.incr("auth.principal_cache.invalidations")
+
+
+metrics.register_gauge("auth.principal_cache.size", lambda: len(_entries))
@@ -0,0 +1,104 @@
+import os
+import time
+from collections import Counter
+import orjson
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import MutableHeaders
+from utils import metrics
+from utils.query_stats import track_queries
+
+# Default per-request query budget; endpoints can set their own with
+# utils.query_stats.query_budget.
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "30"))
+# The same statement this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+# Strict mode (for tests / CI): violating requests fail with a 500
+QUERY_STRICT = os.getenv("QUERY_STRICT", "false").lower() in ("1", "true", "yes")
+# Log every request, not only the ones with problems
+QUERY_LOG_ALL = os.getenv("QUERY_LOG_ALL", "false").lower() in ("1", "true", "yes")
+
+
+class QueryInstrumentationMiddleware:
+    """Counts the SQL each HTTP request issues.
+
+    Adds a Server-Timing header (db time, query and row counts), logs a JSON
+    line for requests over their query budget or repeating a statement N+1
+    style, and in strict mode replaces their response with a 500. Queries
+    run while a streaming body is sent are not counted.
+    """
+
+    def __init__(self, app, budget: int = QUERY_BUDGET, strict: bool = QUERY_STRICT):
+        self.app = app
+        self.budget = budget
+        self.strict = strict
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        replaced = False
+
+        with track_queries() as stats:
+
+            async def instrumented_send(message):
+                nonlocal replaced
+                if replaced:
+                    return
+                if message["type"] == "http.response.start":
+                    problems = self.problems(scope, stats)
+                    self.report(scope, message["status"], stats, problems, started)
+                    if problems and self.strict:
+                        replaced = True
+                        response = ORJSONResponse(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            content={"message": "Query budget exceeded", "problems": problems},
+                        )
+                        return await response(scope, receive, send)
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows"',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, instrumented_send)
+
+    def budget_for(self, scope) -> int:
+        # The router has filled in the endpoint by the time a response starts
+        return getattr(scope.get("endpoint"), "query_budget", self.budget)
+
+    def problems(self, scope, stats) -> list:
+        problems = []
+        budget = self.budget_for(scope)
+        if stats.queries > budget:
+            metrics.incr("db.query_budget_exceeded")
+            problems.append(f"{stats.queries} queries (budget {budget})")
+        repeated = Counter(sql for sql, _, _ in stats.statements)
+        for sql, count in repeated.most_common():
+            if count < N_PLUS_ONE_THRESHOLD:
+                break
+            metrics.incr("db.n_plus_one")
+            problems.append(f"N+1: {count}x {sql}")
+        return problems
+
+    def report(self, scope, status_code: int, stats, problems: list, started: float):
+        if not (problems or QUERY_LOG_ALL):
+            return
+        route = scope.get("route")
+        print(
+            orjson.dumps(
+                {
+                    "event": "request_sql",
+                    "method": scope["method"],
+                    "path": getattr(route, "path", scope["path"]),
+                    "status": status_code,
+                    "queries": stats.queries,
+                    "rows": stats.rows,
+                    "db_ms": round(stats.duration * 1000, 3),
+                    "total_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "problems": problems,
+                }
+            ).decode()
+        )
@@ -0,0 +1,67 @@
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from utils.uploads import MAX_UPLOAD_REQUEST_SIZE
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """Rejects multipart bodies over MAX_UPLOAD_REQUEST_SIZE before they are
+    parsed: by Content-Length up front, otherwise as soon as the streamed
+    body crosses the limit."""
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_REQUEST_SIZE):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        too_large = ORJSONResponse(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            content={"message": f"Upload exceeds {self.max_bytes} bytes"},
+        )
+        try:
+            content_length = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            content_length = 0
+        if content_length > self.max_bytes:
+            return await too_large(scope, receive, send)
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            # Whatever error response the app builds from BodyTooLarge is
+            # replaced by the 413 below.
+            if exceeded:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except BodyTooLarge:
+            pass
+        if exceeded and not response_started:
+            await too_large(scope, receive, send)
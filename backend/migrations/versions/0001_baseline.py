@@ -0,0 +1,255 @@
+"""Baseline schema
+
+Everything app.py used to build with Base.metadata.create_all(). Databases
+that were created that way already have these tables; they are left as they
+are and only the missing ones are created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    "users",
+    "activity_logs",
+    "notifications",
+    "verifications",
+    "workspaces",
+    "projects",
+    "workspace_invites",
+    "workspace_members",
+    "workspace_task_counters",
+    "project_members",
+    "project_task_counters",
+    "tasks",
+    "comments",
+    "task_assignees",
+]
+
+ENUMS = [
+    "actiontype",
+    "resourcetype",
+    "projectstatus",
+    "inviterole",
+    "workspacerole",
+    "role",
+    "taskstatus",
+    "taskpriority",
+]
+
+
+def create_table(name, *columns):
+    # Offline (--sql) runs cannot inspect the database; emit everything.
+    if context.is_offline_mode() or not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('password', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('profilePicture', sa.String(), nullable=True),
+    sa.Column('isEmailVerified', sa.Boolean(), nullable=True),
+    sa.Column('lastLogin', sa.DateTime(), nullable=True),
+    sa.Column('is2FAEnabled', sa.Boolean(), nullable=True),
+    sa.Column('twoFAOtp', sa.String(), nullable=True),
+    sa.Column('twoFAOtpExpires', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('activity_logs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('action', sa.Enum('created_task', 'updated_task', 'created_subtask', 'updated_subtask', 'completed_task', 'added_comment', 'added_member', 'removed_member', 'added_attachment', 'removed_attachment', name='actiontype'), nullable=False),
+    sa.Column('resource_type', sa.Enum('task', 'project', 'workspace', 'comment', 'user', name='resourcetype'), nullable=False),
+    sa.Column('resource_id', sa.UUID(), nullable=False),
+    sa.Column('details', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('notifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('message', sa.String(), nullable=False),
+    sa.Column('link', sa.String(), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('verifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('token', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('workspaces',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('color', sa.String(), nullable=True),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('projects',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Enum('planning', 'in_progress', 'on_hold', 'completed', 'cancelled', name='projectstatus'), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('progress', sa.Integer(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=False),
+    sa.Column('is_archived', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('workspace_invites',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('token', sa.String(), nullable=False),
+    sa.Column('role', sa.Enum('admin', 'member', 'viewer', name='inviterole'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('workspace_members',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('role', sa.Enum('owner', 'member', 'admin', 'viewer', name='workspacerole'), nullable=True),
+    sa.Column('joined_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('workspace_task_counters',
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('archived', sa.Integer(), nullable=False),
+    sa.Column('todo', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('review', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.Column('low', sa.Integer(), nullable=False),
+    sa.Column('medium', sa.Integer(), nullable=False),
+    sa.Column('high', sa.Integer(), nullable=False),
+    sa.Column('overdue', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('workspace_id')
+    )
+    create_table('project_members',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('role', sa.Enum('manager', 'contributor', 'viewer', name='role'), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('project_task_counters',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('archived', sa.Integer(), nullable=False),
+    sa.Column('todo', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('review', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.Column('low', sa.Integer(), nullable=False),
+    sa.Column('medium', sa.Integer(), nullable=False),
+    sa.Column('high', sa.Integer(), nullable=False),
+    sa.Column('overdue', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    create_table('tasks',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Enum('todo', 'in_progress', 'review', 'done', name='taskstatus'), nullable=True),
+    sa.Column('priority', sa.Enum('low', 'medium', 'high', name='taskpriority'), nullable=True),
+    sa.Column('watchers', sa.JSON(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('subtasks', sa.JSON(), nullable=True),
+    sa.Column('attachments', sa.JSON(), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('estimated_hours', sa.Integer(), nullable=True),
+    sa.Column('actual_hours', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=False),
+    sa.Column('is_archived', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('comments',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('text', sa.String(), nullable=False),
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('author_id', sa.UUID(), nullable=False),
+    sa.Column('mentions', sa.JSON(), nullable=True),
+    sa.Column('reactions', sa.JSON(), nullable=True),
+    sa.Column('attachments', sa.JSON(), nullable=True),
+    sa.Column('is_edited', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('task_assignees',
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'user_id')
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(TABLES):
+        op.drop_table(name)
+    for name in ENUMS:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -0,0 +1,104 @@
+"""Indexes for foreign keys and hot filters
+
+Membership checks, list endpoints and token lookups all filter on columns
+that had no index. Indexes are built CONCURRENTLY so existing deployments
+keep serving writes while this runs.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    ("ix_workspaces_owner_id", "workspaces", ["owner_id"], {}),
+    (
+        "ix_workspace_members_workspace_user",
+        "workspace_members",
+        ["workspace_id", "user_id"],
+        {},
+    ),
+    ("ix_workspace_members_user_id", "workspace_members", ["user_id"], {}),
+    (
+        "ix_workspace_invites_workspace_user",
+        "workspace_invites",
+        ["workspace_id", "user_id"],
+        {},
+    ),
+    ("ix_projects_workspace_id", "projects", ["workspace_id"], {}),
+    (
+        "ix_project_members_project_user",
+        "project_members",
+        ["project_id", "user_id"],
+        {},
+    ),
+    ("ix_project_members_user_id", "project_members", ["user_id"], {}),
+    (
+        "ix_project_task_counters_workspace_id",
+        "project_task_counters",
+        ["workspace_id"],
+        {},
+    ),
+    ("ix_tasks_project_id", "tasks", ["project_id"], {}),
+    ("ix_task_assignees_user_id", "task_assignees", ["user_id"], {}),
+    ("ix_comments_task_created", "comments", ["task_id", "created_at"], {}),
+    (
+        "ix_activity_logs_resource_created",
+        "activity_logs",
+        ["resource_id", "created_at"],
+        {},
+    ),
+    ("ix_verifications_token", "verifications", ["token"], {}),
+    ("ix_verifications_user_id", "verifications", ["user_id"], {}),
+    (
+        "ix_notifications_user_created",
+        "notifications",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        {},
+    ),
+    (
+        "ix_notifications_user_unread",
+        "notifications",
+        ["user_id"],
+        {"postgresql_where": sa.text("is_read = false")},
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,131 @@
+"""Partition activity_logs by month
+
+activity_logs becomes a RANGE (created_at) partitioned table with one
+partition per month. created_at joins the primary key, as Postgres requires
+the partition key in every unique constraint. Existing rows are copied into
+partitions covering their months; utils/activity_partitions.py creates
+future months and applies retention from then on.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, action, resource_type, resource_id, details, created_at, updated_at"
+
+
+def columns(partitioned):
+    return [
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "action",
+            postgresql.ENUM(name="actiontype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "resource_type",
+            postgresql.ENUM(name="resourcetype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("resource_id", sa.UUID(), nullable=False),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=not partitioned),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint(
+            *(("id", "created_at") if partitioned else ("id",)),
+            name="activity_logs_pkey",
+        ),
+    ]
+
+
+def rename_existing(suffix):
+    op.rename_table("activity_logs", f"activity_logs_{suffix}")
+    op.execute(
+        f"ALTER TABLE activity_logs_{suffix} "
+        f"RENAME CONSTRAINT activity_logs_pkey TO activity_logs_{suffix}_pkey"
+    )
+    op.execute(
+        "ALTER INDEX IF EXISTS ix_activity_logs_resource_created "
+        f"RENAME TO ix_activity_logs_{suffix}_resource_created"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rename_existing("unpartitioned")
+
+    op.create_table(
+        "activity_logs",
+        *columns(partitioned=True),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_activity_logs_resource_created",
+        "activity_logs",
+        ["resource_id", "created_at"],
+    )
+
+    # One partition for every month from the oldest row to three months ahead
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            part_month date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(min(COALESCE(created_at, updated_at)), now() AT TIME ZONE 'utc'))::date
+              INTO part_month FROM activity_logs_unpartitioned;
+            last_month := (date_trunc('month', now() AT TIME ZONE 'utc') + interval '3 months')::date;
+            WHILE part_month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF activity_logs FOR VALUES FROM (%L) TO (%L)',
+                    'activity_logs_y' || to_char(part_month, 'YYYY') || 'm' || to_char(part_month, 'MM'),
+                    part_month,
+                    (part_month + interval '1 month')::date
+                );
+                part_month := (part_month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO activity_logs ({COLUMNS}) "
+        "SELECT id, user_id, action, resource_type, resource_id, details, "
+        "COALESCE(created_at, updated_at, now() AT TIME ZONE 'utc'), updated_at "
+        "FROM activity_logs_unpartitioned"
+    )
+    op.drop_table("activity_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rename_existing("partitioned")
+
+    op.create_table("activity_logs", *columns(partitioned=False))
+    op.create_index(
+        "ix_activity_logs_resource_created",
+        "activity_logs",
+        ["resource_id", "created_at"],
+    )
+    op.execute(
+        f"INSERT INTO activity_logs ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM activity_logs_partitioned"
+    )
+    # Drops every monthly partition with it
+    op.drop_table("activity_logs_partitioned")
@@ -0,0 +1,184 @@
+"""Move task subtasks, watchers and attachments into child tables
+
+Every mutation used to rewrite the whole JSON array on the task row. The
+existing arrays are copied into task_subtasks, task_watchers and
+task_attachments, then the JSON columns are dropped. Older entries used
+camelCase keys (fileName, uploadedAt, ...); both spellings are read.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_PATTERN = "^[0-9a-fA-F]{8}-?([0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}$"
+
+
+def elements(column: str) -> str:
+    # Some rows hold the array serialized as a JSON string; NULLs and other
+    # values contribute nothing
+    return (
+        f"CROSS JOIN LATERAL json_array_elements(CASE json_typeof(t.{column}) "
+        f"WHEN 'array' THEN t.{column} "
+        f"WHEN 'string' THEN (t.{column} #>> '{{}}')::json "
+        f"ELSE '[]'::json END)"
+    )
+
+
+def uuid_or_new(expr: str) -> str:
+    return f"CASE WHEN {expr} ~ '{UUID_PATTERN}' THEN ({expr})::uuid ELSE gen_random_uuid() END"
+
+
+def field(name: str, legacy: str) -> str:
+    return f"COALESCE(e->>'{name}', e->>'{legacy}')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_subtasks",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_subtasks_task_created", "task_subtasks", ["task_id", "created_at"]
+    )
+    op.create_table(
+        "task_watchers",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "user_id"),
+    )
+    op.create_index("ix_task_watchers_user_id", "task_watchers", ["user_id"])
+    op.create_table(
+        "task_attachments",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("file_name", sa.String(), nullable=False),
+        sa.Column("file_url", sa.String(), nullable=False),
+        sa.Column("file_type", sa.String(), nullable=True),
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+        sa.Column("uploaded_by", sa.UUID(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["uploaded_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_attachments_task_uploaded",
+        "task_attachments",
+        ["task_id", "uploaded_at"],
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO task_subtasks (id, task_id, title, completed, created_at, updated_at)
+        SELECT {uuid_or_new("e->>'id'")},
+               t.id,
+               COALESCE(e->>'title', ''),
+               COALESCE((e->>'completed')::boolean, false),
+               COALESCE({field('created_at', 'createdAt')}::timestamp, t.created_at),
+               COALESCE({field('updated_at', 'updatedAt')}::timestamp,
+                        {field('created_at', 'createdAt')}::timestamp,
+                        t.created_at)
+        FROM tasks t {elements("subtasks")} AS e
+        ON CONFLICT (id) DO NOTHING
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO task_watchers (task_id, user_id)
+        SELECT DISTINCT t.id, u.id
+        FROM tasks t {elements("watchers")} AS w
+        JOIN users u ON u.id::text = lower(w #>> '{{}}')
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO task_attachments
+            (id, task_id, file_name, file_url, file_type, file_size, sha256,
+             uploaded_by, uploaded_at)
+        SELECT {uuid_or_new("e->>'id'")},
+               t.id,
+               COALESCE({field('file_name', 'fileName')}, 'file'),
+               COALESCE({field('file_url', 'fileUrl')}, ''),
+               {field('file_type', 'fileType')},
+               {field('file_size', 'fileSize')}::bigint,
+               e->>'sha256',
+               (SELECT u.id FROM users u
+                WHERE u.id::text = lower({field('uploaded_by', 'uploadedBy')})),
+               COALESCE({field('uploaded_at', 'uploadedAt')}::timestamp, t.updated_at)
+        FROM tasks t {elements("attachments")} AS e
+        ON CONFLICT (id) DO NOTHING
+        """
+    )
+
+    op.drop_column("tasks", "watchers")
+    op.drop_column("tasks", "subtasks")
+    op.drop_column("tasks", "attachments")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("tasks", sa.Column("watchers", sa.JSON(), nullable=True))
+    op.add_column("tasks", sa.Column("subtasks", sa.JSON(), nullable=True))
+    op.add_column("tasks", sa.Column("attachments", sa.JSON(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE tasks t SET
+            watchers = COALESCE(
+                (SELECT json_agg(w.user_id::text) FROM task_watchers w
+                 WHERE w.task_id = t.id),
+                '[]'::json),
+            subtasks = COALESCE(
+                (SELECT json_agg(json_build_object(
+                    'id', s.id::text,
+                    'title', s.title,
+                    'completed', s.completed,
+                    'created_at', s.created_at,
+                    'updated_at', s.updated_at) ORDER BY s.created_at)
+                 FROM task_subtasks s WHERE s.task_id = t.id),
+                '[]'::json),
+            attachments = COALESCE(
+                (SELECT json_agg(json_build_object(
+                    'id', a.id::text,
+                    'file_name', a.file_name,
+                    'file_url', a.file_url,
+                    'file_type', a.file_type,
+                    'file_size', a.file_size,
+                    'sha256', a.sha256,
+                    'uploaded_by', a.uploaded_by::text,
+                    'uploaded_at', a.uploaded_at) ORDER BY a.uploaded_at)
+                 FROM task_attachments a WHERE a.task_id = t.id),
+                '[]'::json)
+        """
+    )
+
+    op.drop_index("ix_task_attachments_task_uploaded", table_name="task_attachments")
+    op.drop_table("task_attachments")
+    op.drop_index("ix_task_watchers_user_id", table_name="task_watchers")
+    op.drop_table("task_watchers")
+    op.drop_index("ix_task_subtasks_task_created", table_name="task_subtasks")
+    op.drop_table("task_subtasks")
@@ -0,0 +1,75 @@
+"""Full-text search vectors for tasks, projects and comments
+
+Generated tsvector columns kept up to date by Postgres, with GIN indexes.
+Adding a stored generated column rewrites the table; the indexes are then
+built CONCURRENTLY.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TITLE_AND_DESCRIPTION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+# (table, generated expression, index name)
+VECTORS = [
+    ("tasks", TITLE_AND_DESCRIPTION, "ix_tasks_search_vector"),
+    ("projects", TITLE_AND_DESCRIPTION, "ix_projects_search_vector"),
+    ("comments", "to_tsvector('english', coalesce(text, ''))", "ix_comments_search_vector"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, expression, _ in VECTORS:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+                nullable=True,
+            ),
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for table, _, index in VECTORS:
+            op.create_index(
+                index,
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, _, index in reversed(VECTORS):
+            op.drop_index(
+                index,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    for table, _, _ in reversed(VECTORS):
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,83 @@
+"""Backfill task counter rows for every workspace and project
+
+Counter rows are now created together with their workspace or project, and
+the stats endpoint no longer creates them on first read. This fills in the
+rows older workspaces and projects are missing, counted from the tasks
+table. Existing rows are left alone.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = "t.is_archived IS NOT TRUE"
+FIELDS = [
+    "total",
+    "archived",
+    "todo",
+    "in_progress",
+    "review",
+    "done",
+    "low",
+    "medium",
+    "high",
+    "overdue",
+]
+COUNTS = [
+    "count(t.id)",
+    "count(t.id) FILTER (WHERE t.is_archived IS TRUE)",
+    *[
+        f"count(t.id) FILTER (WHERE {ACTIVE} AND t.status = '{status}')"
+        for status in ("todo", "in_progress", "review", "done")
+    ],
+    *[
+        f"count(t.id) FILTER (WHERE {ACTIVE} AND t.priority = '{priority}')"
+        for priority in ("low", "medium", "high")
+    ],
+    f"count(t.id) FILTER (WHERE {ACTIVE} AND t.status IS DISTINCT FROM 'done' "
+    "AND t.due_date < timezone('utc', now()))",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        f"""
+        INSERT INTO project_task_counters
+            (project_id, workspace_id, {", ".join(FIELDS)}, updated_at)
+        SELECT p.id, p.workspace_id, {", ".join(COUNTS)}, timezone('utc', now())
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id, p.workspace_id
+        ON CONFLICT (project_id) DO NOTHING
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO workspace_task_counters
+            (workspace_id, {", ".join(FIELDS)}, updated_at)
+        SELECT w.id, {", ".join(f"coalesce(sum(c.{f}), 0)" for f in FIELDS)},
+               timezone('utc', now())
+        FROM workspaces w
+        LEFT JOIN project_task_counters c ON c.workspace_id = w.id
+        GROUP BY w.id
+        ON CONFLICT (workspace_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The rows are valid under the previous revision too
+    pass
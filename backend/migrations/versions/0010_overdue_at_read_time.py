@@ -0,0 +1,60 @@
+"""Count overdue tasks at read time
+
+"overdue" depends on the clock, not only on task writes, so the stored
+counter drifted between reconciles (and could go negative). The columns
+are dropped; the stats endpoint counts open tasks past their due date with
+a partial index built CONCURRENTLY.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TASK = "is_archived IS NOT TRUE AND status IS DISTINCT FROM 'done'"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_column("workspace_task_counters", "overdue")
+    op.drop_column("project_task_counters", "overdue")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_project_due_open",
+            "tasks",
+            ["project_id", "due_date"],
+            postgresql_where=sa.text(OPEN_TASK),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_project_due_open",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    for table in ("workspace_task_counters", "project_task_counters"):
+        op.add_column(
+            table,
+            sa.Column("overdue", sa.Integer(), nullable=False, server_default="0"),
+        )
+    # Filled in by the next reconcile under the previous revision
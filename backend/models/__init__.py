@@ -1,12 +1,14 @@
 from .users import User
 from .workspace import Workspace, WorkspaceMember
 from .projects import Project
-from .tasks import Task
+from .tasks import Task, TaskSubtask, TaskAttachment
 from .comment import Comment
 from .activity_log import ActivityLog
 from .verification import Verification
 from .workspace_invite import WorkspaceInvite
 from .notifications import Notification
+from .task_counters import WorkspaceTaskCounter, ProjectTaskCounter
+from .blob import Blob
 
 
 __all__ = [
@@ -15,9 +17,14 @@ __all__ = [
     "WorkspaceMember",
     "Project",
     "Task",
+    "TaskSubtask",
+    "TaskAttachment",
     "Comment",
     "ActivityLog",
     "Verification",
     "WorkspaceInvite",
     "Notification",
+    "WorkspaceTaskCounter",
+    "ProjectTaskCounter",
+    "Blob",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Enum
+from sqlalchemy import Column, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from database import Base
@@ -30,6 +30,8 @@ class ResourceType(enum.Enum):
 
 
 class ActivityLog(Base):
+    # Range-partitioned by month on created_at (see utils/activity_partitions.py),
+    # so created_at is part of the primary key.
     __tablename__ = "activity_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -38,7 +40,12 @@ class ActivityLog(Base):
     resource_type = Column(Enum(ResourceType), nullable=False)
     resource_id = Column(UUID(as_uuid=True), nullable=False)
     details = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_activity_logs_resource_created", "resource_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime
+from datetime import datetime
+from database import Base
+
+
+class Blob(Base):
+    """One stored attachment body, shared by every attachment with the same
+    content. ref_count is the number of attachments pointing at it."""
+
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
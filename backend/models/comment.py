@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, ForeignKey, Boolean, DateTime, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, ForeignKey, Boolean, DateTime, JSON, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from database import Base
 from datetime import datetime
@@ -18,6 +18,18 @@ class Comment(Base):
     is_edited = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by Postgres; only the search endpoint reads it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+        )
+    )
 
     task = relationship("Task", back_populates="comments")
     author = relationship("User")
+
+    __table_args__ = (
+        Index("ix_comments_task_created", "task_id", "created_at"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,3 +26,19 @@ class Notification(Base):
     # relation
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # Feed keyset pagination: newest first, id breaks ties
+        Index(
+            "ix_notifications_user_created",
+            "user_id",
+            created_at.desc(),
+            id.desc(),
+        ),
+        # Unread badge: small partial index, counted with an index-only scan
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=(is_read == false()),
+        ),
+    )
+
@@ -7,9 +7,11 @@ from sqlalchemy import (
     Enum,
     Integer,
     JSON,
+    Index,
+    Computed,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid, enum
 from datetime import datetime
 from database import Base
@@ -37,7 +39,7 @@ class Project(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     workspace_id = Column(
-        UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False, index=True
     )
     status = Column(Enum(ProjectStatus), default=ProjectStatus.planning)
     start_date = Column(DateTime, nullable=True)
@@ -48,6 +50,21 @@ class Project(Base):
     is_archived = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by Postgres; only the search endpoint reads it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     # Relationships
     workspace = relationship("Workspace", back_populates="projects")
@@ -60,9 +77,13 @@ class ProjectMember(Base):
     __tablename__ = "project_members"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
     role = Column(Enum(Role), default=Role.contributor)
 
+    __table_args__ = (
+        Index("ix_project_members_project_user", "project_id", "user_id"),
+    )
+
     project = relationship("Project", back_populates="members")
     user = relationship("User", back_populates="project_members")
 
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from database import Base
+
+
+class TaskCounterColumns:
+    # Status / priority buckets only count non-archived tasks,
+    # "total" counts every task including archived ones. Overdue depends on
+    # the clock rather than on task writes, so it is counted when read
+    # (utils.task_counters.count_overdue).
+    total = Column(Integer, nullable=False, default=0)
+    archived = Column(Integer, nullable=False, default=0)
+    todo = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    review = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    low = Column(Integer, nullable=False, default=0)
+    medium = Column(Integer, nullable=False, default=0)
+    high = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class WorkspaceTaskCounter(TaskCounterColumns, Base):
+    __tablename__ = "workspace_task_counters"
+
+    workspace_id = Column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id"), primary_key=True
+    )
+
+
+class ProjectTaskCounter(TaskCounterColumns, Base):
+    __tablename__ = "project_task_counters"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), primary_key=True)
+    workspace_id = Column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False, index=True
+    )
+
+
+COUNTER_FIELDS = [
+    "total",
+    "archived",
+    "todo",
+    "in_progress",
+    "review",
+    "done",
+    "low",
+    "medium",
+    "high",
+]
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum, Integer, JSON, Table
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum, Integer, BigInteger, JSON, Table, Index, Computed, and_
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from database import Base
 import enum
@@ -12,6 +12,17 @@ task_assignees = Table(
     Base.metadata,
     Column("task_id", UUID(as_uuid=True), ForeignKey("tasks.id"), primary_key=True),
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
+    # The primary key covers task -> users; this covers user -> tasks
+    Index("ix_task_assignees_user_id", "user_id"),
+)
+
+# Users following a task; one row per (task, user)
+task_watchers = Table(
+    "task_watchers",
+    Base.metadata,
+    Column("task_id", UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_task_watchers_user_id", "user_id"),
 )
 
 class TaskStatus(enum.Enum):
@@ -31,23 +42,100 @@ class Task(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False, index=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.todo)
     priority = Column(Enum(TaskPriority), default=TaskPriority.medium)
-    watchers = Column(JSON, default=[])   # List of UUIDs
     tags = Column(JSON, default=[])       # List of strings
-    subtasks = Column(JSON, default=[])   # List of dicts {title, completed, createdAt}
-    attachments = Column(JSON, default=[]) # List of dicts {fileName, fileUrl, fileType, fileSize, uploadedBy, uploadedAt}
     due_date = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     estimated_hours = Column(Integer, default=0)
     actual_hours = Column(Integer, default=0)
+    # Kept in step with comments by addComment, in the same transaction
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     is_archived = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by Postgres; only the search endpoint reads it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Board columns and their "load more" pages
+        Index(
+            "ix_tasks_project_status_created",
+            "project_id",
+            "status",
+            created_at.desc(),
+            id.desc(),
+        ),
+        # Overdue counts: open tasks by due date
+        Index(
+            "ix_tasks_project_due_open",
+            "project_id",
+            "due_date",
+            postgresql_where=and_(
+                is_archived.is_not(True), status.is_distinct_from(TaskStatus.done)
+            ),
+        ),
+    )
 
     project = relationship("Project", back_populates="tasks")
     comments = relationship("Comment", back_populates="task")
     assignees = relationship("User", secondary=task_assignees, back_populates="tasks_assigned")
     created_by_user = relationship("User", foreign_keys=[created_by], back_populates="tasks_created")
+    watchers = relationship("User", secondary=task_watchers, passive_deletes=True)
+    subtasks = relationship(
+        "TaskSubtask",
+        order_by="TaskSubtask.created_at",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    attachments = relationship(
+        "TaskAttachment",
+        order_by="TaskAttachment.uploaded_at",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class TaskSubtask(Base):
+    __tablename__ = "task_subtasks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String, nullable=False)
+    completed = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_task_subtasks_task_created", "task_id", "created_at"),
+    )
+
+
+class TaskAttachment(Base):
+    __tablename__ = "task_attachments"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    file_name = Column(String, nullable=False)
+    file_url = Column(String, nullable=False)
+    file_type = Column(String, nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True)  # blobs.sha256; NULL for pre-blob uploads
+    uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    uploaded_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_task_attachments_task_uploaded", "task_id", "uploaded_at"),
+    )
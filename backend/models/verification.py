@@ -7,6 +7,6 @@ class Verification(Base):
     __tablename__ = "verifications"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    token = Column(String, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
+    token = Column(String, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -21,7 +21,9 @@ class Workspace(Base):
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     color = Column(String, default="#FF5733")
-    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    owner_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -37,9 +39,16 @@ class WorkspaceMember(Base):
     workspace_id = Column(
         UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False
     )
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    )
     role = Column(Enum(WorkspaceRole), default=WorkspaceRole.member)
     joined_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Membership checks filter on both columns
+        Index("ix_workspace_members_workspace_user", "workspace_id", "user_id"),
+    )
+
     workspace = relationship("Workspace", back_populates="members")
     user = relationship("User")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -24,3 +24,7 @@ class WorkspaceInvite(Base):
 
     user = relationship("User")
     workspace = relationship("Workspace")
+
+    __table_args__ = (
+        Index("ix_workspace_invites_workspace_user", "workspace_id", "user_id"),
+    )
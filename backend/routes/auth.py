@@ -13,7 +13,7 @@ from fastapi.responses import ORJSONResponse
 from mailer import generate_email
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from utils.verify_email import full_email_check
+from utils.verify_email import full_email_check_async
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError  # ✅ FIXED
 from dotenv import load_dotenv
@@ -21,6 +21,7 @@ import os
 from datetime import datetime, timedelta
 from models import User, Verification
 from utils.generate_otp import generate_2FA_otp
+from middleware.principal_cache import invalidate_user
 
 # Load environment variables
 load_dotenv()
@@ -48,7 +49,7 @@ async def register(
         )
 
         # Email validation
-        flags = full_email_check(email=email)
+        flags = await full_email_check_async(email)
         if flags:
             return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -482,6 +483,7 @@ async def VerifyAndResetPassword(
         ).decode("utf-8")
         db.delete(verification)
         db.commit()
+        invalidate_user(user.id)
 
         return ORJSONResponse(
             status_code=200, content={"message": "Password reset successful"}
@@ -5,6 +5,8 @@ from . import project
 from . import task
 from . import user
 from . import notifications
+from . import metrics
+from . import search
 
 router = APIRouter()
 
@@ -16,3 +18,5 @@ router.include_router(user.router, prefix="/users", tags=["User"])
 router.include_router(
     notifications.router, prefix="/notifications", tags=["Notifications"]
 )
+router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+router.include_router(search.router, prefix="/search", tags=["Search"])
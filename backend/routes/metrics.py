@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from middleware.auth_middleware import get_current_user
+from models import User
+from utils import metrics
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metrics(current_user: User = Depends(get_current_user)):
+    return metrics.snapshot()
@@ -1,19 +1,22 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Depends, Query
 from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, tuple_, update, false
 from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_async_db
 from models import User
 from models.notifications import Notification
-from typing import List, Dict
-from middleware.auth_middleware import get_current_user
+from utils.connection_manager import register, send_to_user
+from utils.pagination import encode_cursor, decode_cursor, split_page
+from middleware.auth_middleware import get_current_user, get_current_user_async
 import jwt
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 router = APIRouter()
-active_connections: Dict[str, List[WebSocket]] = {}
 
 
 def authenticate_websocket_token(token: str, db: Session) -> User:
@@ -30,40 +33,111 @@ def authenticate_websocket_token(token: str, db: Session) -> User:
 
 
 async def send_notification_to_user(user_id: str, notification_data: dict):
-    if user_id in active_connections:
-        # Send to all connections for this user (multiple tabs/devices)
-        connections_to_remove = []
-        for connection in active_connections[user_id]:
-            try:
-                await connection.send_json(notification_data)
-            except:
-                # Connection is broken, mark for removal
-                connections_to_remove.append(connection)
+    # Send to all connections for this user (multiple tabs/devices)
+    send_to_user(user_id, notification_data)
+
+
+NOTIFICATION_COLUMNS = (
+    Notification.id,
+    Notification.user_id,
+    Notification.type,
+    Notification.message,
+    Notification.link,
+    Notification.is_read,
+    Notification.created_at,
+)
+
 
-        # Remove broken connections
-        for connection in connections_to_remove:
+@router.get("/")
+async def get_notifications(
+    before: str | None = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        query = select(*NOTIFICATION_COLUMNS).where(
+            Notification.user_id == current_user.id
+        )
+        if before:
             try:
-                active_connections[user_id].remove(connection)
+                created_at, notif_id = decode_cursor(before)
             except ValueError:
-                pass
+                return ORJSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"message": "Invalid cursor"},
+                )
+            query = query.where(
+                tuple_(Notification.created_at, Notification.id)
+                < tuple_(created_at, notif_id)
+            )
+
+        # Walks ix_notifications_user_created
+        result = await db.execute(
+            query.order_by(
+                Notification.created_at.desc(), Notification.id.desc()
+            ).limit(limit + 1)
+        )
+        rows, next_cursor = split_page(
+            result.all(), limit, lambda row: encode_cursor(row.created_at, row.id)
+        )
 
-        # Clean up empty user connections
-        if not active_connections[user_id]:
-            del active_connections[user_id]
+        return {
+            "items": [dict(row._mapping) for row in rows],
+            "next_cursor": next_cursor,
+        }
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": str(e)},
+        )
 
 
-@router.get("/")
-def get_notifications(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+@router.get("/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        # Served from the partial ix_notifications_user_unread index
+        result = await db.execute(
+            select(func.count())
+            .select_from(Notification)
+            .where(
+                Notification.user_id == current_user.id,
+                Notification.is_read == false(),
+            )
+        )
+        return {"count": result.scalar_one()}
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": str(e)},
+        )
+
+
+@router.post("/mark-all-read")
+async def mark_all_as_read(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        return (
-            db.query(Notification)
-            .filter(Notification.user_id == current_user.id)
-            .order_by(Notification.created_at.desc())
-            .all()
+        result = await db.execute(
+            update(Notification)
+            .where(
+                Notification.user_id == current_user.id,
+                Notification.is_read == false(),
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
         )
+        await db.commit()
+        return {
+            "message": "All notifications marked as read",
+            "updated": result.rowcount,
+        }
     except Exception as e:
+        await db.rollback()
         return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"message": str(e)},
@@ -116,30 +190,24 @@ async def websocket_notifications(
 ):
     # Authenticate the token
     user = authenticate_websocket_token(token, db)
+    # Return the pooled connection now instead of holding it for the
+    # whole lifetime of the socket.
+    db.close()
     if not user:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
     await websocket.accept()
-    user_id = str(user.id)
-
-    # Add connection to active connections
-    if user_id not in active_connections:
-        active_connections[user_id] = []
-    active_connections[user_id].append(websocket)
+    connection = register(str(user.id), websocket)
 
     try:
         while True:
-            # Keep the connection alive by receiving messages
+            # Anything the client sends (including pongs) is a sign of life
             await websocket.receive_text()
-    except WebSocketDisconnect:
+            connection.last_seen = time.monotonic()
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the socket was already closed by an eviction
+        pass
+    finally:
         # Clean up when client disconnects
-        if user_id in active_connections:
-            try:
-                active_connections[user_id].remove(websocket)
-                # Remove user from active connections if no connections left
-                if not active_connections[user_id]:
-                    del active_connections[user_id]
-            except ValueError:
-                # Connection already removed
-                pass
+        await connection.close()
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Query, Request, Response
 from fastapi.responses import ORJSONResponse
-from database import get_db
-from middleware.auth_middleware import get_current_user
+from database import get_db, get_async_db
+from middleware.auth_middleware import get_current_user, get_current_user_async
 from schema.project import ProjectBase
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload, joinedload, noload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case, cast, or_, tuple_, String
 from models import User
 from uuid import UUID
 from models import Workspace, WorkspaceMember, Project
@@ -12,8 +13,14 @@ from models.projects import ProjectMember, Role, ProjectStatus
 from models.notifications import Notification
 from schema.project import ProjectResponse
 from schema.task import TaskBaseResponse, TaskStatus
-from models import Task
+from models import Task, TaskSubtask
+from models.task_counters import ProjectTaskCounter
+from utils.task_counters import create_task_counters
 from utils.notification_generation import create_notification
+from utils.query_stats import query_budget
+from utils.pagination import encode_cursor, decode_cursor, split_page
+from utils.task_children import load_task_children
+from utils.etags import touch, conditional_get, project_version
 
 router = APIRouter()
 
@@ -75,6 +82,7 @@ def createProject(
 
         db.add(newProject)
         db.flush()  # ✅ ensure newProject.id is available
+        create_task_counters(db, workspace_id)
 
         # add project members
         for member in members or []:
@@ -112,6 +120,7 @@ def createProject(
 
 
 @router.get("/achievements")
+@query_budget(4)
 def getAchievements(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -120,6 +129,7 @@ def getAchievements(
         completed_projects = (
             db.query(Project)
             .join(ProjectMember)
+            .options(joinedload(Project.workspace))
             .filter(
                 Project.status == ProjectStatus.completed,
                 ProjectMember.user_id == current_user.id,
@@ -129,6 +139,7 @@ def getAchievements(
         )
         completed_tasks = (
             db.query(Task)
+            .options(joinedload(Task.project).joinedload(Project.workspace))
             .filter(
                 Task.status == TaskStatus.done,
                 Task.assignees.any(id=current_user.id),
@@ -174,10 +185,19 @@ def getAchievements(
 @router.get("/{project_id}")
 def getProjectDetails(
     project_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     try:
+        # Missing projects and non-members fall through to the checks below
+        version = db.execute(project_version(project_id, current_user.id)).first()
+        if version and version.is_member:
+            cached = conditional_get(request, response, "getProjectDetails", *version)
+            if cached:
+                return cached
+
         result = db.execute(select(Project).where(Project.id == project_id))
         project = result.scalars().first()
 
@@ -203,13 +223,28 @@ def getProjectDetails(
 
 
 @router.get("/{project_id}/tasks")
-def getProjectTasks(
+async def getProjectTasks(
     project_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        result = db.execute(select(Project).where(Project.id == project_id))
+        version = (await db.execute(project_version(project_id, current_user.id))).first()
+        if version and version.is_member:
+            cached = conditional_get(request, response, "getProjectTasks", *version)
+            if cached:
+                return cached
+
+        result = await db.execute(
+            select(Project)
+            .options(
+                selectinload(Project.members).selectinload(ProjectMember.user),
+                selectinload(Project.tasks),
+            )
+            .where(Project.id == project_id)
+        )
         project = result.scalars().first()
         if not project:
             return ORJSONResponse(
@@ -222,8 +257,14 @@ def getProjectTasks(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"message": "You are not a member of this project"},
             )
-        result = db.execute(
+        result = await db.execute(
             select(Task)
+            .options(
+                selectinload(Task.assignees),
+                selectinload(Task.watchers),
+                selectinload(Task.subtasks),
+                selectinload(Task.attachments),
+            )
             .where(Task.project_id == project_id)
             .order_by(Task.created_at.desc())
         )
@@ -240,6 +281,254 @@ def getProjectTasks(
         )
 
 
+# Kanban columns: the four statuses for live tasks, plus archived tasks
+# whatever their status
+BOARD_COLUMNS = ("todo", "in_progress", "review", "done", "archived")
+# Cards only show the start of the description
+CARD_DESCRIPTION_LENGTH = 280
+
+board_column = case(
+    (Task.is_archived.is_(True), "archived"),
+    else_=cast(Task.status, String),
+)
+
+
+def card_columns(source):
+    """Card fields of a task row, selected from Task or from a subquery of it."""
+    subtasks = select(func.count(TaskSubtask.id)).where(
+        TaskSubtask.task_id == source.id
+    )
+    return (
+        source.id,
+        source.title,
+        func.substr(source.description, 1, CARD_DESCRIPTION_LENGTH).label("description"),
+        source.status,
+        source.priority,
+        source.is_archived,
+        source.due_date,
+        source.created_at,
+        source.comment_count,
+        subtasks.scalar_subquery().label("subtask_total"),
+        subtasks.where(TaskSubtask.completed.is_(True))
+        .scalar_subquery()
+        .label("subtask_done"),
+    )
+
+
+def task_card(row, assignees: list) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "status": row.status.value,
+        "priority": row.priority.value if row.priority else None,
+        "is_archived": bool(row.is_archived),
+        "due_date": row.due_date,
+        "created_at": row.created_at,
+        "comment_count": row.comment_count,
+        "subtask_total": row.subtask_total,
+        "subtask_done": row.subtask_done,
+        "assignees": assignees,
+    }
+
+
+async def load_board_project(db: AsyncSession, project_id: UUID, current_user: User):
+    """(project, error response); tasks are not loaded."""
+    result = await db.execute(
+        select(Project)
+        .options(
+            selectinload(Project.members).selectinload(ProjectMember.user),
+            noload(Project.tasks),
+        )
+        .where(Project.id == project_id)
+    )
+    project = result.scalars().first()
+    if not project:
+        return None, ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Project not found"},
+        )
+    if not any(m.user_id == current_user.id for m in project.members):
+        return None, ORJSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN,
+            content={"message": "You are not a member of this project"},
+        )
+    return project, None
+
+
+async def board_column_counts(db: AsyncSession, project_id: UUID) -> dict:
+    counter = await db.get(ProjectTaskCounter, project_id)
+    if counter:
+        return {column: getattr(counter, column) for column in BOARD_COLUMNS}
+    # No counter row yet (never rebuilt); count directly
+    column = board_column.label("column")
+    result = await db.execute(
+        select(column, func.count(Task.id))
+        .where(Task.project_id == project_id)
+        .group_by(column)
+    )
+    counts = dict.fromkeys(BOARD_COLUMNS, 0)
+    counts.update({column: count for column, count in result.all()})
+    return counts
+
+
+def card_cursor(row) -> str:
+    return encode_cursor(row.created_at, row.id)
+
+
+@router.get("/{project_id}/board")
+@query_budget(9)
+async def getProjectBoard(
+    project_id: UUID,
+    request: Request,
+    response: Response,
+    per_column: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Tasks grouped into board columns, newest first, with only the fields
+    a card shows. Each column returns at most per_column cards and a cursor
+    for /board/{column}."""
+    try:
+        version = (await db.execute(project_version(project_id, current_user.id))).first()
+        if version and version.is_member:
+            cached = conditional_get(
+                request, response, "getProjectBoard", per_column, *version
+            )
+            if cached:
+                return cached
+
+        project, error = await load_board_project(db, project_id, current_user)
+        if error:
+            return error
+
+        # Top per_column + 1 tasks of every column in one pass
+        ranked = (
+            select(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.status,
+                Task.priority,
+                Task.is_archived,
+                Task.due_date,
+                Task.created_at,
+                Task.comment_count,
+                board_column.label("column"),
+                func.row_number()
+                .over(
+                    partition_by=board_column,
+                    order_by=(Task.created_at.desc(), Task.id.desc()),
+                )
+                .label("position"),
+            )
+            .where(Task.project_id == project_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(ranked.c.column, *card_columns(ranked.c))
+            .where(ranked.c.position <= per_column + 1)
+            .order_by(ranked.c.column, ranked.c.position)
+        )
+        rows_by_column = {column: [] for column in BOARD_COLUMNS}
+        for row in result.all():
+            if row.column in rows_by_column:
+                rows_by_column[row.column].append(row)
+
+        pages = {
+            column: split_page(rows, per_column, card_cursor)
+            for column, rows in rows_by_column.items()
+        }
+        task_ids = [row.id for rows, _ in pages.values() for row in rows]
+        assignees = (await load_task_children(db, task_ids, ["assignees"]))["assignees"]
+        counts = await board_column_counts(db, project_id)
+
+        return {
+            "project": ProjectResponse.from_orm(project),
+            "columns": {
+                column: {
+                    "count": counts[column],
+                    "items": [task_card(row, assignees[row.id]) for row in rows],
+                    "next_cursor": next_cursor,
+                }
+                for column, (rows, next_cursor) in pages.items()
+            },
+        }
+    except Exception as e:
+        print(str(e))
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": str(e)},
+        )
+
+
+@router.get("/{project_id}/board/{column}")
+@query_budget(4)
+async def getProjectBoardColumn(
+    project_id: UUID,
+    column: str,
+    before: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """The next page of cards in one board column ("load more")."""
+    try:
+        if column not in BOARD_COLUMNS:
+            return ORJSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": "Unknown board column"},
+            )
+        isMember = await db.scalar(
+            select(ProjectMember.id).where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == current_user.id,
+            )
+        )
+        if not isMember:
+            return ORJSONResponse(
+                status_code=status.HTTP_403_FORBIDDEN,
+                content={"message": "You are not a member of this project"},
+            )
+
+        query = select(*card_columns(Task)).where(Task.project_id == project_id)
+        if column == "archived":
+            query = query.where(Task.is_archived.is_(True))
+        else:
+            query = query.where(
+                or_(Task.is_archived.is_(False), Task.is_archived.is_(None)),
+                Task.status == column,
+            )
+        if before:
+            try:
+                created_at, task_id = decode_cursor(before)
+            except ValueError:
+                return ORJSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"message": "Invalid cursor"},
+                )
+            query = query.where(
+                tuple_(Task.created_at, Task.id) < tuple_(created_at, task_id)
+            )
+        result = await db.execute(
+            query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+        )
+        rows, next_cursor = split_page(result.all(), limit, card_cursor)
+        assignees = (
+            await load_task_children(db, [row.id for row in rows], ["assignees"])
+        )["assignees"]
+        return {
+            "items": [task_card(row, assignees[row.id]) for row in rows],
+            "next_cursor": next_cursor,
+        }
+    except Exception as e:
+        print(str(e))
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": str(e)},
+        )
+
+
 @router.put("/{project_id}/archive")
 def archiveProject(
     project_id: UUID,
@@ -538,6 +827,7 @@ def toggle_project_member(
             )
             action = "added"
 
+        touch(project)
         db.commit()
         db.refresh(project)
 
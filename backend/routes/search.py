@@ -0,0 +1,172 @@
+from fastapi import APIRouter, status, Depends, Query
+from fastapi.responses import ORJSONResponse
+from database import get_async_db
+from middleware.auth_middleware import get_current_user_async
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, WorkspaceMember, Project, Task, Comment
+from utils.search import SEARCH_CONFIG, prefix_tsquery, headline, render_highlight
+from uuid import UUID
+from typing import List
+
+router = APIRouter()
+
+SEARCH_TYPES = ("task", "project", "comment")
+
+
+async def ranked(db: AsyncSession, columns, vector, tsquery, scope, limit: int):
+    """Top matches by rank, then highlights for those rows only:
+    ts_headline re-parses the text, so it must not run on every match."""
+    top = (
+        select(*columns, func.ts_rank_cd(vector, tsquery).label("rank"))
+        .where(vector.bool_op("@@")(tsquery), *scope)
+        .order_by(func.ts_rank_cd(vector, tsquery).desc())
+        .limit(limit)
+        .subquery()
+    )
+    highlighted = []
+    for name in ("title", "description", "text"):
+        if name in top.c:
+            highlighted.append(headline(top.c[name], tsquery).label(f"{name}_highlight"))
+    result = await db.execute(select(top, *highlighted).order_by(top.c.rank.desc()))
+    return result.mappings().all()
+
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    workspace_id: UUID | None = Query(None),
+    types: List[str] = Query(list(SEARCH_TYPES)),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            return ORJSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"message": f"Unknown type: {', '.join(sorted(unknown))}"},
+            )
+
+        terms = prefix_tsquery(q)
+        if not terms:
+            return {"items": []}
+        tsquery = func.to_tsquery(SEARCH_CONFIG, terms)
+
+        # Only workspaces the caller belongs to
+        workspaces = select(WorkspaceMember.workspace_id).where(
+            WorkspaceMember.user_id == current_user.id
+        )
+        if workspace_id:
+            workspaces = workspaces.where(WorkspaceMember.workspace_id == workspace_id)
+
+        items = []
+        if "task" in types:
+            rows = await ranked(
+                db,
+                [
+                    Task.id,
+                    Task.title,
+                    Task.description,
+                    Task.status,
+                    Task.is_archived,
+                    Task.project_id,
+                    Project.workspace_id,
+                ],
+                Task.search_vector,
+                tsquery,
+                [
+                    Project.id == Task.project_id,
+                    Project.workspace_id.in_(workspaces),
+                ],
+                limit,
+            )
+            items.extend(
+                {
+                    "type": "task",
+                    "id": row["id"],
+                    "rank": row["rank"],
+                    "title": row["title"],
+                    "title_highlight": render_highlight(row["title_highlight"]),
+                    "highlight": render_highlight(row["description_highlight"]),
+                    "status": row["status"].value if row["status"] else None,
+                    "is_archived": row["is_archived"],
+                    "project_id": row["project_id"],
+                    "workspace_id": row["workspace_id"],
+                }
+                for row in rows
+            )
+        if "project" in types:
+            rows = await ranked(
+                db,
+                [
+                    Project.id,
+                    Project.title,
+                    Project.description,
+                    Project.is_archived,
+                    Project.workspace_id,
+                ],
+                Project.search_vector,
+                tsquery,
+                [Project.workspace_id.in_(workspaces)],
+                limit,
+            )
+            items.extend(
+                {
+                    "type": "project",
+                    "id": row["id"],
+                    "rank": row["rank"],
+                    "title": row["title"],
+                    "title_highlight": render_highlight(row["title_highlight"]),
+                    "highlight": render_highlight(row["description_highlight"]),
+                    "is_archived": row["is_archived"],
+                    "project_id": row["id"],
+                    "workspace_id": row["workspace_id"],
+                }
+                for row in rows
+            )
+        if "comment" in types:
+            rows = await ranked(
+                db,
+                [
+                    Comment.id,
+                    Comment.text,
+                    Comment.created_at,
+                    Comment.task_id,
+                    Task.title.label("task_title"),
+                    Task.project_id,
+                    Project.workspace_id,
+                ],
+                Comment.search_vector,
+                tsquery,
+                [
+                    Task.id == Comment.task_id,
+                    Project.id == Task.project_id,
+                    Project.workspace_id.in_(workspaces),
+                ],
+                limit,
+            )
+            items.extend(
+                {
+                    "type": "comment",
+                    "id": row["id"],
+                    "rank": row["rank"],
+                    "title": row["task_title"],
+                    "highlight": render_highlight(row["text_highlight"]),
+                    "created_at": row["created_at"],
+                    "task_id": row["task_id"],
+                    "project_id": row["project_id"],
+                    "workspace_id": row["workspace_id"],
+                }
+                for row in rows
+            )
+
+        items.sort(key=lambda item: item["rank"], reverse=True)
+        return {"items": items[:limit]}
+
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": str(e)},
+        )
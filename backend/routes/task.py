@@ -1,26 +1,64 @@
-from fastapi import APIRouter, status, Depends, UploadFile, File, Query
-from fastapi.responses import ORJSONResponse, FileResponse
-from database import get_db
-from middleware.auth_middleware import get_current_user
+from fastapi import APIRouter, status, Depends, UploadFile, File, Query, Request, Response
+from fastapi.responses import ORJSONResponse, FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from database import get_db, get_async_db
+from middleware.auth_middleware import get_current_user, get_current_user_async
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from models import User, Project, Workspace, Task, ActivityLog, Comment
+from sqlalchemy import select, tuple_, update, delete, insert
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, Project, Workspace, Task, TaskSubtask, TaskAttachment, ActivityLog, Comment
 from models.notifications import Notification
-from schema.task import TaskBaseResponse, UserLiteResponse
+from models.projects import ProjectMember
+from models.tasks import task_assignees, task_watchers, TaskStatus, TaskPriority
+from schema.task import (
+    TaskBaseResponse,
+    UserLiteResponse,
+    SubtaskResponse,
+    AttachmentResponse,
+)
 from utils.activity import record_activity
-from datetime import datetime
+from utils.task_counters import task_counter_snapshot, apply_task_counter_delta
+from utils.pagination import encode_cursor, decode_cursor, split_page
+from utils.activity_partitions import month_start
+from utils.task_children import MY_TASKS_INCLUDES, load_task_children
+from utils.etags import touch, conditional_get, task_version
+from utils.uploads import (
+    MAX_UPLOAD_FILE_SIZE,
+    MAX_UPLOAD_REQUEST_SIZE,
+    UploadTooLarge,
+    resolve_upload,
+    safe_filename,
+    save_upload,
+)
+from utils.downloads import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    content_type_for,
+    http_date,
+    not_modified,
+    single_range,
+)
+from utils.blob_store import (
+    store as blob_store,
+    staging_path,
+    discard_staged,
+    is_sha256,
+    add_blob_ref_statement,
+    release_blob_refs_statement,
+    collect_blobs,
+)
+from datetime import datetime, timezone
 from uuid import uuid4
-from sqlalchemy.orm.attributes import flag_modified
 from models.activity_log import ActionType, ResourceType
 from typing import List
 import os
-import shutil
-import json
+from urllib.parse import quote
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Blob-backed attachments link to download_attachment below
+ATTACHMENT_DOWNLOAD_PATH = "tasks/attachments/download/"
 
 
 @router.post("/{project_id}/create-task")
@@ -91,6 +129,10 @@ def createTask(
                     )
                 )
 
+        apply_task_counter_delta(
+            db, workspace.id, project.id, after=task_counter_snapshot(new_task)
+        )
+
         db.commit()
         db.refresh(new_task)
         return new_task
@@ -105,9 +147,18 @@ def createTask(
 
 
 @router.get("/mytasks")
-def getMyTasks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def getMyTasks(
+    before: str | None = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    task_status: List[TaskStatus] | None = Query(None, alias="status"),
+    priority: List[TaskPriority] | None = Query(None),
+    workspace_id: UUID | None = Query(None),
+    due_after: datetime | None = Query(None),
+    due_before: datetime | None = Query(None),
+    archived: bool | None = Query(None, description="Omit for both"),
+    include: List[str] = Query([], description=f"Any of {', '.join(MY_TASKS_INCLUDES)}"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
         if not current_user:
@@ -116,61 +167,110 @@ def getMyTasks(
                 content={"message": "Unauthorized"},
             )
 
-        tasks = (
-            db.query(Task)
-            .options(
-                joinedload(Task.assignees),
-                joinedload(Task.project).joinedload(Project.workspace),
+        unknown = set(include) - set(MY_TASKS_INCLUDES)
+        if unknown:
+            return ORJSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"message": f"Unknown include: {', '.join(sorted(unknown))}"},
             )
-            .filter(Task.assignees.any(User.id == current_user.id))
-            .order_by(Task.created_at.desc())
-            .all()
-        )
-
-        results: List[dict] = []
 
-        for task in tasks:
-            results.append(
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "project_id": task.project_id,
-                    "status": task.status.value if task.status else None,
-                    "priority": task.priority.value if task.priority else None,
-                    "watchers": task.watchers or [],
-                    "tags": task.tags or [],
-                    "subtasks": task.subtasks or [],
-                    "attachments": task.attachments or [],
-                    "due_date": task.due_date,
-                    "completed_at": task.completed_at,
-                    "estimated_hours": task.estimated_hours,
-                    "actual_hours": task.actual_hours,
-                    "created_by": task.created_by,
-                    "is_archived": task.is_archived,
-                    "created_at": task.created_at,
-                    "updated_at": task.updated_at,
-                    "assignees": [
-                        {
-                            "id": u.id,
-                            "name": u.name,
-                            "profile_picture": u.profilePicture,
-                        }
-                        for u in task.assignees
-                    ],
-                    "project": {
-                        "id": task.project.id if task.project else None,
-                        "title": task.project.title if task.project else None,
-                        "workspace": task.project.workspace.name
-                        if task.project
-                        else None,
-                    }
-                    if task.project
-                    else None,
-                }
+        # Plain rows driven by the assignee index; nothing is hydrated into
+        # ORM objects
+        query = (
+            select(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.project_id,
+                Task.status,
+                Task.priority,
+                Task.tags,
+                Task.due_date,
+                Task.completed_at,
+                Task.estimated_hours,
+                Task.actual_hours,
+                Task.comment_count,
+                Task.created_by,
+                Task.is_archived,
+                Task.created_at,
+                Task.updated_at,
+                Project.title.label("project_title"),
+                Project.workspace_id,
+                Workspace.name.label("workspace_name"),
+            )
+            .join(task_assignees, task_assignees.c.task_id == Task.id)
+            .join(Project, Project.id == Task.project_id)
+            .join(Workspace, Workspace.id == Project.workspace_id)
+            .where(task_assignees.c.user_id == current_user.id)
+        )
+        if task_status:
+            query = query.where(Task.status.in_(task_status))
+        if priority:
+            query = query.where(Task.priority.in_(priority))
+        if workspace_id:
+            query = query.where(Project.workspace_id == workspace_id)
+        # due_date is stored as naive UTC
+        if due_after:
+            if due_after.tzinfo:
+                due_after = due_after.astimezone(timezone.utc).replace(tzinfo=None)
+            query = query.where(Task.due_date >= due_after)
+        if due_before:
+            if due_before.tzinfo:
+                due_before = due_before.astimezone(timezone.utc).replace(tzinfo=None)
+            query = query.where(Task.due_date < due_before)
+        if archived is not None:
+            query = query.where(Task.is_archived.is_(archived))
+        if before:
+            try:
+                created_at, task_id = decode_cursor(before)
+            except ValueError:
+                return ORJSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"message": "Invalid cursor"},
+                )
+            query = query.where(
+                tuple_(Task.created_at, Task.id) < tuple_(created_at, task_id)
             )
 
-        return results
+        result = await db.execute(
+            query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+        )
+        rows, next_cursor = split_page(
+            result.all(), limit, lambda row: encode_cursor(row.created_at, row.id)
+        )
+        children = await load_task_children(db, [row.id for row in rows], include)
+
+        items: List[dict] = []
+        for row in rows:
+            item = {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "project_id": row.project_id,
+                "status": row.status.value if row.status else None,
+                "priority": row.priority.value if row.priority else None,
+                "tags": row.tags or [],
+                "due_date": row.due_date,
+                "completed_at": row.completed_at,
+                "estimated_hours": row.estimated_hours,
+                "actual_hours": row.actual_hours,
+                "comment_count": row.comment_count,
+                "created_by": row.created_by,
+                "is_archived": row.is_archived,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+                "project": {
+                    "id": row.project_id,
+                    "title": row.project_title,
+                    "workspace": row.workspace_name,
+                    "workspace_id": row.workspace_id,
+                },
+            }
+            for field, by_task in children.items():
+                item[field] = by_task[row.id]
+            items.append(item)
+
+        return {"items": items, "next_cursor": next_cursor}
 
     except Exception as e:
         print("Error in get_my_tasks:", str(e))
@@ -180,59 +280,65 @@ def getMyTasks(
         )
 
 
+@router.get("/comment-counts")
+async def getCommentCounts(
+    task_ids: List[UUID] = Query(..., max_length=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        # Reads the denormalized counter: no comment rows are touched. Tasks
+        # outside the caller's projects are left out.
+        result = await db.execute(
+            select(Task.id, Task.comment_count)
+            .join(ProjectMember, ProjectMember.project_id == Task.project_id)
+            .where(Task.id.in_(task_ids), ProjectMember.user_id == current_user.id)
+        )
+        return {str(row.id): row.comment_count for row in result}
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": str(e)},
+        )
+
+
 @router.get("/{task_id}")
-def getTask(
+async def getTask(
     task_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
+        version = (await db.execute(task_version(task_id))).first()
+        if version:
+            cached = conditional_get(request, response, "getTask", *version)
+            if cached:
+                return cached
+
+        result = await db.execute(
+            select(Task)
+            .options(
+                selectinload(Task.assignees),
+                selectinload(Task.watchers),
+                selectinload(Task.subtasks),
+                selectinload(Task.attachments),
+            )
+            .where(Task.id == task_id)
+        )
+        task = result.scalars().first()
         if not task:
             return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"message": "Task not found"},
             )
 
-        watchers = []
-        if task.watchers:
-            watchers_obj = db.query(User).filter(User.id.in_(task.watchers)).all()
-            watchers = [
-                UserLiteResponse(id=w.id, name=w.name, profile_picture=w.profilePicture)
-                for w in watchers_obj
-            ]
-
         assignees = [
             UserLiteResponse(id=a.id, name=a.name, profile_picture=a.profilePicture)
             for a in task.assignees
         ]
 
-        # Deserialize attachments if stored as JSON string
-        attachments = []
-        if task.attachments:
-            try:
-                if isinstance(task.attachments, str):
-                    attachments = json.loads(task.attachments)
-                else:
-                    attachments = task.attachments
-
-                # normalize structure
-                normalized_attachments = []
-                for att in attachments:
-                    normalized_attachments.append(
-                        {
-                            "id": att.get("id"),
-                            "file_name": att.get("fileName", "unknown.txt"),
-                            "file_url": att.get("fileUrl", ""),
-                            "uploaded_at": att.get(
-                                "uploadedAt", task.updated_at or task.created_at
-                            ),
-                        }
-                    )
-                attachments = normalized_attachments
-            except Exception:
-                attachments = []
-
         task_response = TaskBaseResponse(
             id=task.id,
             title=task.title,
@@ -240,14 +346,17 @@ def getTask(
             project_id=task.project_id,
             status=task.status,
             priority=task.priority,
-            watchers=[w.id for w in watchers],
+            watchers=task.watchers,
             tags=task.tags,
-            subtasks=task.subtasks,
-            attachments=attachments,  # ✅ fixed here
+            subtasks=[SubtaskResponse.model_validate(st) for st in task.subtasks],
+            attachments=[
+                AttachmentResponse.model_validate(att) for att in task.attachments
+            ],
             due_date=task.due_date,
             completed_at=task.completed_at,
             estimated_hours=task.estimated_hours,
             actual_hours=task.actual_hours,
+            comment_count=task.comment_count,
             created_by=task.created_by,
             is_archived=task.is_archived,
             created_at=task.created_at,
@@ -255,7 +364,12 @@ def getTask(
             assignees=assignees,
         )
 
-        project = db.query(Project).filter(Project.id == task.project_id).first()
+        result = await db.execute(
+            select(Project)
+            .options(selectinload(Project.members).selectinload(ProjectMember.user))
+            .where(Project.id == task.project_id)
+        )
+        project = result.scalars().first()
         project_data = None
         if project:
             members = [
@@ -386,17 +500,27 @@ def updateTaskStatus(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"message": "You are not a member of this project"},
             )
-        if task.subtasks:
-            for subtask in task.subtasks:
-                if not subtask.get("completed"):
-                    return ORJSONResponse(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        content={"message": "Subtasks are not completed"},
-                    )
-                break
+        open_subtask = (
+            db.query(TaskSubtask.id)
+            .filter(TaskSubtask.task_id == task_id, TaskSubtask.completed.is_(False))
+            .first()
+        )
+        if open_subtask:
+            return ORJSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"message": "Subtasks are not completed"},
+            )
 
         oldStatus = task.status
+        before = task_counter_snapshot(task)
         task.status = payload["status"]
+        apply_task_counter_delta(
+            db,
+            task.project.workspace_id,
+            task.project_id,
+            before=before,
+            after=task_counter_snapshot(task),
+        )
 
         record_activity(
             db,
@@ -463,6 +587,7 @@ def updateTaskAssignees(
             task_id,
             {"description": "Task assignees updated."},
         )
+        touch(task)
         db.commit()
         db.refresh(task)
         return task
@@ -496,7 +621,15 @@ def updateTaskPriority(
             )
 
         oldPriority = task.priority
+        before = task_counter_snapshot(task)
         task.priority = payload["priority"]
+        apply_task_counter_delta(
+            db,
+            task.project.workspace_id,
+            task.project_id,
+            before=before,
+            after=task_counter_snapshot(task),
+        )
 
         record_activity(
             db,
@@ -546,14 +679,14 @@ def add_subtask(
                 content={"message": "You are not a member of this project"},
             )
 
-        new_subtask = {
-            "id": str(uuid4()),
-            "title": payload.get("title"),
-            "completed": False,
-            "created_at": datetime.utcnow().isoformat(),
-        }
-
-        task.subtasks = (task.subtasks or []) + [new_subtask]
+        new_subtask = TaskSubtask(
+            id=uuid4(),
+            task_id=task_id,
+            title=payload.get("title"),
+            completed=False,
+            created_at=datetime.utcnow(),
+        )
+        db.add(new_subtask)
 
         record_activity(
             db,
@@ -561,14 +694,17 @@ def add_subtask(
             ActionType.created_subtask,
             ResourceType.task,
             task_id,
-            {"description": f"Subtask '{new_subtask['title']}' created"},
+            {"description": f"Subtask '{new_subtask.title}' created"},
         )
 
+        touch(task)
         db.commit()
-        db.refresh(task)
         return ORJSONResponse(
             status_code=201,
-            content={"message": "Subtask created", "subtasks": task.subtasks},
+            content={
+                "message": "Subtask created",
+                "subtask": SubtaskResponse.model_validate(new_subtask).model_dump(),
+            },
         )
     except Exception as e:
         print(str(e))
@@ -602,20 +738,35 @@ def update_subtask(
                 status_code=400, content={"message": "subtaskId is required"}
             )
 
-        updated = False
-        for st in task.subtasks or []:
-            if str(st["id"]) == str(subtask_id) and not st.get("completed", False):
-                st["completed"] = payload["completed"]
-                st["updated_at"] = datetime.utcnow().isoformat()
-                updated = True
-                break
-
-        if not updated:
+        try:
+            subtask_id = UUID(str(subtask_id))
+        except ValueError:
             return ORJSONResponse(
                 status_code=404, content={"message": "Subtask not found"}
             )
 
-        flag_modified(task, "subtasks")
+        # Completed subtasks stay completed
+        subtask = db.execute(
+            update(TaskSubtask)
+            .where(
+                TaskSubtask.id == subtask_id,
+                TaskSubtask.task_id == task_id,
+                TaskSubtask.completed.is_(False),
+            )
+            .values(completed=payload["completed"], updated_at=datetime.utcnow())
+            .returning(
+                TaskSubtask.id,
+                TaskSubtask.title,
+                TaskSubtask.completed,
+                TaskSubtask.created_at,
+            )
+        ).first()
+
+        if not subtask:
+            db.rollback()
+            return ORJSONResponse(
+                status_code=404, content={"message": "Subtask not found"}
+            )
 
         record_activity(
             db,
@@ -626,11 +777,14 @@ def update_subtask(
             {"description": f"Subtask {subtask_id} updated"},
         )
 
+        touch(task)
         db.commit()
-        db.refresh(task)
         return ORJSONResponse(
             status_code=200,
-            content={"message": "Subtask updated", "subtasks": task.subtasks},
+            content={
+                "message": "Subtask updated",
+                "subtask": SubtaskResponse.model_validate(subtask).model_dump(),
+            },
         )
 
     except Exception as e:
@@ -640,20 +794,80 @@ def update_subtask(
 
 
 @router.get("/{resourceId}/activity")
-def getActivity(
+async def getActivity(
     resourceId: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    before: str | None = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    action: List[ActionType] | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        activity_logs = (
-            db.query(ActivityLog)
-            .options(joinedload(ActivityLog.user))
-            .filter(ActivityLog.resource_id == resourceId)
-            .order_by(ActivityLog.created_at.desc())
-            .all()
+        # Plain columns joined to the few user fields the panel shows, no ORM
+        # objects; walks ix_activity_logs_resource_created.
+        query = (
+            select(
+                ActivityLog.id,
+                ActivityLog.action,
+                ActivityLog.details,
+                ActivityLog.created_at,
+                User.id.label("user_id"),
+                User.name.label("user_name"),
+                User.profilePicture.label("user_profilePicture"),
+            )
+            .join(User, User.id == ActivityLog.user_id)
+            .where(ActivityLog.resource_id == resourceId)
+        )
+        if action:
+            query = query.where(ActivityLog.action.in_(action))
+
+        # activity_logs is partitioned by month: plain created_at bounds let
+        # Postgres skip months before the task existed and after the cursor.
+        task_created_at = await db.scalar(
+            select(Task.created_at).where(Task.id == resourceId)
+        )
+        if task_created_at:
+            query = query.where(ActivityLog.created_at >= month_start(task_created_at))
+        if before:
+            try:
+                created_at, log_id = decode_cursor(before)
+            except ValueError:
+                return ORJSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"message": "Invalid cursor"},
+                )
+            query = query.where(
+                ActivityLog.created_at <= created_at,
+                tuple_(ActivityLog.created_at, ActivityLog.id)
+                < tuple_(created_at, log_id),
+            )
+
+        result = await db.execute(
+            query.order_by(
+                ActivityLog.created_at.desc(), ActivityLog.id.desc()
+            ).limit(limit + 1)
+        )
+        rows, next_cursor = split_page(
+            result.all(), limit, lambda row: encode_cursor(row.created_at, row.id)
         )
-        return activity_logs
+
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "action": row.action,
+                    "details": row.details,
+                    "created_at": row.created_at,
+                    "user": {
+                        "id": row.user_id,
+                        "name": row.user_name,
+                        "profilePicture": row.user_profilePicture,
+                    },
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
     except Exception as e:
         return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -702,6 +916,11 @@ def addComment(
             created_at=datetime.utcnow(),
         )
         db.add(comment)
+        db.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(comment_count=Task.comment_count + 1)
+        )
         record_activity(
             db,
             current_user.id,
@@ -725,20 +944,67 @@ def addComment(
 
 
 @router.get("/{task_id}/comments")
-def getComments(
+async def getComments(
     task_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    before: str | None = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        comments = (
-            db.query(Comment)
-            .options(joinedload(Comment.author))
-            .filter(Comment.task_id == task_id)
-            .order_by(Comment.created_at.desc())
-            .all()
+        # Newest first along ix_comments_task_created, with the author
+        # fields the thread shows
+        query = (
+            select(
+                Comment.id,
+                Comment.task_id,
+                Comment.text,
+                Comment.is_edited,
+                Comment.created_at,
+                User.id.label("author_id"),
+                User.name.label("author_name"),
+                User.profilePicture.label("author_profilePicture"),
+            )
+            .join(User, User.id == Comment.author_id)
+            .where(Comment.task_id == task_id)
         )
-        return comments
+        if before:
+            try:
+                created_at, comment_id = decode_cursor(before)
+            except ValueError:
+                return ORJSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"message": "Invalid cursor"},
+                )
+            query = query.where(
+                tuple_(Comment.created_at, Comment.id) < tuple_(created_at, comment_id)
+            )
+
+        result = await db.execute(
+            query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(limit + 1)
+        )
+        rows, next_cursor = split_page(
+            result.all(), limit, lambda row: encode_cursor(row.created_at, row.id)
+        )
+
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "task_id": row.task_id,
+                    "text": row.text,
+                    "is_edited": row.is_edited,
+                    "created_at": row.created_at,
+                    "author": {
+                        "id": row.author_id,
+                        "name": row.author_name,
+                        "profilePicture": row.author_profilePicture,
+                    },
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
     except Exception as e:
         return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -780,8 +1046,16 @@ def archiveTask(
             )
 
         was_archived = task.is_archived
+        before = task_counter_snapshot(task)
         task.is_archived = not was_archived
         db.add(task)
+        apply_task_counter_delta(
+            db,
+            project.workspace_id,
+            project.id,
+            before=before,
+            after=task_counter_snapshot(task),
+        )
 
         record_activity(
             db,
@@ -839,15 +1113,20 @@ def watchTask(
                 content={"message": "You are not a member of this project"},
             )
 
-        user_id = str(current_user.id)
-        if user_id not in (task.watchers or []):
-            task.watchers.append(user_id)
-            action_desc = f"started watching task {task.title}"
-        else:
-            task.watchers = [w for w in task.watchers if w != user_id]
+        # Toggle: drop the watcher row, or add it if there was none
+        removed = db.execute(
+            delete(task_watchers).where(
+                task_watchers.c.task_id == task_id,
+                task_watchers.c.user_id == current_user.id,
+            )
+        ).rowcount
+        if removed:
             action_desc = f"stopped watching task {task.title}"
-
-        db.add(task)
+        else:
+            db.execute(
+                insert(task_watchers).values(task_id=task_id, user_id=current_user.id)
+            )
+            action_desc = f"started watching task {task.title}"
 
         record_activity(
             db,
@@ -857,8 +1136,8 @@ def watchTask(
             task_id,
             {"description": action_desc},
         )
+        touch(task)
         db.commit()
-        db.refresh(task)
         return ORJSONResponse(status_code=status.HTTP_200_OK)
 
     except Exception as e:
@@ -870,39 +1149,58 @@ def watchTask(
 
 
 @router.post("/{task_id}/attachments")
-def add_attachments(
+async def add_attachments(
     task_id: UUID,
     files: List[UploadFile] = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
+    staged = []
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
+        task = await db.scalar(select(Task).where(Task.id == task_id))
         if not task:
             return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"message": "Task not found"},
             )
 
-        current_attachments = task.attachments or []
+        # Sizes are known from the spooled parts; refuse before writing anything
+        declared = sum(file.size or 0 for file in files)
+        if declared > MAX_UPLOAD_REQUEST_SIZE:
+            return ORJSONResponse(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                content={"message": f"Upload exceeds {MAX_UPLOAD_REQUEST_SIZE} bytes"},
+            )
+
+        added = []
+        remaining = MAX_UPLOAD_REQUEST_SIZE
 
         for file in files:
-            file_id = str(uuid4())  # unique id for each attachment
-            file_location = f"{UPLOAD_DIR}/{file_id}_{file.filename}"
-            with open(file_location, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-
-            file_size = os.path.getsize(file_location)
-            attachment = {
-                "id": file_id,
-                "file_name": file.filename,
-                "file_url": file_location,
-                "file_type": file.content_type,
-                "file_size": file_size,
-                "uploaded_by": str(current_user.id),
-                "uploaded_at": datetime.utcnow().isoformat(),
-            }
-            current_attachments.append(attachment)
+            file_name = safe_filename(file.filename)
+            staging = staging_path()
+            staged.append(staging)
+            file_size, sha256 = await save_upload(
+                file, staging, min(MAX_UPLOAD_FILE_SIZE, remaining)
+            )
+            remaining -= file_size
+
+            # Identical content is stored once and shared
+            await db.execute(add_blob_ref_statement(sha256, file_size))
+            await run_in_threadpool(blob_store.put, sha256, staging)
+
+            attachment = TaskAttachment(
+                id=uuid4(),
+                task_id=task_id,
+                file_name=file_name,
+                file_url=f"{ATTACHMENT_DOWNLOAD_PATH}{sha256}_{file_name}",
+                file_type=file.content_type,
+                file_size=file_size,
+                sha256=sha256,
+                uploaded_by=current_user.id,
+                uploaded_at=datetime.utcnow(),
+            )
+            db.add(attachment)
+            added.append(attachment)
 
             record_activity(
                 db,
@@ -911,20 +1209,31 @@ def add_attachments(
                 ResourceType.task,
                 task_id,
                 {
-                    "description": f"added attachment {file.filename} to task {task.title}"
+                    "description": f"added attachment {file_name} to task {task.title}"
                 },
             )
 
-        task.attachments = current_attachments
-        db.commit()
-        db.refresh(task)
+        attachments = [AttachmentResponse.model_validate(att) for att in added]
+        touch(task)
+        await db.commit()
 
         return {
             "message": "Attachments added successfully",
-            "attachments": task.attachments,
+            "attachments": attachments,
         }
 
+    except UploadTooLarge as e:
+        await db.rollback()
+        discard_staged(staged)
+        return ORJSONResponse(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            content={"message": str(e)},
+        )
     except Exception as e:
+        # Bodies already stored without a committed reference are removed
+        # by the blob sweep.
+        await db.rollback()
+        discard_staged(staged)
         return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"message": str(e)},
@@ -946,21 +1255,30 @@ def delete_attachments(
                 content={"message": "Task not found"},
             )
 
-        current_attachments = task.attachments or []
-        updated_attachments = [
-            a for a in current_attachments if a["id"] not in attachment_ids
-        ]
-        deleted = [a for a in current_attachments if a["id"] in attachment_ids]
+        ids = []
+        for attachment_id in attachment_ids:
+            try:
+                ids.append(UUID(attachment_id))
+            except ValueError:
+                continue
+
+        deleted = db.execute(
+            delete(TaskAttachment)
+            .where(TaskAttachment.task_id == task_id, TaskAttachment.id.in_(ids))
+            .returning(TaskAttachment.id, TaskAttachment.file_name, TaskAttachment.sha256)
+        ).all()
 
         if not deleted:
+            db.rollback()
             return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"message": "No matching attachments found"},
             )
 
-        task.attachments = updated_attachments
-
+        released = {}
         for att in deleted:
+            if att.sha256:
+                released[att.sha256] = released.get(att.sha256, 0) + 1
             record_activity(
                 db,
                 current_user.id,
@@ -968,16 +1286,20 @@ def delete_attachments(
                 ResourceType.task,
                 task_id,
                 {
-                    "description": f"deleted attachment {att['fileName']} from task {task.title}"
+                    "description": f"deleted attachment {att.file_name} from task {task.title}"
                 },
             )
+        for sha256, count in released.items():
+            db.execute(release_blob_refs_statement(sha256, count))
 
+        touch(task)
         db.commit()
-        db.refresh(task)
+        if released:
+            collect_blobs(db, released.keys())
 
         return {
             "message": "Attachments deleted successfully",
-            "attachments": task.attachments,
+            "deleted": [att.id for att in deleted],
         }
 
     except Exception as e:
@@ -994,14 +1316,20 @@ def get_attachments(
     current_user: User = Depends(get_current_user),
 ):
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
+        task = db.query(Task.id).filter(Task.id == task_id).first()
         if not task:
             return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"message": "Task not found"},
             )
 
-        return task.attachments
+        attachments = (
+            db.query(TaskAttachment)
+            .filter(TaskAttachment.task_id == task_id)
+            .order_by(TaskAttachment.uploaded_at)
+            .all()
+        )
+        return [AttachmentResponse.model_validate(att) for att in attachments]
 
     except Exception as e:
         return ORJSONResponse(
@@ -1011,17 +1339,85 @@ def get_attachments(
 
 
 @router.get("/attachments/download/{saved_file_name}")
-def download_attachment(saved_file_name: str):
-    file_path = os.path.join(UPLOAD_DIR, saved_file_name)
+def download_attachment(saved_file_name: str, request: Request):
+    sha256, _, original_file_name = saved_file_name.partition("_")
+    original_file_name = original_file_name or saved_file_name
+    content_type = content_type_for(original_file_name)
+
+    if not (is_sha256(sha256) and blob_store.exists(sha256)):
+        # Uploads from before the blob store: validators come from the file
+        # itself (FileResponse's stat-based ETag)
+        file_path = resolve_upload(saved_file_name)
+        if not file_path:
+            return ORJSONResponse(
+                status_code=404, content={"message": f"File {saved_file_name} not found"}
+            )
+        stat_result = os.stat(file_path)
+        response = FileResponse(
+            path=file_path,
+            media_type=content_type,
+            filename=original_file_name,
+            headers={
+                "Cache-Control": REVALIDATE_CACHE_CONTROL,
+                "X-Content-Type-Options": "nosniff",
+            },
+            stat_result=stat_result,
+        )
+        cached = not_modified(
+            request,
+            response.headers["etag"],
+            datetime.utcfromtimestamp(stat_result.st_mtime),
+            {"ETag": response.headers["etag"], "Cache-Control": REVALIDATE_CACHE_CONTROL},
+        )
+        return cached or response
+
+    # Content-addressed: the hash is a strong validator and never changes
+    etag = f'"{sha256}"'
+    size, last_modified = blob_store.stat(sha256)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(original_file_name)}",
+    }
+
+    cached = not_modified(
+        request, etag, last_modified, {key: headers[key] for key in ("ETag", "Cache-Control")}
+    )
+    if cached:
+        return cached
+
+    file_path = blob_store.local_path(sha256)
+    if file_path is not None:
+        # FileResponse handles Range / If-Range and sends from disk
+        return FileResponse(path=file_path, media_type=content_type, headers=headers)
+
+    # Remote backend: stream it through, forwarding a single range
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = single_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"},
+            )
 
-    if not os.path.exists(file_path):
-        return ORJSONResponse(
-            status_code=404, content={"message": f"File {saved_file_name} not found"}
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            blob_store.iter_chunks(sha256), media_type=content_type, headers=headers
         )
-    original_file_name = "_".join(saved_file_name.split("_")[1:]) or saved_file_name
 
-    return FileResponse(
-        path=file_path,
-        media_type="application/octet-stream",
-        filename=original_file_name,
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        blob_store.iter_chunks(sha256, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=content_type,
+        headers=headers,
     )
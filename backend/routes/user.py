@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from models import User
 from fastapi.responses import ORJSONResponse
 from schema.user import UserSchemaOut
+from middleware.principal_cache import invalidate_user
 import bcrypt
 from dotenv import load_dotenv
 
@@ -34,8 +35,8 @@ def updateProfile(
     current_user: User = Depends(get_current_user),
 ):
     try:
-        # Merge current user into this session
-        user = db.merge(current_user)
+        # current_user is a cached principal, load the row to modify it
+        user = db.query(User).filter(User.id == current_user.id).first()
 
         if "name" in payload:
             user.name = payload["name"]
@@ -43,6 +44,7 @@ def updateProfile(
             user.profilePicture = payload["profilePicture"]
 
         db.commit()
+        invalidate_user(user.id)
         db.refresh(user)
         return user
     except Exception as e:
@@ -64,8 +66,9 @@ def updatePassword(
             payload["newPassword"],
             payload["confirmPassword"],
         )
+        user = db.query(User).filter(User.id == current_user.id).first()
         if not bcrypt.checkpw(
-            currentPassword.encode("utf-8"), current_user.password.encode("utf-8")
+            currentPassword.encode("utf-8"), user.password.encode("utf-8")
         ):
             return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,7 +80,7 @@ def updatePassword(
                 content={"message": "Passwords do not match"},
             )
         if bcrypt.checkpw(
-            newPassword.encode("utf-8"), current_user.password.encode("utf-8")
+            newPassword.encode("utf-8"), user.password.encode("utf-8")
         ):
             return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -94,10 +97,10 @@ def updatePassword(
             newPassword.encode("utf-8"), bcrypt.gensalt()
         ).decode("utf-8")
 
-        user = db.merge(current_user)
         user.password = hashed_password
 
         db.commit()
+        invalidate_user(user.id)
         db.refresh(user)
         return user
     except Exception as e:
@@ -112,9 +115,10 @@ def deleteProfile(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
 ):
     try:
-        user = db.merge(current_user)
+        user = db.query(User).filter(User.id == current_user.id).first()
         db.delete(user)
         db.commit()
+        invalidate_user(current_user.id)
         return {"message": "Profile deleted successfully"}
     except Exception as e:
         return ORJSONResponse(
@@ -133,6 +137,7 @@ def update2FA(
         user = db.query(User).filter(User.id == current_user.id).first()
         user.is2FAEnabled = payload["is2FAEnabled"]
         db.commit()
+        invalidate_user(user.id)
         db.refresh(user)
         return {"status": 200, "is2FAEnabled": user.is2FAEnabled}
     except Exception as e:
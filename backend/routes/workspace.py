@@ -1,9 +1,17 @@
-from fastapi import APIRouter, status, Depends, Request
-from database import get_db
-from sqlalchemy.orm import Session, joinedload
-from schema.workspace import WorkSpaceSchema, WorkSpaceSchemaOut
-from middleware.auth_middleware import get_current_user
+from fastapi import APIRouter, status, Depends, Request, Response
+from database import get_db, get_async_db
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from schema.workspace import (
+    WorkSpaceSchema,
+    WorkSpaceSchemaOut,
+    WorkspaceSummaryOut,
+    WorkspaceDetailsOut,
+)
+from middleware.auth_middleware import get_current_user, get_current_user_async
 from models import User, Workspace, WorkspaceMember, Project, Task, WorkspaceInvite
+from models.task_counters import WorkspaceTaskCounter, ProjectTaskCounter, COUNTER_FIELDS
 from models.projects import ProjectMember, ProjectStatus
 from models.tasks import TaskStatus, TaskPriority
 from models.workspace import WorkspaceRole
@@ -15,8 +23,10 @@ import jwt
 from dotenv import load_dotenv
 import os
 import mailer
-from datetime import datetime as _dt_cls, date as _date_cls
 from utils.notification_generation import create_notification
+from utils.task_counters import create_task_counters, expected_counters, count_overdue
+from utils.query_stats import query_budget
+from utils.etags import touch, conditional_get, workspace_version
 
 load_dotenv()
 
@@ -49,6 +59,8 @@ def createWorkspace(
         )
         db.add(workspace)
         db.add(members)
+        db.flush()
+        create_task_counters(db, workspace.id)
         db.commit()
         db.refresh(workspace)
         db.refresh(members)
@@ -63,24 +75,44 @@ def createWorkspace(
     return workspace
 
 
-@router.get("/", response_model=List[WorkSpaceSchemaOut])
-def getWorkspaces(
+@router.get("/", response_model=List[WorkspaceSummaryOut])
+@query_budget(3)
+async def getWorkspaces(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        workspaces = (
-            db.query(Workspace)
-            .join(WorkspaceMember, Workspace.id == WorkspaceMember.workspace_id)
-            .filter(WorkspaceMember.user_id == current_user.id)
-            .options(
-                joinedload(Workspace.members).joinedload(WorkspaceMember.user),
-                joinedload(Workspace.projects),
+        # One row per workspace; the list only shows how many members and
+        # projects there are, so count them instead of loading them.
+        member_count = (
+            select(func.count(WorkspaceMember.id))
+            .where(WorkspaceMember.workspace_id == Workspace.id)
+            .correlate(Workspace)
+            .scalar_subquery()
+        )
+        project_count = (
+            select(func.count(Project.id))
+            .where(Project.workspace_id == Workspace.id)
+            .correlate(Workspace)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(
+                Workspace.id,
+                Workspace.name,
+                Workspace.description,
+                Workspace.color,
+                Workspace.owner_id,
+                Workspace.created_at,
+                member_count.label("member_count"),
+                project_count.label("project_count"),
             )
-            .all()
+            .join(WorkspaceMember, Workspace.id == WorkspaceMember.workspace_id)
+            .where(WorkspaceMember.user_id == current_user.id)
+            .order_by(Workspace.created_at)
         )
-        return workspaces
+        return result.all()
 
     except Exception as e:
         return ORJSONResponse(
@@ -89,17 +121,28 @@ def getWorkspaces(
         )
 
 
-@router.get("/{workspace_id}", response_model=WorkSpaceSchemaOut)
+@router.get("/{workspace_id}", response_model=WorkspaceDetailsOut)
+@query_budget(6)
 def getWorkspaceDetails(
     workspace_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     try:
+        # Missing workspaces and non-members fall through to the checks below
+        version = db.execute(workspace_version(workspace_id, current_user.id)).first()
+        if version and version.is_member:
+            cached = conditional_get(request, response, "getWorkspaceDetails", *version)
+            if cached:
+                return cached
+
+        # Separate queries per collection instead of one members x projects
+        # x tasks join
         workspace = (
             db.query(Workspace)
-            .options(joinedload(Workspace.members).joinedload(WorkspaceMember.user))
-            .options(joinedload(Workspace.projects).joinedload(Project.tasks))
+            .options(selectinload(Workspace.members).joinedload(WorkspaceMember.user))
             .filter(Workspace.id == workspace_id)
             .first()
         )
@@ -116,7 +159,33 @@ def getWorkspaceDetails(
                 content={"message": "You are not a member of this workspace"},
             )
 
-        return workspace
+        # Task totals come from the counters table, not from loading tasks
+        projects = (
+            db.query(
+                Project.id,
+                Project.title,
+                Project.status,
+                Project.progress,
+                Project.due_date,
+                Project.is_archived,
+                func.coalesce(ProjectTaskCounter.total, 0).label("task_count"),
+            )
+            .outerjoin(ProjectTaskCounter, ProjectTaskCounter.project_id == Project.id)
+            .filter(Project.workspace_id == workspace_id)
+            .order_by(Project.created_at.desc())
+            .all()
+        )
+
+        return {
+            "id": workspace.id,
+            "name": workspace.name,
+            "description": workspace.description,
+            "color": workspace.color,
+            "owner_id": workspace.owner_id,
+            "created_at": workspace.created_at,
+            "members": workspace.members,
+            "projects": projects,
+        }
 
     except Exception as e:
         return ORJSONResponse(
@@ -161,8 +230,8 @@ def getWorkspaceProjects(
                 Project.is_archived == False,
             )
             .options(
-                joinedload(Project.tasks),
-                joinedload(Project.members).joinedload(ProjectMember.user),
+                selectinload(Project.tasks),
+                selectinload(Project.members).joinedload(ProjectMember.user),
             )
             .order_by(Project.created_at.desc())
             .all()
@@ -192,7 +261,7 @@ def get_workspace_stats(
                 content={"message": "Workspace ID is required"},
             )
 
-        workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
+        workspace = db.query(Workspace.id).filter(Workspace.id == workspace_id).first()
         if not workspace:
             return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -200,105 +269,110 @@ def get_workspace_stats(
             )
 
         # Membership check
-        if not any(m.user_id == current_user.id for m in workspace.members):
+        isMember = (
+            db.query(WorkspaceMember.id)
+            .filter(
+                WorkspaceMember.workspace_id == workspace_id,
+                WorkspaceMember.user_id == current_user.id,
+            )
+            .first()
+        )
+        if not isMember:
             return ORJSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"message": "You are not a member of this workspace"},
             )
 
-        # --- Fetch projects & tasks ---
-        projects = (
-            db.query(Project)
+        # Counters come from SQL aggregates or the counters table; only
+        # small result rows are transferred, never the full task list.
+        project_archived = Project.is_archived.is_(True)
+        project_active = Project.is_archived.is_not(True)
+        task_archived = Task.is_archived.is_(True)
+        task_active = Task.is_archived.is_not(True)
+
+        # --- Project aggregates (projects the user is a member of) ---
+        project_counts = (
+            db.query(
+                func.count(Project.id),
+                func.count(Project.id).filter(project_archived),
+                func.count(Project.id).filter(
+                    project_active, Project.status == ProjectStatus.completed
+                ),
+                func.count(Project.id).filter(
+                    project_active, Project.status == ProjectStatus.in_progress
+                ),
+                func.count(Project.id).filter(
+                    project_active, Project.status == ProjectStatus.planning
+                ),
+            )
             .join(ProjectMember)
             .filter(
                 Project.workspace_id == workspace_id,
                 ProjectMember.user_id == current_user.id,
             )
-            .options(joinedload(Project.members))
-            .order_by(Project.created_at.desc())
-            .all()
+            .one()
         )
-        total_projects = len(projects)
-        total_archived_projects = sum(1 for p in projects if p.is_archived)
+        (
+            total_projects,
+            total_archived_projects,
+            total_project_completed,
+            total_project_in_progress,
+            total_project_planning,
+        ) = project_counts
 
-        tasks = (
-            db.query(Task)
+        # --- Task counters (maintained incrementally by routes/task.py) ---
+        counters = (
+            db.query(WorkspaceTaskCounter)
+            .filter(WorkspaceTaskCounter.workspace_id == workspace_id)
+            .first()
+        )
+        if counters:
+            counts = {f: getattr(counters, f) for f in COUNTER_FIELDS}
+        else:
+            # Rows are created with the workspace; count directly (without
+            # writing) if one is missing anyway
+            counts = expected_counters(db, workspace_id)[0][workspace_id]
+
+        now_dt = datetime.utcnow()
+        today_start = datetime.combine(now_dt.date(), datetime.min.time())
+
+        # --- Upcoming tasks (7-day window, tomorrow onwards) ---
+        upcoming_rows = (
+            db.query(
+                Task.id,
+                Task.title,
+                Task.status,
+                Task.priority,
+                Task.due_date,
+                Task.created_at,
+                Task.updated_at,
+                Task.project_id,
+            )
             .join(Project)
-            .filter(Project.workspace_id == workspace_id)
+            .filter(
+                Project.workspace_id == workspace_id,
+                task_active,
+                Task.due_date >= today_start + timedelta(days=1),
+                Task.due_date < today_start + timedelta(days=8),
+            )
+            .order_by(Task.due_date)
             .all()
         )
-        total_tasks = len(tasks)
-
-        # --- Project & Task Stats ---
-        total_project_in_progress = sum(
-            1
-            for p in projects
-            if p.status == ProjectStatus.in_progress and not p.is_archived
-        )
-        total_task_completed = sum(
-            1 for t in tasks if t.status == TaskStatus.done and not t.is_archived
-        )
-        total_task_todo = sum(
-            1 for t in tasks if t.status == TaskStatus.todo and not t.is_archived
-        )
-        total_task_in_progress = sum(
-            1 for t in tasks if t.status == TaskStatus.in_progress and not t.is_archived
-        )
-
-        # --- Helper to normalize values to date ---
-        # Accepts: datetime, date, or ISO date/datetime string. Returns date or None.
-
-        def _to_date(val):
-            if val is None:
-                return None
-            # already a datetime.datetime
-            if isinstance(val, _dt_cls):
-                return val.date()
-            # already a datetime.date
-            if isinstance(val, _date_cls):
-                return val
-            # try parsing ISO string (e.g. "2025-09-03" or "2025-09-03T12:34:56")
-            try:
-                parsed = _dt_cls.fromisoformat(str(val))
-                return parsed.date()
-            except Exception:
-                # fallback: can't parse
-                return None
-
-        # --- Upcoming tasks (7-day window) ---
-        from datetime import datetime as _now_dt, timedelta as _td
-
-        now_dt = _now_dt.utcnow()
-        today_date = _to_date(now_dt)
-        upcoming_limit_date = _to_date(now_dt + _td(days=7))
-
-        upcoming_tasks = []
-        for t in tasks:
-            if t.is_archived:
-                continue
-            t_due_date = _to_date(t.due_date)
-            if not t_due_date:
-                continue
-            # safe date comparison
-            if today_date < t_due_date <= upcoming_limit_date:
-                upcoming_tasks.append(
-                    {
-                        "id": str(t.id),
-                        "title": t.title,
-                        "status": t.status.value
-                        if isinstance(t.status, TaskStatus)
-                        else t.status,
-                        "priority": t.priority.value
-                        if isinstance(t.priority, TaskPriority)
-                        else t.priority,
-                        "due_date": t_due_date,
-                        "created_at": t.created_at,
-                        "updated_at": t.updated_at,
-                        "project_id": str(t.project_id),
-                    }
-                )
+        upcoming_tasks = [
+            {
+                "id": str(t.id),
+                "title": t.title,
+                "status": t.status.value if t.status else None,
+                "priority": t.priority.value if t.priority else None,
+                "due_date": t.due_date.date(),
+                "created_at": t.created_at,
+                "updated_at": t.updated_at,
+                "project_id": str(t.project_id),
+            }
+            for t in upcoming_rows
+        ]
 
-        # --- Weekly task trend (last 7 days) ---
+        # --- Weekly task trend (last 7 days, bucketed by day) ---
         task_trends_data = [
             {"name": "Sun", "completed": 0, "inProgress": 0, "toDo": 0, "archived": 0},
             {"name": "Mon", "completed": 0, "inProgress": 0, "toDo": 0, "archived": 0},
@@ -308,115 +382,126 @@ def get_workspace_stats(
             {"name": "Fri", "completed": 0, "inProgress": 0, "toDo": 0, "archived": 0},
             {"name": "Sat", "completed": 0, "inProgress": 0, "toDo": 0, "archived": 0},
         ]
-        last_7_days = [(now_dt - _td(days=i)).date() for i in range(6, -1, -1)]
-
-        for task in tasks:
-            if not task.updated_at:
-                continue
-            task_date = _to_date(task.updated_at)
-            if not task_date:
-                continue
-            if task_date in last_7_days:
-                day_name = task_date.strftime("%a")
-                day_data = next(
-                    (d for d in task_trends_data if d["name"] == day_name), None
-                )
-                if day_data is not None:
-                    if task.is_archived:
-                        day_data["archived"] += 1
-                    elif task.status == TaskStatus.done:
-                        day_data["completed"] += 1
-                    elif task.status == TaskStatus.in_progress:
-                        day_data["inProgress"] += 1
-                    elif task.status == TaskStatus.todo:
-                        day_data["toDo"] += 1
+        day_bucket = func.date_trunc("day", Task.updated_at).label("day")
+        trend_rows = (
+            db.query(
+                day_bucket,
+                func.count(Task.id).filter(task_archived),
+                func.count(Task.id).filter(task_active, Task.status == TaskStatus.done),
+                func.count(Task.id).filter(
+                    task_active, Task.status == TaskStatus.in_progress
+                ),
+                func.count(Task.id).filter(task_active, Task.status == TaskStatus.todo),
+            )
+            .join(Project)
+            .filter(
+                Project.workspace_id == workspace_id,
+                Task.updated_at >= today_start - timedelta(days=6),
+                Task.updated_at < today_start + timedelta(days=1),
+            )
+            .group_by(day_bucket)
+            .all()
+        )
+        trends_by_name = {d["name"]: d for d in task_trends_data}
+        for day, archived, completed, in_progress, todo in trend_rows:
+            day_data = trends_by_name.get(day.strftime("%a"))
+            if day_data is not None:
+                day_data["archived"] += archived
+                day_data["completed"] += completed
+                day_data["inProgress"] += in_progress
+                day_data["toDo"] += todo
 
         # --- Project status summary ---
         project_status_data = [
-            {"name": "completed", "value": 0, "color": "#10b981"},
-            {"name": "inProgress", "value": 0, "color": "#f59e0b"},
-            {"name": "planning", "value": 0, "color": "#3b82f6"},
-            {"name": "archived", "value": 0, "color": "#6b7280"},
+            {"name": "completed", "value": total_project_completed, "color": "#10b981"},
+            {"name": "inProgress", "value": total_project_in_progress, "color": "#f59e0b"},
+            {"name": "planning", "value": total_project_planning, "color": "#3b82f6"},
+            {"name": "archived", "value": total_archived_projects, "color": "#6b7280"},
         ]
-        for p in projects:
-            if p.is_archived:
-                project_status_data[3]["value"] += 1
-            elif p.status == ProjectStatus.completed:
-                project_status_data[0]["value"] += 1
-            elif p.status == ProjectStatus.in_progress:
-                project_status_data[1]["value"] += 1
-            elif p.status == ProjectStatus.planning:
-                project_status_data[2]["value"] += 1
 
         # --- Task priority summary ---
         task_priority_data = [
-            {"name": "high", "value": 0, "color": "#ef4444"},
-            {"name": "medium", "value": 0, "color": "#f59e0b"},
-            {"name": "low", "value": 0, "color": "#10b981"},
-            {"name": "archived", "value": 0, "color": "#6b7280"},
+            {"name": "high", "value": counts["high"], "color": "#ef4444"},
+            {"name": "medium", "value": counts["medium"], "color": "#f59e0b"},
+            {"name": "low", "value": counts["low"], "color": "#10b981"},
+            {"name": "archived", "value": counts["archived"], "color": "#6b7280"},
         ]
-        for t in tasks:
-            if t.is_archived:
-                task_priority_data[3]["value"] += 1
-            elif t.priority == TaskPriority.high:
-                task_priority_data[0]["value"] += 1
-            elif t.priority == TaskPriority.medium:
-                task_priority_data[1]["value"] += 1
-            elif t.priority == TaskPriority.low:
-                task_priority_data[2]["value"] += 1
-
-        # --- Productivity by project ---
 
         # --- Stats summary ---
         stats = {
             "totalProjects": total_projects,
             "totalArchivedProjects": total_archived_projects,
-            "totalTasks": total_tasks,
+            "totalTasks": counts["total"],
             "totalProjectInProgress": total_project_in_progress,
-            "totalTaskCompleted": total_task_completed,
-            "totalTaskToDo": total_task_todo,
-            "totalTaskInProgress": total_task_in_progress,
+            "totalTaskCompleted": counts["done"],
+            "totalTaskToDo": counts["todo"],
+            "totalTaskInProgress": counts["in_progress"],
+            "totalTaskOverdue": count_overdue(db, workspace_id),
         }
 
         # --- Recent projects (archived + unarchived) ---
-        recent_projects = []
-        for p in projects[:5]:
-            project_tasks = [t for t in tasks if t.project_id == p.id]
-            recent_projects.append(
-                {
-                    "id": str(p.id),
-                    "workspace_id": str(p.workspace_id),
-                    "title": p.title,
-                    "description": p.description,
-                    "status": p.status.value
-                    if isinstance(p.status, ProjectStatus)
-                    else p.status,
-                    "start_date": p.start_date,
-                    "due_date": p.due_date,
-                    "created_at": p.created_at,
-                    "updated_at": p.updated_at,
-                    "tags": p.tags,
-                    "is_archived": p.is_archived,
-                    "progress": p.progress,
-                    "tasks": [
-                        {
-                            "id": str(t.id),
-                            "title": t.title,
-                            "status": t.status.value
-                            if isinstance(t.status, TaskStatus)
-                            else t.status,
-                            "priority": t.priority.value
-                            if isinstance(t.priority, TaskPriority)
-                            else t.priority,
-                            "is_archived": t.is_archived,
-                            "due_date": t.due_date,
-                            "created_at": t.created_at,
-                            "updated_at": t.updated_at,
-                        }
-                        for t in project_tasks
-                    ],
-                }
+        recent = (
+            db.query(Project)
+            .join(ProjectMember)
+            .filter(
+                Project.workspace_id == workspace_id,
+                ProjectMember.user_id == current_user.id,
+            )
+            .order_by(Project.created_at.desc())
+            .limit(5)
+            .all()
+        )
+        tasks_by_project = {p.id: [] for p in recent}
+        if recent:
+            recent_task_rows = (
+                db.query(
+                    Task.id,
+                    Task.title,
+                    Task.status,
+                    Task.priority,
+                    Task.is_archived,
+                    Task.due_date,
+                    Task.created_at,
+                    Task.updated_at,
+                    Task.project_id,
+                )
+                .filter(Task.project_id.in_(tasks_by_project.keys()))
+                .all()
             )
+            for t in recent_task_rows:
+                tasks_by_project[t.project_id].append(
+                    {
+                        "id": str(t.id),
+                        "title": t.title,
+                        "status": t.status.value if t.status else None,
+                        "priority": t.priority.value if t.priority else None,
+                        "is_archived": t.is_archived,
+                        "due_date": t.due_date,
+                        "created_at": t.created_at,
+                        "updated_at": t.updated_at,
+                    }
+                )
+
+        recent_projects = [
+            {
+                "id": str(p.id),
+                "workspace_id": str(p.workspace_id),
+                "title": p.title,
+                "description": p.description,
+                "status": p.status.value
+                if isinstance(p.status, ProjectStatus)
+                else p.status,
+                "start_date": p.start_date,
+                "due_date": p.due_date,
+                "created_at": p.created_at,
+                "updated_at": p.updated_at,
+                "tags": p.tags,
+                "is_archived": p.is_archived,
+                "progress": p.progress,
+                "tasks": tasks_by_project[p.id],
+            }
+            for p in recent
+        ]
 
         return {
             "stats": stats,
@@ -611,6 +696,7 @@ def accept_generated_invitation(
             target_id=str(workspace_id),
         )
 
+        touch(workspace)
         db.commit()
         db.refresh(new_member)
 
@@ -714,6 +800,7 @@ def accept_invite_by_token(
             )
 
         db.delete(invite_info)
+        touch(workspace)
         db.commit()
         db.refresh(new_member)
 
@@ -804,6 +891,7 @@ def toggle_workspace_member(
                 )
                 action = "updated"
 
+            touch(workspace)
             db.commit()
             db.refresh(workspace)
 
@@ -52,3 +52,16 @@ class ProjectResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectSummaryResponse(BaseModel):
+    id: UUID
+    title: str
+    status: str
+    progress: int = 0
+    due_date: Optional[datetime] = None
+    is_archived: bool = False
+    task_count: int = 0
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from enum import Enum
 from datetime import datetime
 from typing import Optional, List
@@ -35,20 +35,26 @@ class TaskPriority(str, Enum):
 # NESTED OBJECTS
 # -------------------------------
 class SubtaskResponse(BaseModel):
-    id: str
+    id: UUID
     title: str
     completed: bool = False
     created_at: datetime
 
+    model_config = {"from_attributes": True}
+
 
 class AttachmentResponse(BaseModel):
+    id: UUID
     file_name: str
     file_url: str
     file_type: Optional[str] = None
     file_size: Optional[int] = None
+    sha256: Optional[str] = None
     uploaded_by: Optional[UUID] = None
     uploaded_at: datetime
 
+    model_config = {"from_attributes": True}
+
 
 class UserLiteResponse(BaseModel):
     id: UUID
@@ -76,6 +82,7 @@ class TaskBaseResponse(BaseModel):
     completed_at: Optional[datetime] = None
     estimated_hours: int = 0
     actual_hours: int = 0
+    comment_count: int = 0
     created_by: UUID
     is_archived: bool
     created_at: datetime
@@ -85,3 +92,9 @@ class TaskBaseResponse(BaseModel):
     ] = []  # Like populate("assignees", "name profilePicture")
 
     model_config = {"from_attributes": True}
+
+    @field_validator("watchers", mode="before")
+    @classmethod
+    def watcher_ids(cls, value):
+        # Task.watchers loads User rows; the API exposes their ids
+        return [getattr(w, "id", w) for w in value or []]
@@ -12,3 +12,15 @@ class UserSchemaOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CurrentUser(BaseModel):
+    # Lightweight authenticated principal cached by get_current_user.
+    # Not an ORM object: load the User row when a route needs to modify it.
+    id: UUID
+    name: str
+    email: str
+    profilePicture: Optional[str] = None
+    is2FAEnabled: Optional[bool] = False
+
+    model_config = {"from_attributes": True, "frozen": True}
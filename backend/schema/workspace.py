@@ -3,7 +3,7 @@ from typing import Annotated, List
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
-from .project import ProjectResponse
+from .project import ProjectResponse, ProjectSummaryResponse
 from .user import UserSchemaOut
 
 NameStr = Annotated[str, constr(strip_whitespace=True, min_length=3)]
@@ -36,3 +36,31 @@ class WorkSpaceSchemaOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class WorkspaceSummaryOut(BaseModel):
+    # Workspace list: counts instead of the member and project collections
+    id: UUID
+    name: str
+    description: Optional[str]
+    color: str
+    owner_id: UUID
+    created_at: datetime
+    member_count: int = 0
+    project_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+class WorkspaceDetailsOut(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str]
+    color: str
+    owner_id: UUID
+    created_at: datetime
+    members: List[WorkspaceMembersSchemaOut] = []
+    projects: List[ProjectSummaryResponse] = []
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,47 @@
+import asyncio
+
+
+def asgi_request(
+    app, method: str, path: str, headers: dict | None = None, body: bytes = b""
+):
+    """Run one request through an ASGI app in the calling context.
+
+    Returns (status, headers, body) with lower-cased header names. Runs in
+    the caller's context, so track_queries() around it sees the queries.
+    """
+    path, _, query = path.partition("?")
+    headers = dict(headers or {})
+    if body:
+        headers.setdefault("content-length", str(len(body)))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    response = {"status": None, "headers": {}, "body": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {
+                name.decode().lower(): value.decode() for name, value in message["headers"]
+            }
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    asyncio.run(app(scope, receive, send))
+    return response["status"], response["headers"], response["body"]
@@ -0,0 +1,153 @@
+import os
+import sys
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+# Tests import the backend modules the way app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Sizes of the data set the query budget tests run against
+MEMBERS = 3
+PROJECTS = 5
+TASKS_PER_PROJECT = 8
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    """A workspace with MEMBERS members and PROJECTS projects of
+    TASKS_PER_PROJECT tasks each, in the database at DATABASE_URL.
+
+    Yields user (the owner, as the CurrentUser principal), workspace_id,
+    user_ids, project_ids and task_ids; everything is removed afterwards.
+    """
+    if not DATABASE_URL:
+        pytest.skip("DATABASE_URL is not set")
+    from database import SessionLocal
+    from models.activity_log import ActivityLog
+    from models.projects import Project, ProjectMember, Role
+    from models.task_counters import ProjectTaskCounter, WorkspaceTaskCounter
+    from models.tasks import Task, TaskStatus
+    from models.users import User
+    from models.workspace import Workspace, WorkspaceMember, WorkspaceRole
+    from schema.user import CurrentUser
+    from utils.activity import stop_activity_writer
+    from utils.task_counters import create_task_counters, rebuild_task_counters
+
+    db = SessionLocal()
+    run = uuid.uuid4().hex[:8]
+    users = [
+        User(email=f"budget-{run}-{i}@example.com", password="x", name=f"Member {i}")
+        for i in range(MEMBERS)
+    ]
+    db.add_all(users)
+    db.flush()
+    owner = users[0]
+    workspace = Workspace(name=f"Budget {run}", owner_id=owner.id)
+    db.add(workspace)
+    db.flush()
+    db.add_all(
+        WorkspaceMember(
+            workspace_id=workspace.id,
+            user_id=user.id,
+            role=WorkspaceRole.owner if user is owner else WorkspaceRole.member,
+        )
+        for user in users
+    )
+    projects = [
+        Project(title=f"Project {i}", workspace_id=workspace.id, created_by=owner.id)
+        for i in range(PROJECTS)
+    ]
+    db.add_all(projects)
+    db.flush()
+    statuses = list(TaskStatus)
+    for project in projects:
+        db.add_all(
+            ProjectMember(project_id=project.id, user_id=user.id, role=Role.manager)
+            for user in users
+        )
+        db.add_all(
+            Task(
+                title=f"Task {i}",
+                project_id=project.id,
+                status=statuses[i % len(statuses)],
+                created_by=owner.id,
+            )
+            for i in range(TASKS_PER_PROJECT)
+        )
+    db.flush()
+    create_task_counters(db, workspace.id)
+    rebuild_task_counters(db, workspace.id)
+    db.commit()
+
+    user = CurrentUser.model_validate(owner)
+    workspace_id = workspace.id
+    project_ids = [project.id for project in projects]
+    user_ids = [u.id for u in users]
+    task_ids = [
+        task_id
+        for (task_id,) in db.query(Task.id).filter(Task.project_id.in_(project_ids)).all()
+    ]
+    db.rollback()
+    try:
+        yield SimpleNamespace(
+            user=user,
+            workspace_id=workspace_id,
+            user_ids=user_ids,
+            project_ids=project_ids,
+            task_ids=task_ids,
+        )
+    finally:
+        db.rollback()
+        # Routes under test record activity for these users; write it out
+        # so it can be removed with them
+        stop_activity_writer()
+        db.query(ActivityLog).filter(ActivityLog.user_id.in_(user_ids)).delete(
+            synchronize_session=False
+        )
+        db.query(Task).filter(Task.project_id.in_(project_ids)).delete(synchronize_session=False)
+        db.query(ProjectMember).filter(ProjectMember.project_id.in_(project_ids)).delete(
+            synchronize_session=False
+        )
+        db.query(ProjectTaskCounter).filter(
+            ProjectTaskCounter.workspace_id == workspace_id
+        ).delete(synchronize_session=False)
+        db.query(WorkspaceTaskCounter).filter(
+            WorkspaceTaskCounter.workspace_id == workspace_id
+        ).delete(synchronize_session=False)
+        db.query(Project).filter(Project.id.in_(project_ids)).delete(synchronize_session=False)
+        db.query(WorkspaceMember).filter(WorkspaceMember.workspace_id == workspace_id).delete(
+            synchronize_session=False
+        )
+        db.query(Workspace).filter(Workspace.id == workspace_id).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def api(seeded):
+    """The API routes, signed in as the seeded workspace owner, with
+    QueryInstrumentationMiddleware in strict mode. Authentication is
+    overridden so only the route's own queries are counted."""
+    from fastapi import FastAPI
+    from fastapi.responses import ORJSONResponse
+    from middleware.auth_middleware import get_current_user, get_current_user_async
+    from middleware.query_instrumentation import QueryInstrumentationMiddleware
+    from routes import index
+
+    user = seeded.user
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(QueryInstrumentationMiddleware, strict=True)
+    app.include_router(index.router, prefix="/api-v1")
+
+    async def current_user_async():
+        return user
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_current_user_async] = current_user_async
+    return app
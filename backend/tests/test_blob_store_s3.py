@@ -0,0 +1,99 @@
+"""Attachment bodies on an S3-compatible store (e.g. MinIO).
+
+Needs S3_ENDPOINT_URL (with AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY for
+it) and the database at DATABASE_URL; skipped without them. Blobs go under
+a prefix of their own, so the bucket may be shared.
+"""
+import os
+import uuid
+
+import orjson
+import pytest
+
+from asgi_client import asgi_request
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("S3_ENDPOINT_URL"), reason="S3_ENDPOINT_URL is not set"
+)
+
+
+@pytest.fixture
+def s3_store(monkeypatch):
+    pytest.importorskip("boto3")
+    import routes.task
+    from utils import blob_store
+
+    store = blob_store.S3BlobBackend(prefix=f"test-{uuid.uuid4().hex}/blobs/")
+    try:
+        store.client.create_bucket(Bucket=store.bucket)
+    except store.client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    monkeypatch.setattr(blob_store, "store", store)
+    monkeypatch.setattr(routes.task, "blob_store", store)
+    yield store
+    from database import SessionLocal
+    from models.blob import Blob
+
+    leftover = [sha256 for sha256, _ in store.iter_blobs()]
+    for sha256 in leftover:
+        store.delete(sha256)
+    if leftover:
+        db = SessionLocal()
+        try:
+            db.query(Blob).filter(Blob.sha256.in_(leftover)).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+
+def upload(api, task_id, name: str, content: bytes):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="files"; filename="{name}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    status, _, response = asgi_request(
+        api,
+        "POST",
+        f"/api-v1/tasks/{task_id}/attachments",
+        {"content-type": f"multipart/form-data; boundary={boundary}"},
+        body,
+    )
+    assert status == 200, response
+    [attachment] = orjson.loads(response)["attachments"]
+    return attachment
+
+
+def ref_count(sha256: str):
+    from database import SessionLocal
+    from models.blob import Blob
+
+    db = SessionLocal()
+    try:
+        return db.query(Blob.ref_count).filter(Blob.sha256 == sha256).scalar()
+    finally:
+        db.close()
+
+
+def test_shared_content_is_stored_once_and_collected(api, seeded, s3_store):
+    task_id = seeded.task_ids[0]
+    content = uuid.uuid4().bytes * 1024
+
+    first = upload(api, task_id, "one.bin", content)
+    second = upload(api, task_id, "two.bin", content)
+
+    sha256 = first["sha256"]
+    assert second["sha256"] == sha256
+    assert [sha for sha, _ in s3_store.iter_blobs()] == [sha256]
+    assert ref_count(sha256) == 2
+
+    query = "&".join(f"attachment_ids={a['id']}" for a in (first, second))
+    status, _, response = asgi_request(
+        api, "DELETE", f"/api-v1/tasks/{task_id}/attachments?{query}"
+    )
+
+    assert status == 200, response
+    assert ref_count(sha256) is None
+    assert not s3_store.exists(sha256)
+    assert list(s3_store.iter_blobs()) == []
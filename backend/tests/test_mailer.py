@@ -0,0 +1,141 @@
+"""Mail delivery against a local aiosmtpd stand-in."""
+import importlib
+import json
+import socket
+import time
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller  # noqa: E402
+
+REFUSED = "refused@example.com"
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.delivered = []  # (recipient, subject, session id)
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REFUSED:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        subject = next(
+            line.split(":", 1)[1].strip()
+            for line in envelope.content.decode().splitlines()
+            if line.startswith("Subject:")
+        )
+        for recipient in envelope.rcpt_tos:
+            self.delivered.append((recipient, subject, id(session)))
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def smtp(monkeypatch, tmp_path):
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("SMTP_PORT", str(port))
+    monkeypatch.setenv("SMTP_STARTTLS", "false")
+    monkeypatch.setenv("SMTP_USER", "app@example.com")
+    monkeypatch.delenv("SMTP_PASS", raising=False)
+    monkeypatch.setenv("MAIL_WORKERS", "1")
+    monkeypatch.setenv("MAIL_RETRY_BASE_DELAY", "0.1")
+    monkeypatch.setenv("MAIL_DEAD_LETTER_PATH", str(tmp_path / "dead_letters.jsonl"))
+    import mailer
+
+    mailer = importlib.reload(mailer)
+
+    state = {"controller": controller}
+
+    def restart():
+        # Closes every open connection, as a server dropping idle clients does
+        state["controller"].stop()
+        state["controller"] = Controller(handler, hostname="127.0.0.1", port=port)
+        state["controller"].start()
+
+    yield mailer, handler, restart
+    mailer.stop_mail_workers()
+    state["controller"].stop()
+
+
+def dead_letters(mailer) -> list:
+    try:
+        with open(mailer.MAIL_DEAD_LETTER_PATH, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def test_messages_are_delivered(smtp):
+    mailer, handler, _ = smtp
+    mailer.send_email("one@example.com", "first", "body")
+    mailer.send_email("two@example.com", "second", "body")
+
+    assert wait_for(lambda: len(handler.delivered) == 2)
+    assert {(to, subject) for to, subject, _ in handler.delivered} == {
+        ("one@example.com", "first"),
+        ("two@example.com", "second"),
+    }
+    assert dead_letters(mailer) == []
+
+
+def test_batch_reuses_one_connection(smtp):
+    mailer, handler, _ = smtp
+    # Queue the batch before the worker starts so it is sent in one go
+    for i in range(5):
+        mailer._enqueue(mailer._build_message(f"user{i}@example.com", f"batch {i}", "body"), None)
+    mailer.start_mail_workers()
+
+    assert wait_for(lambda: len(handler.delivered) == 5)
+    assert len({session for _, _, session in handler.delivered}) == 1
+
+
+def test_dropped_connection_is_reopened(smtp, monkeypatch):
+    mailer, handler, restart = smtp
+    # A reconnect must not use up an attempt, so a single one is enough
+    monkeypatch.setattr(mailer, "MAIL_MAX_ATTEMPTS", 1)
+    mailer.send_email("one@example.com", "before", "body")
+    assert wait_for(lambda: len(handler.delivered) == 1)
+
+    restart()
+    mailer.send_email("one@example.com", "after", "body")
+
+    assert wait_for(lambda: len(handler.delivered) == 2)
+    assert handler.delivered[1][1] == "after"
+    assert handler.delivered[0][2] != handler.delivered[1][2]
+    assert dead_letters(mailer) == []
+
+
+def test_refused_recipient_is_dead_lettered(smtp):
+    mailer, handler, _ = smtp
+    mailer.generate_email("secret-token", REFUSED, "reset-password")
+
+    assert wait_for(lambda: dead_letters(mailer))
+    [record] = dead_letters(mailer)
+    assert record["to"] == REFUSED
+    assert record["purpose"] == "reset-password"
+    assert record["attempts"] == 1
+    assert "secret-token" not in json.dumps(record)
+    assert handler.delivered == []
@@ -0,0 +1,104 @@
+"""QueryInstrumentationMiddleware in strict mode.
+
+The toy routes run their SQL on an in-memory SQLite engine with the same
+listeners database.py installs, so they need no Postgres. The budgeted API
+routes at the end run against DATABASE_URL and are skipped without it.
+"""
+import orjson
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from asgi_client import asgi_request
+from middleware.query_instrumentation import (
+    N_PLUS_ONE_THRESHOLD,
+    QueryInstrumentationMiddleware,
+)
+from utils.query_stats import instrument_queries, query_budget
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+instrument_queries(engine)
+
+
+def run_queries(count: int, statement: str = "SELECT 1"):
+    with engine.connect() as connection:
+        for _ in range(count):
+            connection.execute(text(statement))
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = FastAPI()
+    app.add_middleware(QueryInstrumentationMiddleware, budget=50, strict=True)
+
+    @app.get("/within")
+    @query_budget(3)
+    def within():
+        run_queries(3)
+        return {"ok": True}
+
+    @app.get("/over")
+    @query_budget(3)
+    async def over():
+        run_queries(4)
+        return {"ok": True}
+
+    @app.get("/n-plus-one")
+    def n_plus_one():
+        # Under the default budget, but the same statement again and again
+        with engine.connect() as connection:
+            for i in range(N_PLUS_ONE_THRESHOLD):
+                connection.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    return app
+
+
+def test_within_budget_passes_with_server_timing(app):
+    status, headers, body = asgi_request(app, "GET", "/within")
+
+    assert status == 200
+    assert orjson.loads(body) == {"ok": True}
+    assert 'desc="3 queries' in headers["server-timing"]
+
+
+def test_over_budget_fails(app):
+    status, _, body = asgi_request(app, "GET", "/over")
+
+    assert status == 500
+    content = orjson.loads(body)
+    assert content["message"] == "Query budget exceeded"
+    assert content["problems"] == ["4 queries (budget 3)"]
+
+
+def test_repeated_statement_fails(app):
+    status, _, body = asgi_request(app, "GET", "/n-plus-one")
+
+    assert status == 500
+    [problem] = orjson.loads(body)["problems"]
+    assert problem.startswith(f"N+1: {N_PLUS_ONE_THRESHOLD}x SELECT ?")
+
+
+# The real budgets; these need the database at DATABASE_URL (see
+# conftest.seeded) and are skipped without it.
+
+
+def test_workspaces_within_budget(api):
+    status, headers, body = asgi_request(api, "GET", "/api-v1/workspaces/")
+
+    assert status == 200, body
+    assert "server-timing" in headers
+
+
+def test_project_board_within_budget(api, seeded):
+    project_id = seeded.project_ids[0]
+    status, headers, body = asgi_request(
+        api, "GET", f"/api-v1/projects/{project_id}/board?per_column=2"
+    )
+
+    assert status == 200, body
+    assert "server-timing" in headers
+    assert sum(column["count"] for column in orjson.loads(body)["columns"].values()) > 0
@@ -0,0 +1,40 @@
+"""Query and row budgets for the workspace endpoints.
+
+Runs against the migrated database in DATABASE_URL (skipped when it is not
+set) with the data set from conftest.seeded. The budgets are exact for that
+data set: a query per member or per project shows up as a failure here.
+"""
+import pytest
+
+from asgi_client import asgi_request
+from utils.query_stats import track_queries
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_up(api, seeded):
+    # The first request on a fresh pool also runs the driver's connection
+    # setup queries; keep those out of the budgets
+    asgi_request(api, "GET", "/api-v1/workspaces/")
+    asgi_request(api, "GET", f"/api-v1/workspaces/{seeded.workspace_id}")
+
+
+def test_list_workspaces(api):
+    with track_queries() as stats:
+        status, _, _ = asgi_request(api, "GET", "/api-v1/workspaces/")
+
+    assert status == 200
+    # One row per workspace, member and project counts included
+    stats.check(max_queries=1, max_rows=1, label="GET /workspaces/")
+
+
+def test_workspace_details(api, seeded):
+    with track_queries() as stats:
+        status, _, _ = asgi_request(api, "GET", f"/api-v1/workspaces/{seeded.workspace_id}")
+
+    assert status == 200
+    # ETag stamp, workspace, members with their users, projects with counts
+    stats.check(
+        max_queries=4,
+        max_rows=1 + 1 + len(seeded.user_ids) + len(seeded.project_ids),
+        label="GET /workspaces/{id}",
+    )
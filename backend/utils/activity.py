@@ -1,17 +1,176 @@
 from models.activity_log import ActivityLog
 from fastapi.responses import ORJSONResponse
 from fastapi import status
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from datetime import datetime
+from utils import metrics
+import orjson
+import os
+import queue
+import threading
+import time
+import uuid
 
-def record_activity(db, userId, action, resourceType, resourceId, details):
+# Activity entries are buffered and written in bulk by a background thread
+# instead of riding along in every write transaction.
+#   ACTIVITY_LOG_MODE=async (default) | sync
+# "sync" writes each entry in the caller's transaction, as before.
+ACTIVITY_LOG_MODE = os.getenv("ACTIVITY_LOG_MODE", "async").lower()
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "1"))
+ACTIVITY_MAX_ATTEMPTS = int(os.getenv("ACTIVITY_MAX_ATTEMPTS", "3"))
+# Entries that could not be written (queue full, or every attempt failed)
+# are appended here as JSON lines for replay, never silently lost
+ACTIVITY_DEAD_LETTER_PATH = os.getenv(
+    "ACTIVITY_DEAD_LETTER_PATH", "activity_dead_letters.jsonl"
+)
+
+_queue = queue.Queue(maxsize=ACTIVITY_QUEUE_SIZE)
+_writer = None
+_writer_lock = threading.Lock()
+_stop = threading.Event()
+_dead_letter_lock = threading.Lock()
+
+
+def record_activity(db, userId, action, resourceType, resourceId, details, sync=False):
     try:
-        activity = ActivityLog(
-            user_id=userId,
-            action=action,
-            resource_type=resourceType,
-            resource_id=resourceId,
-            details=details,
-        )
-        db.add(activity)
-        return activity
+        entry = {
+            "id": uuid.uuid4(),
+            "user_id": userId,
+            "action": action,
+            "resource_type": resourceType,
+            "resource_id": resourceId,
+            "details": details,
+            # Stamped now so ordering follows the mutation, not the flush
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        }
+        if sync or ACTIVITY_LOG_MODE == "sync":
+            activity = ActivityLog(**entry)
+            db.add(activity)
+            return activity
+
+        # Handed to the writer only once the caller's transaction commits
+        db.info.setdefault("pending_activity", []).append(entry)
+        return entry
     except Exception as e:
-        return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"message": str(e)})
\ No newline at end of file
+        return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"message": str(e)})
+
+
+def _write(entries):
+    db = SessionLocal()
+    try:
+        db.execute(insert(ActivityLog), entries)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _dead_letter(entries, error: str):
+    metrics.incr("activity.dropped", len(entries))
+    failed_at = datetime.utcnow().isoformat()
+    try:
+        with _dead_letter_lock:
+            with open(ACTIVITY_DEAD_LETTER_PATH, "ab") as f:
+                for entry in entries:
+                    f.write(
+                        orjson.dumps(
+                            {"entry": entry, "error": error, "failed_at": failed_at}
+                        )
+                        + b"\n"
+                    )
+    except Exception as e:
+        print(f"Could not write {len(entries)} activity entries to dead letters: {e}")
+        return
+    print(f"{len(entries)} activity entries moved to dead letters: {error}")
+
+
+def _flush(batch):
+    error = None
+    for attempt in range(1, ACTIVITY_MAX_ATTEMPTS + 1):
+        started = time.perf_counter()
+        try:
+            _write(batch)
+        except Exception as e:
+            error = str(e)
+            metrics.incr("activity.flush_failures")
+            print(f"Activity flush failed (attempt {attempt}): {e}")
+            if attempt < ACTIVITY_MAX_ATTEMPTS:
+                time.sleep(attempt)
+            continue
+        metrics.observe("activity.flush", time.perf_counter() - started)
+        metrics.incr("activity.written", len(batch))
+        return
+    _dead_letter(batch, error)
+
+
+def _writer_loop():
+    while not _stop.is_set() or not _queue.empty():
+        try:
+            batch = [_queue.get(timeout=ACTIVITY_FLUSH_INTERVAL)]
+        except queue.Empty:
+            continue
+
+        # Give a burst a moment to accumulate, then write it in one go
+        deadline = time.monotonic() + ACTIVITY_FLUSH_INTERVAL
+        while len(batch) < ACTIVITY_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0 and not _stop.is_set():
+                    batch.append(_queue.get(timeout=remaining))
+                else:
+                    batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        _flush(batch)
+
+
+def start_activity_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is not None and _writer.is_alive():
+            return
+        _stop.clear()
+        _writer = threading.Thread(target=_writer_loop, name="activity-writer", daemon=True)
+        _writer.start()
+
+
+def stop_activity_writer(timeout: float = 10):
+    """Flush whatever is still queued, then stop the writer."""
+    with _writer_lock:
+        _stop.set()
+        if _writer is not None:
+            _writer.join(timeout)
+
+
+def _enqueue(entries):
+    # Runs in after_commit, possibly on the event loop (AsyncSession), so it
+    # must never block: when the writer is behind, the overflow goes to the
+    # dead-letter file instead of being written to the database here.
+    start_activity_writer()
+    for i, entry in enumerate(entries):
+        try:
+            _queue.put_nowait(entry)
+        except queue.Full:
+            metrics.incr("activity.queue_full")
+            _dead_letter(entries[i:], "activity queue full")
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_activity(session):
+    entries = session.info.pop("pending_activity", None)
+    if entries:
+        _enqueue(entries)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_activity(session, previous_transaction):
+    session.info.pop("pending_activity", None)
+
+
+metrics.register_gauge("activity", lambda: {"queued": _queue.qsize()})
@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+from sqlalchemy import text
+from database import engine
+from utils.job_leader import is_leader
+
+# activity_logs is range-partitioned by month on created_at. A scheduled job
+# keeps partitions created ahead of time and, when a retention period is set,
+# archives expired months to gzipped JSON lines and drops them.
+ACTIVITY_PARTITIONS_AHEAD = int(os.getenv("ACTIVITY_PARTITIONS_AHEAD", "3"))
+# 0 keeps every month forever
+ACTIVITY_RETENTION_MONTHS = int(os.getenv("ACTIVITY_RETENTION_MONTHS", "0"))
+# Empty: expired months are dropped without an archive
+ACTIVITY_ARCHIVE_DIR = os.getenv("ACTIVITY_ARCHIVE_DIR", "activity_archive")
+
+# Advisory lock key: one worker process maintains the partitions
+PARTITION_LOCK_KEY = 720_002
+
+PARENT_TABLE = "activity_logs"
+PARTITION_NAME = re.compile(r"^activity_logs_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return datetime(month.year + years, month_index + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_y{month:%Y}m{month:%m}"
+
+
+def create_partition(connection, month: datetime):
+    month = month_start(month)
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+            f"PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+    )
+
+
+def ensure_partitions(connection, now: datetime | None = None):
+    current = month_start(now or datetime.utcnow())
+    for offset in range(ACTIVITY_PARTITIONS_AHEAD + 1):
+        create_partition(connection, add_months(current, offset))
+
+
+def list_partitions(connection):
+    """(month, name) for every monthly partition, oldest first."""
+    names = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append((datetime(int(match[1]), int(match[2]), 1), name))
+    return sorted(partitions)
+
+
+def archive_partition(connection, name: str) -> str:
+    """Stream a partition to <ACTIVITY_ARCHIVE_DIR>/<name>.jsonl.gz.
+
+    An archive already carrying the final name is complete (an earlier run
+    stopped before the drop) and is kept as it is.
+    """
+    os.makedirs(ACTIVITY_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(ACTIVITY_ARCHIVE_DIR, f"{name}.jsonl.gz")
+    if os.path.exists(path):
+        return path
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+    rows = connection.execution_options(stream_results=True, yield_per=1000).execute(
+        text(f"SELECT * FROM {name} ORDER BY created_at, id")
+    )
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for row in rows.mappings():
+                f.write(json.dumps(dict(row), default=str) + "\n")
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    # Only a complete archive ever carries the final name
+    os.replace(tmp_path, path)
+    return path
+
+
+def expired_partitions(connection, now: datetime | None = None):
+    if ACTIVITY_RETENTION_MONTHS <= 0:
+        return []
+    cutoff = add_months(month_start(now or datetime.utcnow()), -ACTIVITY_RETENTION_MONTHS)
+    return [name for month, name in list_partitions(connection) if month < cutoff]
+
+
+def drop_partition(connection, name: str):
+    if ACTIVITY_ARCHIVE_DIR:
+        archive_partition(connection, name)
+    connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+    connection.execute(text(f"DROP TABLE {name}"))
+
+
+def maintain_activity_partitions():
+    # Scheduled job: runs outside of a request, so it owns its connections.
+    # Every worker schedules it; only the leader runs it.
+    if not is_leader(PARTITION_LOCK_KEY):
+        return
+    try:
+        with engine.begin() as connection:
+            ensure_partitions(connection)
+            expired = expired_partitions(connection)
+        # One transaction per month, so a failure keeps the rest consistent
+        for name in expired:
+            with engine.begin() as connection:
+                drop_partition(connection, name)
+            print(f"Activity log partition {name} archived and dropped")
+    except Exception as e:
+        print(f"Activity log partition maintenance failed: {e}")
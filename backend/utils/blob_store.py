@@ -0,0 +1,284 @@
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from database import SessionLocal
+from models.blob import Blob
+from utils.uploads import UPLOAD_DIR
+
+# Attachment bodies are stored once per distinct content, addressed by their
+# SHA-256; the blobs table counts the attachments referencing each one.
+#   BLOB_STORE=local (default) | s3
+BLOB_STORE = os.getenv("BLOB_STORE", "local").lower()
+BLOB_DIR = os.getenv("BLOB_DIR", os.path.join(UPLOAD_DIR, "blobs"))
+STAGING_DIR = os.path.join(UPLOAD_DIR, ".staging")
+# Blobs stored without a blobs row (upload rolled back) are removed once
+# they are older than this
+BLOB_ORPHAN_GRACE_SECONDS = int(os.getenv("BLOB_ORPHAN_GRACE_SECONDS", "3600"))
+S3_BUCKET = os.getenv("S3_BUCKET", "attachments")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # e.g. a local MinIO
+S3_PREFIX = os.getenv("S3_PREFIX", "blobs/")
+
+
+class BlobBackend(ABC):
+    """Storage interface. Keys are SHA-256 hex digests."""
+
+    @abstractmethod
+    def put(self, sha256: str, source_path: str):
+        """Store the file at source_path under sha256 and remove source_path.
+
+        An existing blob is left as it is, modification time included.
+        """
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, sha256: str):
+        pass
+
+    def local_path(self, sha256: str) -> str | None:
+        """Filesystem path of the blob if the backend keeps one, else None."""
+        return None
+
+    @abstractmethod
+    def stat(self, sha256: str):
+        """(size in bytes, last modified as naive UTC datetime)."""
+
+    @abstractmethod
+    def iter_chunks(self, sha256: str, start: int = 0, end: int | None = None,
+                    chunk_size: int = 1024 * 1024):
+        """Yield the body, or bytes start..end inclusive."""
+
+    @abstractmethod
+    def iter_blobs(self):
+        """(sha256, last modified as naive UTC datetime) for every stored blob."""
+
+
+class LocalBlobBackend(BlobBackend):
+    def __init__(self, root: str = BLOB_DIR):
+        self.root = root
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def put(self, sha256: str, source_path: str):
+        path = self._path(sha256)
+        if os.path.exists(path):
+            os.remove(source_path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.isfile(self._path(sha256))
+
+    def delete(self, sha256: str):
+        try:
+            os.remove(self._path(sha256))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, sha256: str) -> str | None:
+        path = self._path(sha256)
+        return path if os.path.isfile(path) else None
+
+    def stat(self, sha256: str):
+        result = os.stat(self._path(sha256))
+        return result.st_size, datetime.utcfromtimestamp(result.st_mtime)
+
+    def iter_chunks(self, sha256: str, start: int = 0, end: int | None = None,
+                    chunk_size: int = 1024 * 1024):
+        with open(self._path(sha256), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def iter_blobs(self):
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if is_sha256(name):
+                    modified = os.stat(os.path.join(directory, name)).st_mtime
+                    yield name, datetime.utcfromtimestamp(modified)
+
+
+class S3BlobBackend(BlobBackend):
+    """Any S3-compatible service; point S3_ENDPOINT_URL at MinIO locally."""
+
+    def __init__(self, bucket: str = S3_BUCKET, prefix: str = S3_PREFIX):
+        import boto3  # only needed when this backend is selected
+
+        self.client = boto3.client("s3", endpoint_url=S3_ENDPOINT_URL)
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, sha256: str) -> str:
+        return f"{self.prefix}{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def put(self, sha256: str, source_path: str):
+        try:
+            if not self.exists(sha256):
+                self.client.upload_file(source_path, self.bucket, self._key(sha256))
+        finally:
+            os.remove(source_path)
+
+    def exists(self, sha256: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+            return True
+        except ClientError:
+            return False
+
+    def delete(self, sha256: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(sha256))
+
+    def stat(self, sha256: str):
+        head = self.client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+        return head["ContentLength"], head["LastModified"].replace(tzinfo=None)
+
+    def iter_chunks(self, sha256: str, start: int = 0, end: int | None = None,
+                    chunk_size: int = 1024 * 1024):
+        options = {}
+        if start or end is not None:
+            options["Range"] = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(
+            Bucket=self.bucket, Key=self._key(sha256), **options
+        )["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def iter_blobs(self):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                name = item["Key"].rsplit("/", 1)[-1]
+                if is_sha256(name):
+                    yield name, item["LastModified"].replace(tzinfo=None)
+
+
+BACKENDS = {
+    "local": LocalBlobBackend,
+    "s3": S3BlobBackend,
+}
+
+store = BACKENDS.get(BLOB_STORE, LocalBlobBackend)()
+
+
+def staging_path() -> str:
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    return os.path.join(STAGING_DIR, uuid.uuid4().hex)
+
+
+def discard_staged(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def is_sha256(value: str) -> bool:
+    return len(value) == 64 and all(c in "0123456789abcdef" for c in value)
+
+
+def add_blob_ref_statement(sha256: str, size: int):
+    # Taking the reference before the body is stored means a concurrent
+    # collect_blobs either sees the new reference or has already removed the
+    # old body, in which case put() writes it again.
+    return (
+        insert(Blob)
+        .values(sha256=sha256, size=size, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[Blob.sha256],
+            set_={"ref_count": Blob.ref_count + 1, "updated_at": datetime.utcnow()},
+        )
+    )
+
+
+def release_blob_refs_statement(sha256: str, count: int = 1):
+    return (
+        update(Blob)
+        .where(Blob.sha256 == sha256)
+        .values(ref_count=Blob.ref_count - count)
+    )
+
+
+def collect_blobs(db, sha256s=None) -> list:
+    """Delete unreferenced blobs (all of them, or only among sha256s).
+
+    Each body is removed before its row deletion commits, so an upload
+    racing on the same content waits on the row and re-stores the body.
+    """
+    query = delete(Blob).where(Blob.ref_count <= 0).returning(Blob.sha256)
+    if sha256s is not None:
+        query = query.where(Blob.sha256.in_(list(sha256s)))
+    collected = list(db.execute(query).scalars())
+    for sha256 in collected:
+        store.delete(sha256)
+    db.commit()
+    return collected
+
+
+def claim_orphans(db, sha256s) -> list:
+    """Remove bodies that have no blobs row.
+
+    A body's age says nothing about whether an upload is about to reference
+    it, so each one is claimed with an unreferenced row first. An upload
+    holding an uncommitted reference makes the claim wait and then skip the
+    body; one arriving after the claim waits on the row and re-stores it.
+    """
+    claimed = []
+    for sha256 in sha256s:
+        try:
+            size = store.stat(sha256)[0]
+        except Exception:
+            continue  # already gone
+        claimed.extend(
+            db.execute(
+                insert(Blob)
+                .values(sha256=sha256, size=size, ref_count=0)
+                .on_conflict_do_nothing(index_elements=[Blob.sha256])
+                .returning(Blob.sha256)
+            ).scalars()
+        )
+    return collect_blobs(db, claimed) if claimed else []
+
+
+def sweep_blobs():
+    # Scheduled job: runs outside of a request, so it owns its session.
+    db = SessionLocal()
+    try:
+        collected = collect_blobs(db)
+
+        # Bodies whose upload never committed a reference
+        cutoff = datetime.utcnow() - timedelta(seconds=BLOB_ORPHAN_GRACE_SECONDS)
+        candidates = [sha for sha, modified in store.iter_blobs() if modified < cutoff]
+        known = set()
+        for i in range(0, len(candidates), 1000):
+            known.update(
+                db.execute(
+                    select(Blob.sha256).where(Blob.sha256.in_(candidates[i : i + 1000]))
+                ).scalars()
+            )
+        orphans = claim_orphans(db, [sha for sha in candidates if sha not in known])
+
+        if collected or orphans:
+            print(f"Blob sweep removed {len(collected)} unreferenced and {len(orphans)} orphaned blobs")
+    except Exception as e:
+        db.rollback()
+        print(f"Blob sweep failed: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import time
+from typing import Dict, Set
+from fastapi import WebSocket
+from utils import metrics
+
+# Each socket gets its own bounded outbound queue drained by its own sender
+# task, so a slow client only ever delays itself.
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "100"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+WS_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "25"))
+# Close sockets whose client has sent nothing, not even a pong, for this long
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "75"))
+# "coalesce": replace the backlog with one resync message (client refetches)
+# "drop_oldest": discard the oldest queued message
+WS_OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "coalesce")
+
+PING_MESSAGE = {"type": "ping"}
+RESYNC_MESSAGE = {"type": "resync"}
+
+active_connections: Dict[str, Set["ClientConnection"]] = {}
+_heartbeat_task = None
+
+
+class ClientConnection:
+    def __init__(self, user_id: str, websocket: WebSocket):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+        # Last time data arrived from the client (messages or pong replies
+        # to our pings); the route's receive loop updates it
+        self.last_seen = time.monotonic()
+        self.closed = False
+        self.resync_pending = False
+        self._sender = asyncio.create_task(self._send_loop())
+
+    def enqueue(self, message: dict):
+        if self.closed:
+            return
+        if self.resync_pending and message is not PING_MESSAGE:
+            # The client reloads everything on resync anyway
+            metrics.incr("ws.messages_dropped")
+            return
+        try:
+            self.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if WS_OVERFLOW_POLICY == "drop_oldest":
+            self.queue.get_nowait()
+            metrics.incr("ws.messages_dropped")
+            self.queue.put_nowait(message)
+            return
+
+        dropped = 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            dropped += 1
+        metrics.incr("ws.messages_dropped", dropped)
+        self.resync_pending = True
+        self.queue.put_nowait(RESYNC_MESSAGE)
+
+    async def _send_loop(self):
+        try:
+            while True:
+                message = await self.queue.get()
+                if message is RESYNC_MESSAGE:
+                    self.resync_pending = False
+                await asyncio.wait_for(
+                    self.websocket.send_json(message), WS_SEND_TIMEOUT
+                )
+                metrics.incr("ws.messages_sent")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Broken or too slow: evict it
+            metrics.incr("ws.send_failures")
+            await self.close()
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        unregister(self)
+        if self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+
+
+def register(user_id: str, websocket: WebSocket) -> ClientConnection:
+    global _heartbeat_task
+    if _heartbeat_task is None or _heartbeat_task.done():
+        _heartbeat_task = asyncio.create_task(_heartbeat())
+
+    connection = ClientConnection(user_id, websocket)
+    active_connections.setdefault(user_id, set()).add(connection)
+    return connection
+
+
+def unregister(connection: ClientConnection):
+    connections = active_connections.get(connection.user_id)
+    if connections is None:
+        return
+    connections.discard(connection)
+    if not connections:
+        del active_connections[connection.user_id]
+
+
+def send_to_user(user_id: str, message: dict):
+    # Non-blocking: every socket's own sender task does the actual send
+    for connection in list(active_connections.get(user_id, ())):
+        connection.enqueue(message)
+
+
+async def _heartbeat():
+    while True:
+        await asyncio.sleep(WS_HEARTBEAT_INTERVAL)
+        now = time.monotonic()
+        for connections in list(active_connections.values()):
+            for connection in list(connections):
+                # Clients answer pings, so a live one is never idle this long
+                if now - connection.last_seen > WS_IDLE_TIMEOUT:
+                    metrics.incr("ws.idle_evictions")
+                    await connection.close()
+                elif connection.queue.empty():
+                    connection.enqueue(PING_MESSAGE)
+
+
+metrics.register_gauge(
+    "ws",
+    lambda: {
+        "users": len(active_connections),
+        "connections": sum(len(c) for c in active_connections.values()),
+        "queued": sum(
+            conn.queue.qsize() for c in active_connections.values() for conn in c
+        ),
+    },
+)
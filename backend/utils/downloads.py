@@ -0,0 +1,81 @@
+import mimetypes
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response, status
+
+# Blob content never changes under its hash, so clients may keep it forever.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def content_type_for(file_name: str) -> str:
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+
+def http_date(value: datetime) -> str:
+    return formatdate(value.replace(tzinfo=timezone.utc).timestamp(), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(request: Request, etag: str, last_modified: datetime | None, headers: dict):
+    """A 304 response when the client's copy is current, otherwise None.
+
+    If-None-Match wins over If-Modified-Since when both are sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return None
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        # HTTP dates have whole-second resolution
+        fresh = last_modified.replace(microsecond=0) <= since
+
+    if not fresh:
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def single_range(header: str | None, size: int):
+    """(start, end) inclusive for a single satisfiable `bytes=` range.
+
+    Returns None to serve the whole body (no, multiple or malformed ranges,
+    which HTTP lets a server ignore) and raises ValueError if unsatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, sep, end = header[len("bytes="):].strip().partition("-")
+    if not sep:
+        return None
+    try:
+        first = int(start) if start else None
+        last = int(end) if end else None
+    except ValueError:
+        return None
+
+    if first is None and last is None:
+        return None
+    if first is None:
+        # Suffix range: the last N bytes
+        if not last:
+            raise ValueError("Range not satisfiable")
+        return max(size - last, 0), size - 1
+    if last is None:
+        last = size - 1
+    if first >= size or first > last:
+        raise ValueError("Range not satisfiable")
+    return first, min(last, size - 1)
@@ -0,0 +1,177 @@
+import hashlib
+from datetime import datetime
+from fastapi import Request, Response
+from sqlalchemy import select, func, exists
+from models import User, Task, Project, Workspace, WorkspaceMember
+from models.projects import ProjectMember
+from models.tasks import task_assignees, task_watchers
+from models.task_counters import ProjectTaskCounter
+from utils import metrics
+from utils.downloads import not_modified, REVALIDATE_CACHE_CONTROL
+
+# Weak ETags for polled JSON endpoints. The tag is a hash of version stamps
+# (updated_at maxima and row counts) read by one small query, so a poll for
+# unchanged data is answered with 304 before anything is loaded or
+# serialized. Writes that change child rows without updating their parent
+# call touch() on the parent so its stamp moves.
+
+
+def touch(row):
+    """Bump row.updated_at; flushed with the caller's commit."""
+    row.updated_at = datetime.utcnow()
+
+
+def weak_etag(*stamps) -> str:
+    digest = hashlib.blake2b(repr(stamps).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+_routes_with_gauge = set()
+
+
+def _register_ratio_gauge(route: str):
+    if route in _routes_with_gauge:
+        return
+
+    def ratio():
+        not_modified_count = metrics.counter(f"etag.{route}.not_modified")
+        total = not_modified_count + metrics.counter(f"etag.{route}.modified")
+        return round(not_modified_count / total, 4) if total else 0.0
+
+    metrics.register_gauge(f"etag.{route}.not_modified_ratio", ratio)
+    _routes_with_gauge.add(route)
+
+
+def conditional_get(request: Request, response: Response, route: str, *stamps):
+    """A 304 response if the client's copy is current. Otherwise None, and
+    the ETag is set on `response` for the 200 the endpoint goes on to build.
+
+    Counts etag.<route>.not_modified / .modified; the 304 ratio per route is
+    the etag.<route>.not_modified_ratio gauge.
+    """
+    _register_ratio_gauge(route)
+    # The route is part of the tag so two endpoints never share one
+    etag = weak_etag(route, *stamps)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    cached = not_modified(request, etag, None, headers)
+    if cached is not None:
+        metrics.incr(f"etag.{route}.not_modified")
+        return cached
+    metrics.incr(f"etag.{route}.modified")
+    response.headers.update(headers)
+    return None
+
+
+def _count_and_latest(name: str, count_of, latest_of, from_, *criteria):
+    """Row count and max timestamp of a child collection, as two scalar
+    subqueries (each is an index lookup)."""
+    query = select().select_from(from_).where(*criteria)
+    return (
+        query.add_columns(func.count(count_of)).scalar_subquery().label(f"{name}_count"),
+        query.add_columns(func.max(latest_of)).scalar_subquery().label(f"{name}_updated_at"),
+    )
+
+
+def _project_members(project_id):
+    return _count_and_latest(
+        "member",
+        ProjectMember.id,
+        User.updated_at,
+        ProjectMember.__table__.join(User, User.id == ProjectMember.user_id),
+        ProjectMember.project_id == project_id,
+    )
+
+
+def _task_users(name: str, association, *criteria):
+    """Assignees or watchers: whether they are in the set is covered by the
+    task's updated_at (touch), their names and pictures by this stamp."""
+    return _count_and_latest(
+        name,
+        association.c.user_id,
+        User.updated_at,
+        association.join(User, User.id == association.c.user_id),
+        *criteria,
+    )
+
+
+def task_version(task_id):
+    """The task row, its assignees and watchers, its project and the
+    project's members."""
+    return (
+        select(
+            Task.updated_at,
+            Task.comment_count,
+            *_task_users("assignee", task_assignees, task_assignees.c.task_id == Task.id),
+            *_task_users("watcher", task_watchers, task_watchers.c.task_id == Task.id),
+            Project.updated_at.label("project_updated_at"),
+            *_project_members(Task.project_id),
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(Task.id == task_id)
+    )
+
+
+def project_version(project_id, user_id):
+    """Project, member and task stamps, and whether user_id is a member.
+    No row if the project does not exist."""
+    return select(
+        Project.updated_at,
+        exists()
+        .where(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+        .label("is_member"),
+        *_project_members(project_id),
+        *_count_and_latest(
+            "task", Task.id, Task.updated_at, Task, Task.project_id == project_id
+        ),
+        # Users shown on the project's tasks
+        *_task_users(
+            "assignee",
+            task_assignees,
+            task_assignees.c.task_id.in_(
+                select(Task.id).where(Task.project_id == project_id)
+            ),
+        ),
+        *_task_users(
+            "watcher",
+            task_watchers,
+            task_watchers.c.task_id.in_(
+                select(Task.id).where(Task.project_id == project_id)
+            ),
+        ),
+    ).where(Project.id == project_id)
+
+
+def workspace_version(workspace_id, user_id):
+    """Workspace, member, project and task counter stamps, and whether
+    user_id is a member. No row if the workspace does not exist."""
+    return select(
+        Workspace.updated_at,
+        exists()
+        .where(
+            WorkspaceMember.workspace_id == workspace_id,
+            WorkspaceMember.user_id == user_id,
+        )
+        .label("is_member"),
+        *_count_and_latest(
+            "member",
+            WorkspaceMember.id,
+            User.updated_at,
+            WorkspaceMember.__table__.join(User, User.id == WorkspaceMember.user_id),
+            WorkspaceMember.workspace_id == workspace_id,
+        ),
+        *_count_and_latest(
+            "project",
+            Project.id,
+            Project.updated_at,
+            Project,
+            Project.workspace_id == workspace_id,
+        ),
+        # Task totals shown per project come from the counters
+        *_count_and_latest(
+            "counter",
+            ProjectTaskCounter.project_id,
+            ProjectTaskCounter.updated_at,
+            ProjectTaskCounter,
+            ProjectTaskCounter.workspace_id == workspace_id,
+        ),
+    ).where(Workspace.id == workspace_id)
@@ -0,0 +1,48 @@
+import threading
+from sqlalchemy import text
+from database import engine
+
+# Every uvicorn worker starts the scheduler. Jobs that must run in one place
+# only check is_leader() first: the leader holds a session-level advisory
+# lock on a connection of its own for as long as the process lives. When it
+# exits the connection closes, the lock is released and the next worker to
+# run the job takes over.
+_lock = threading.Lock()
+_connections = {}
+
+
+def _still_held(connection) -> bool:
+    try:
+        connection.execute(text("SELECT 1"))
+        connection.commit()
+        return True
+    except Exception:
+        connection.close()
+        return False
+
+
+def is_leader(key: int) -> bool:
+    with _lock:
+        connection = _connections.get(key)
+        if connection is not None:
+            if _still_held(connection):
+                return True
+            del _connections[key]
+
+        # Detached: kept out of the pool for the life of the process
+        connection = engine.connect()
+        connection.detach()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+            ).scalar()
+            # The lock outlives the transaction; don't sit idle inside one
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        _connections[key] = connection
+        return True
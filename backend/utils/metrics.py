@@ -0,0 +1,57 @@
+import threading
+
+# Minimal in-process metrics registry. Values are per worker process;
+# GET /api-v1/metrics returns a snapshot for the worker that served it.
+_lock = threading.Lock()
+_counters = {}
+_timings = {}
+_gauges = {}
+
+
+def incr(name: str, value: int = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def counter(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def observe(name: str, seconds: float):
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = {"count": 0, "total": 0.0, "max": 0.0}
+        timing["count"] += 1
+        timing["total"] += seconds
+        if seconds > timing["max"]:
+            timing["max"] = seconds
+
+
+def register_gauge(name: str, fn):
+    """Register a callable evaluated lazily on every snapshot."""
+    _gauges[name] = fn
+
+
+def snapshot() -> dict:
+    with _lock:
+        counters = dict(_counters)
+        timings = {
+            name: {
+                "count": t["count"],
+                "total_ms": round(t["total"] * 1000, 3),
+                "avg_ms": round(t["total"] * 1000 / t["count"], 3)
+                if t["count"]
+                else 0.0,
+                "max_ms": round(t["max"] * 1000, 3),
+            }
+            for name, t in _timings.items()
+        }
+    gauges = {}
+    for name, fn in _gauges.items():
+        try:
+            gauges[name] = fn()
+        except Exception as e:
+            gauges[name] = str(e)
+    return {"counters": counters, "timings": timings, "gauges": gauges}
@@ -0,0 +1,201 @@
+import asyncio
+import asyncpg
+import json
+import os
+import redis.asyncio as aioredis
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from database import DATABASE_URL
+from models.notifications import Notification
+
+# Every worker subscribes to one channel and delivers to the sockets it holds
+# itself, so realtime notifications work across processes and nodes.
+#   NOTIFICATION_BROKER=postgres (default) | redis | local
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "postgres").lower()
+NOTIFICATION_CHANNEL = os.getenv("NOTIFICATION_CHANNEL", "notifications")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+RECONNECT_DELAY = 5
+
+
+def _serialize(notif: Notification) -> dict:
+    return {
+        "id": str(notif.id),
+        "user_id": str(notif.user_id),
+        "type": notif.type,
+        "message": notif.message,
+        "link": notif.link,
+        "is_read": bool(notif.is_read),
+        "created_at": notif.created_at.isoformat() if notif.created_at else None,
+    }
+
+
+class NotificationBroker:
+    """Base broker: in-process only, suitable for a single worker."""
+
+    # True when publish_in_transaction sends messages itself on commit
+    transactional = False
+
+    def __init__(self):
+        self.loop = None
+        self.deliver = None
+
+    async def start(self, deliver):
+        self.loop = asyncio.get_running_loop()
+        self.deliver = deliver
+
+    async def stop(self):
+        pass
+
+    def publish_in_transaction(self, connection, messages):
+        pass
+
+    async def publish(self, messages):
+        for message in messages:
+            await self._dispatch(message)
+
+    def publish_threadsafe(self, messages):
+        # Called from sync routes (threadpool) after commit.
+        if self.loop is None or self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.publish(messages), self.loop)
+
+    async def _dispatch(self, message: dict):
+        if self.deliver is None:
+            return
+        try:
+            await self.deliver(message["user_id"], message)
+        except Exception as e:
+            print(f"Notification delivery failed: {e}")
+
+
+class PostgresBroker(NotificationBroker):
+    """LISTEN/NOTIFY: messages are sent with pg_notify inside the writing
+    transaction, so Postgres only delivers them if it commits."""
+
+    transactional = True
+
+    def __init__(self):
+        super().__init__()
+        self._task = None
+        self._conn = None
+
+    async def start(self, deliver):
+        await super().start(deliver)
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        if self._conn and not self._conn.is_closed():
+            await self._conn.close()
+
+    def publish_in_transaction(self, connection, messages):
+        for message in messages:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFICATION_CHANNEL, "payload": json.dumps(message)},
+            )
+
+    async def publish(self, messages):
+        # Messages are already on their way through pg_notify.
+        pass
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        asyncio.ensure_future(self._dispatch(message))
+
+    async def _listen_forever(self):
+        dsn = make_url(DATABASE_URL).set(drivername="postgresql")
+        dsn = dsn.render_as_string(hide_password=False)
+        while True:
+            try:
+                self._conn = await asyncpg.connect(dsn)
+                await self._conn.add_listener(NOTIFICATION_CHANNEL, self._on_notify)
+                while not self._conn.is_closed():
+                    await asyncio.sleep(RECONNECT_DELAY)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Notification listener error, reconnecting: {e}")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+class RedisBroker(NotificationBroker):
+    """Redis PUBLISH/SUBSCRIBE; any Redis-protocol stand-in works via REDIS_URL."""
+
+    def __init__(self):
+        super().__init__()
+        self._task = None
+        self._redis = None
+
+    async def start(self, deliver):
+        await super().start(deliver)
+        self._redis = aioredis.from_url(REDIS_URL)
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def publish(self, messages):
+        for message in messages:
+            await self._redis.publish(NOTIFICATION_CHANNEL, json.dumps(message))
+
+    async def _listen_forever(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(NOTIFICATION_CHANNEL)
+                async for item in pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    try:
+                        message = json.loads(item["data"])
+                    except ValueError:
+                        continue
+                    await self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Notification subscriber error, reconnecting: {e}")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+BROKERS = {
+    "postgres": PostgresBroker,
+    "redis": RedisBroker,
+    "local": NotificationBroker,
+}
+
+broker = BROKERS.get(NOTIFICATION_BROKER, PostgresBroker)()
+
+
+# Publish every Notification row written through any session, whichever route
+# created it, and only once its transaction commits.
+@event.listens_for(Session, "after_flush")
+def _collect_notifications(session, flush_context):
+    messages = [_serialize(obj) for obj in session.new if isinstance(obj, Notification)]
+    if not messages:
+        return
+    if broker.transactional:
+        broker.publish_in_transaction(session.connection(), messages)
+    else:
+        session.info.setdefault("pending_notifications", []).extend(messages)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_notifications(session):
+    messages = session.info.pop("pending_notifications", None)
+    if messages:
+        broker.publish_threadsafe(messages)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_notifications(session, previous_transaction):
+    session.info.pop("pending_notifications", None)
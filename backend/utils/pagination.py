@@ -0,0 +1,24 @@
+from datetime import datetime
+import uuid
+
+# Keyset cursors for feeds ordered by (created_at DESC, id DESC). The cursor is
+# the sort key of the last row on the page; the next page starts after it.
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    return f"{created_at.isoformat()}|{row_id}"
+
+
+def decode_cursor(cursor: str):
+    """Raises ValueError for anything that is not a cursor we issued."""
+    created_at, row_id = cursor.split("|", 1)
+    return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+
+
+def split_page(rows, limit: int, cursor_of):
+    """Queries fetch limit + 1 rows; the extra one only tells us whether
+    there is another page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, cursor_of(rows[-1])
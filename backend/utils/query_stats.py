@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+# Counts the SQL a block of code issues: statements, rows and time spent in
+# the database. Listeners are installed on both engines by database.py and
+# only record while a track_queries() block is active in the current context
+# (async sessions run their queries in a greenlet that shares the context).
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryStats:
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.duration = 0.0
+        self.statements = []  # (sql, seconds, rows)
+
+    def record(self, statement: str, seconds: float, rows: int):
+        self.queries += 1
+        self.rows += rows
+        self.duration += seconds
+        self.statements.append((statement, seconds, rows))
+
+    def check(self, max_queries: int | None = None, max_rows: int | None = None,
+              label: str = ""):
+        """Raise QueryBudgetExceeded if either limit was crossed."""
+        problems = []
+        if max_queries is not None and self.queries > max_queries:
+            problems.append(f"{self.queries} queries (budget {max_queries})")
+        if max_rows is not None and self.rows > max_rows:
+            problems.append(f"{self.rows} rows (budget {max_rows})")
+        if problems:
+            statements = "\n".join(
+                f"  [{rows} rows, {seconds * 1000:.1f}ms] {sql}"
+                for sql, seconds, rows in self.statements
+            )
+            raise QueryBudgetExceeded(
+                f"{label or 'block'} issued {', '.join(problems)}:\n{statements}"
+            )
+
+
+def instrument_queries(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is None or not conn.info.get("query_started_at"):
+            return
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        stats.record(statement, elapsed, max(cursor.rowcount, 0))
+
+
+def query_budget(max_queries: int):
+    """Per-endpoint budget for QueryInstrumentationMiddleware. Goes below
+    the route decorator:
+
+        @router.get("/")
+        @query_budget(4)
+        async def getWorkspaces(...):
+    """
+
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+
+    return decorator
+
+
+@contextmanager
+def track_queries():
+    """Collect QueryStats for everything executed inside the block.
+
+        with track_queries() as stats:
+            client.get("/api-v1/workspaces/")
+        stats.check(max_queries=3, label="GET /workspaces")
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
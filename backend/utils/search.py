@@ -0,0 +1,52 @@
+import html
+import re
+from sqlalchemy import func
+
+# Text search configuration; must match the one in the generated
+# search_vector columns or the indexes are not used.
+SEARCH_CONFIG = "english"
+# ts_headline returns stored user text unescaped. Matches are wrapped in
+# control-character sentinels instead of tags (and stripped from the input
+# first), so render_highlight can escape everything and then turn only our
+# sentinels into <mark>.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
+MAX_SEARCH_TERMS = 8
+
+_WORD = re.compile(r"\w+")
+
+
+def prefix_tsquery(text: str) -> str | None:
+    """Turn free text into a to_tsquery() string matching every word as a
+    prefix: 'deploy stag' -> 'deploy:* & stag:*'.
+
+    Only word characters are kept, so input cannot smuggle tsquery
+    operators in. Returns None when nothing searchable is left.
+    """
+    terms = _WORD.findall(text.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def headline(text, tsquery):
+    """ts_headline over text with any sentinel characters removed."""
+    source = func.translate(
+        func.coalesce(text, ""), HIGHLIGHT_START + HIGHLIGHT_STOP, ""
+    )
+    return func.ts_headline(SEARCH_CONFIG, source, tsquery, HEADLINE_OPTIONS)
+
+
+def render_highlight(value: str | None) -> str | None:
+    """HTML-escaped headline with matches in <mark>; safe to render as HTML."""
+    if value is None:
+        return None
+    return (
+        html.escape(value)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
@@ -0,0 +1,71 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, TaskSubtask, TaskAttachment
+from models.tasks import task_assignees, task_watchers
+from schema.task import SubtaskResponse, AttachmentResponse
+
+# Heavy per-task collections list endpoints return only when asked for
+MY_TASKS_INCLUDES = ("assignees", "watchers", "subtasks", "attachments")
+
+
+async def load_task_children(db: AsyncSession, task_ids: list, include) -> dict:
+    """{field: {task_id: [...]}} with one query per requested field."""
+    children = {field: {task_id: [] for task_id in task_ids} for field in include}
+    if not task_ids:
+        return children
+
+    if "assignees" in children:
+        result = await db.execute(
+            select(
+                task_assignees.c.task_id, User.id, User.name, User.profilePicture
+            )
+            .join(User, User.id == task_assignees.c.user_id)
+            .where(task_assignees.c.task_id.in_(task_ids))
+        )
+        for row in result:
+            children["assignees"][row.task_id].append(
+                {"id": row.id, "name": row.name, "profile_picture": row.profilePicture}
+            )
+    if "watchers" in children:
+        result = await db.execute(
+            select(task_watchers.c.task_id, task_watchers.c.user_id).where(
+                task_watchers.c.task_id.in_(task_ids)
+            )
+        )
+        for row in result:
+            children["watchers"][row.task_id].append(row.user_id)
+    if "subtasks" in children:
+        result = await db.execute(
+            select(
+                TaskSubtask.task_id,
+                TaskSubtask.id,
+                TaskSubtask.title,
+                TaskSubtask.completed,
+                TaskSubtask.created_at,
+            )
+            .where(TaskSubtask.task_id.in_(task_ids))
+            .order_by(TaskSubtask.created_at)
+        )
+        for row in result:
+            children["subtasks"][row.task_id].append(SubtaskResponse.model_validate(row))
+    if "attachments" in children:
+        result = await db.execute(
+            select(
+                TaskAttachment.task_id,
+                TaskAttachment.id,
+                TaskAttachment.file_name,
+                TaskAttachment.file_url,
+                TaskAttachment.file_type,
+                TaskAttachment.file_size,
+                TaskAttachment.sha256,
+                TaskAttachment.uploaded_by,
+                TaskAttachment.uploaded_at,
+            )
+            .where(TaskAttachment.task_id.in_(task_ids))
+            .order_by(TaskAttachment.uploaded_at)
+        )
+        for row in result:
+            children["attachments"][row.task_id].append(
+                AttachmentResponse.model_validate(row)
+            )
+    return children
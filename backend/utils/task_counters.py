@@ -0,0 +1,273 @@
+from datetime import datetime
+from sqlalchemy import func, update, select, literal
+from sqlalchemy.dialects.postgresql import insert
+from database import SessionLocal
+from utils.job_leader import is_leader
+from models import Project, Task, Workspace
+from models.tasks import TaskStatus, TaskPriority
+from models.task_counters import (
+    WorkspaceTaskCounter,
+    ProjectTaskCounter,
+    COUNTER_FIELDS,
+)
+
+
+def _to_enum(enum_cls, value):
+    if value is None or isinstance(value, enum_cls):
+        return value
+    return enum_cls(value)
+
+
+def task_counter_snapshot(task):
+    """Counter contribution of a single task in its current state."""
+    contribution = dict.fromkeys(COUNTER_FIELDS, 0)
+    contribution["total"] = 1
+    if task.is_archived:
+        contribution["archived"] = 1
+        return contribution
+
+    task_status = _to_enum(TaskStatus, task.status)
+    priority = _to_enum(TaskPriority, task.priority)
+    if task_status is not None:
+        contribution[task_status.value] = 1
+    if priority is not None:
+        contribution[priority.value] = 1
+    return contribution
+
+
+def count_overdue(db, workspace_id) -> int:
+    """Open tasks past their due date, via ix_tasks_project_due_open."""
+    return (
+        db.query(func.count(Task.id))
+        .join(Project, Project.id == Task.project_id)
+        .filter(
+            Project.workspace_id == workspace_id,
+            Task.is_archived.is_not(True),
+            Task.status.is_distinct_from(TaskStatus.done),
+            Task.due_date < datetime.utcnow(),
+        )
+        .scalar()
+    )
+
+
+def _progress(done, total, archived):
+    active = total - archived
+    return round(done * 100 / active) if active > 0 else 0
+
+
+def apply_task_counter_delta(db, workspace_id, project_id, before=None, after=None):
+    """
+    Add the difference between two task snapshots to the workspace and
+    project counter rows. Runs on the caller's session so it commits (or
+    rolls back) together with the task change itself.
+    """
+    before = before or {}
+    after = after or {}
+    delta = {f: after.get(f, 0) - before.get(f, 0) for f in COUNTER_FIELDS}
+    if not any(delta.values()):
+        return
+
+    now = datetime.utcnow()
+    for model, keys, conflict_key in (
+        (WorkspaceTaskCounter, {"workspace_id": workspace_id}, "workspace_id"),
+        (
+            ProjectTaskCounter,
+            {"project_id": project_id, "workspace_id": workspace_id},
+            "project_id",
+        ),
+    ):
+        table = model.__table__
+        stmt = insert(table).values(**keys, **delta, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[conflict_key],
+            set_={
+                **{f: table.c[f] + stmt.excluded[f] for f in COUNTER_FIELDS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(table.c.done, table.c.total, table.c.archived)
+        row = db.execute(stmt).first()
+
+    # "row" is the project counter, which drives Project.progress
+    db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(progress=_progress(row.done, row.total, row.archived))
+    )
+
+
+def expected_counters(db, workspace_id=None):
+    active = Task.is_archived.is_not(True)
+    query = (
+        db.query(
+            Project.id,
+            Project.workspace_id,
+            func.count(Task.id).label("total"),
+            func.count(Task.id).filter(Task.is_archived.is_(True)).label("archived"),
+            *[
+                func.count(Task.id).filter(active, Task.status == s).label(s.value)
+                for s in TaskStatus
+            ],
+            *[
+                func.count(Task.id).filter(active, Task.priority == p).label(p.value)
+                for p in TaskPriority
+            ],
+        )
+        .outerjoin(Task, Task.project_id == Project.id)
+        .group_by(Project.id, Project.workspace_id)
+    )
+    workspaces = db.query(Workspace.id)
+    if workspace_id is not None:
+        query = query.filter(Project.workspace_id == workspace_id)
+        workspaces = workspaces.filter(Workspace.id == workspace_id)
+
+    by_workspace = {
+        ws_id: dict.fromkeys(COUNTER_FIELDS, 0) for (ws_id,) in workspaces.all()
+    }
+    by_project = {}
+    for row in query.all():
+        counts = {f: getattr(row, f) for f in COUNTER_FIELDS}
+        by_project[row.id] = (row.workspace_id, counts)
+        totals = by_workspace.setdefault(
+            row.workspace_id, dict.fromkeys(COUNTER_FIELDS, 0)
+        )
+        for f in COUNTER_FIELDS:
+            totals[f] += counts[f]
+    return by_workspace, by_project
+
+
+def create_task_counters(db, workspace_id=None):
+    """Zero counter rows for workspaces and projects that have none.
+    Called when a workspace or project is created, in the same transaction;
+    ON CONFLICT DO NOTHING, so racing with another creator is harmless."""
+    now = datetime.utcnow()
+    zeros = [literal(0).label(f) for f in COUNTER_FIELDS]
+    workspaces = select(Workspace.id, *zeros, literal(now))
+    projects = select(Project.id, Project.workspace_id, *zeros, literal(now))
+    if workspace_id is not None:
+        workspaces = workspaces.where(Workspace.id == workspace_id)
+        projects = projects.where(Project.workspace_id == workspace_id)
+
+    for model, columns, conflict_key, rows in (
+        (WorkspaceTaskCounter, ["workspace_id"], "workspace_id", workspaces),
+        (ProjectTaskCounter, ["project_id", "workspace_id"], "project_id", projects),
+    ):
+        db.execute(
+            insert(model.__table__)
+            .from_select([*columns, *COUNTER_FIELDS, "updated_at"], rows)
+            .on_conflict_do_nothing(index_elements=[conflict_key])
+        )
+
+
+def rebuild_task_counters(db, workspace_id=None):
+    """
+    Recompute counter rows from the tasks table and overwrite the stored
+    values. Returns a list describing the rows that had drifted.
+
+    The counter rows are locked (FOR UPDATE) before the tasks are counted.
+    A task write holds its counter rows from apply_task_counter_delta until
+    it commits, so every write is either committed before the count (and
+    included in it) or blocked until this transaction commits (and adds its
+    delta on top). Relies on READ COMMITTED, where the count statement sees
+    everything committed before it started.
+    """
+    create_task_counters(db, workspace_id)
+
+    # Workspace rows before project rows, the order apply_task_counter_delta
+    # takes them in
+    stored_ws = db.query(WorkspaceTaskCounter)
+    stored_projects = db.query(ProjectTaskCounter)
+    if workspace_id is not None:
+        stored_ws = stored_ws.filter(WorkspaceTaskCounter.workspace_id == workspace_id)
+        stored_projects = stored_projects.filter(
+            ProjectTaskCounter.workspace_id == workspace_id
+        )
+    stored_ws = {
+        c.workspace_id: c
+        for c in stored_ws.order_by(WorkspaceTaskCounter.workspace_id)
+        .with_for_update()
+        .all()
+    }
+    stored_projects = {
+        c.project_id: c
+        for c in stored_projects.order_by(ProjectTaskCounter.project_id)
+        .with_for_update()
+        .all()
+    }
+
+    by_workspace, by_project = expected_counters(db, workspace_id)
+
+    drift = []
+    now = datetime.utcnow()
+
+    # Rows created after the lock belong to workspaces / projects created
+    # since; their creators wrote correct rows of their own
+    for ws_id, counts in by_workspace.items():
+        current = stored_ws.get(ws_id)
+        if current is None:
+            continue
+        diff = {
+            f: (getattr(current, f) or 0, counts[f])
+            for f in COUNTER_FIELDS
+            if (getattr(current, f) or 0) != counts[f]
+        }
+        if diff:
+            drift.append({"workspace_id": str(ws_id), "diff": diff})
+            for f in COUNTER_FIELDS:
+                setattr(current, f, counts[f])
+            current.updated_at = now
+
+    for project_id, (ws_id, counts) in by_project.items():
+        current = stored_projects.get(project_id)
+        if current is None:
+            continue
+        diff = {
+            f: (getattr(current, f) or 0, counts[f])
+            for f in COUNTER_FIELDS
+            if (getattr(current, f) or 0) != counts[f]
+        }
+        if diff:
+            drift.append({"project_id": str(project_id), "diff": diff})
+            for f in COUNTER_FIELDS:
+                setattr(current, f, counts[f])
+            current.updated_at = now
+
+        progress = _progress(counts["done"], counts["total"], counts["archived"])
+        db.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.progress.is_distinct_from(progress))
+            .values(progress=progress)
+        )
+
+    db.flush()
+    return drift
+
+
+# Advisory lock key: one worker process runs the reconcile job
+RECONCILE_LOCK_KEY = 720_001
+
+
+def reconcile_task_counters():
+    # Scheduled job: runs outside of a request, so it owns its session.
+    # Every worker schedules it; only the leader runs it.
+    if not is_leader(RECONCILE_LOCK_KEY):
+        return
+    db = SessionLocal()
+    try:
+        workspace_ids = [ws_id for (ws_id,) in db.query(Workspace.id).all()]
+        db.rollback()
+        drift = []
+        # One transaction per workspace keeps the counter locks short
+        for workspace_id in workspace_ids:
+            try:
+                drift += rebuild_task_counters(db, workspace_id)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Task counter reconciliation failed for {workspace_id}: {e}")
+        if drift:
+            print(f"Task counters drift corrected for {len(drift)} rows: {drift}")
+    except Exception as e:
+        db.rollback()
+        print(f"Task counter reconciliation failed: {e}")
+    finally:
+        db.close()
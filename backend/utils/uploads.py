@@ -0,0 +1,90 @@
+import hashlib
+import os
+import uuid
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_DIR = "uploads"
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_FILE_SIZE = int(os.getenv("MAX_UPLOAD_FILE_SIZE", str(25 * 1024 * 1024)))
+MAX_UPLOAD_REQUEST_SIZE = int(
+    os.getenv("MAX_UPLOAD_REQUEST_SIZE", str(100 * 1024 * 1024))
+)
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def safe_filename(filename: str | None) -> str:
+    # Client-supplied; never let it pick the directory
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    return name or "file"
+
+
+def upload_path(saved_file_name: str) -> str:
+    """Files are sharded by the first two characters of their id so no
+    single directory grows without bound."""
+    return os.path.join(UPLOAD_DIR, saved_file_name[:2], saved_file_name)
+
+
+def resolve_upload(saved_file_name: str) -> str | None:
+    saved_file_name = os.path.basename(saved_file_name)
+    for path in (
+        upload_path(saved_file_name),
+        # Uploads from before sharding
+        os.path.join(UPLOAD_DIR, saved_file_name),
+    ):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _write_chunk(buffer, hasher, chunk: bytes):
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+def _finish(buffer, tmp_path: str, path: str):
+    buffer.flush()
+    os.fsync(buffer.fileno())
+    buffer.close()
+    os.replace(tmp_path, path)
+
+
+def _discard(buffer, tmp_path: str):
+    buffer.close()
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(file: UploadFile, path: str, max_bytes: int = MAX_UPLOAD_FILE_SIZE):
+    """Stream an upload to `path` in fixed-size chunks, hashing as it goes.
+
+    Disk I/O runs in the threadpool one chunk at a time, so no thread is held
+    for the whole upload. The file only appears at `path` once it is
+    complete. Returns (size, sha256 hex digest).
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(f"{file.filename} exceeds {max_bytes} bytes")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+    buffer = await run_in_threadpool(open, tmp_path, "wb")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"{file.filename} exceeds {max_bytes} bytes")
+            await run_in_threadpool(_write_chunk, buffer, hasher, chunk)
+        await run_in_threadpool(_finish, buffer, tmp_path, path)
+    except BaseException:
+        await run_in_threadpool(_discard, buffer, tmp_path)
+        raise
+    return size, hasher.hexdigest()
@@ -2,31 +2,91 @@ from validate_email import validate_email
 import dns.resolver
 from disposable_email_domains import blocklist
 from email_validator import validate_email as syntax_validate, EmailNotValidError
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import threading
+import time
+
+# Domain-level results (disposable + MX) are shared by every address on the
+# domain, so repeated sign-ups from gmail.com etc. skip the DNS round trip.
+DOMAIN_CACHE_TTL = float(os.getenv("EMAIL_DOMAIN_CACHE_TTL", "3600"))
+# Domains that authoritatively have no MX (NXDOMAIN / no answer) are
+# remembered for less time, so a fixed DNS setup is picked up quickly
+DOMAIN_NEGATIVE_CACHE_TTL = float(os.getenv("EMAIL_DOMAIN_NEGATIVE_CACHE_TTL", "300"))
+DOMAIN_CACHE_SIZE = int(os.getenv("EMAIL_DOMAIN_CACHE_SIZE", "5000"))
+DNS_TIMEOUT = float(os.getenv("EMAIL_DNS_TIMEOUT", "5"))
+DNS_ATTEMPTS = int(os.getenv("EMAIL_DNS_ATTEMPTS", "2"))
+
+_domain_cache = {}  # domain -> (expires_at, flags, has_mx)
+_domain_lock = threading.Lock()
+
+# Checks are blocking (DNS + live SMTP probe); they run on this dedicated
+# pool so they neither block the event loop nor starve Starlette's threadpool.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("EMAIL_CHECK_WORKERS", "4")),
+    thread_name_prefix="email-check",
+)
+
+
+def _check_domain(domain: str):
+    now = time.time()
+    with _domain_lock:
+        cached = _domain_cache.get(domain)
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+
+    flags = []
+    # 2. Disposable domain check
+    if domain in blocklist:
+        flags.append("Disposable")
+
+    # 3. MX record check
+    has_mx = _lookup_mx(domain)
+    if has_mx is None:
+        # Resolver trouble says nothing about the domain: fail open and
+        # don't cache, so the next sign-up asks again
+        return flags, None
+    if not has_mx:
+        flags.append("No_mx_record")
+
+    ttl = DOMAIN_CACHE_TTL if has_mx else DOMAIN_NEGATIVE_CACHE_TTL
+    with _domain_lock:
+        if len(_domain_cache) >= DOMAIN_CACHE_SIZE:
+            _domain_cache.clear()
+        _domain_cache[domain] = (now + ttl, flags, has_mx)
+    return flags, has_mx
+
+
+def _lookup_mx(domain: str):
+    """True / False for a definite answer, None if DNS could not tell us
+    (timeouts, SERVFAIL, no reachable nameserver)."""
+    for attempt in range(max(DNS_ATTEMPTS, 1)):
+        try:
+            return bool(dns.resolver.resolve(domain, "MX", lifetime=DNS_TIMEOUT))
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return False
+        except Exception as e:
+            last_error = e
+    print(f"MX lookup for {domain} failed, not flagging it: {last_error}")
+    return None
 
 
 def full_email_check(email: str):
     flags = []
 
-    # 1. Syntax + Domain check
+    # 1. Syntax check (deliverability is covered by the cached MX lookup)
     try:
-        valid = syntax_validate(email, check_deliverability=True)
+        valid = syntax_validate(email, check_deliverability=False)
         domain = valid.domain.lower()
     except EmailNotValidError:
         flags.append("Invalid")
         return flags
 
-    # 2. Disposable domain check
-    if domain in blocklist:
-        flags.append("Disposable")
-
-    # 3. MX record check
-    try:
-        mx_records = dns.resolver.resolve(domain, "MX")
-        if not mx_records:
-            flags.append("No_mx_record")
-            return flags
-    except Exception:
-        flags.append("No_mx_record")
+    domain_flags, has_mx = _check_domain(domain)
+    flags.extend(domain_flags)
+    # No MX, or DNS unavailable (then the SMTP probe would fail as well)
+    if not has_mx:
         return flags
 
     # 4. SMTP check (py3-validate-email style)
@@ -54,3 +114,8 @@ def full_email_check(email: str):
         flags.append("SMTP_check_failed")
 
     return flags
+
+
+async def full_email_check_async(email: str):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, full_email_check, email)
@@ -28,6 +28,14 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { useGetMyTasksQuery } from "@/app/hooks/use-Tasks";
 
 
+const SERVER_FILTERS = {
+    todo: { status: "todo" },
+    inprogress: { status: "in_progress" },
+    done: { status: "done" },
+    achieved: { archived: "true" },
+    high: { priority: "high" },
+};
+
 const MyTasks = () => {
     const searchParams = useSearchParams();
     const router = useRouter();
@@ -52,20 +60,14 @@ const MyTasks = () => {
         router.replace(`?${params.toString()}`);
     }, [filter, sortDirection, search, router]);
 
-    const { data: myTasks, isLoading } = useGetMyTasksQuery();
+    // Status, archive and priority filters run on the server
+    const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } =
+        useGetMyTasksQuery(SERVER_FILTERS[filter] || {});
+    const myTasks = data?.pages.flatMap((page) => page.items) ?? [];
 
     const filteredTasks =
-        myTasks?.length > 0
+        myTasks.length > 0
             ? myTasks
-                .filter((task) => {
-                    if (filter === "all") return true;
-                    if (filter === "todo") return task.status === "todo";
-                    if (filter === "inprogress") return task.status === "in_progress";
-                    if (filter === "done") return task.status === "done";
-                    if (filter === "achieved") return task.is_archived === true;
-                    if (filter === "high") return task.priority === "high";
-                    return true;
-                })
                 .filter(
                     (task) =>
                         task.title.toLowerCase().includes(search.toLowerCase()) ||
@@ -185,7 +187,7 @@ const MyTasks = () => {
 
                                                 <div>
                                                     <Link
-                                                        href={`/workspaces/${task.project?.workspace}/projects/${task.project?.id}/tasks/${task.id}`}
+                                                        href={`/workspaces/${task.project?.workspace_id}/projects/${task.project?.id}/tasks/${task.id}`}
                                                         className="font-medium hover:text-primary hover:underline transition-colors flex items-center"
                                                     >
                                                         {task.title}
@@ -255,6 +257,17 @@ const MyTasks = () => {
                                     </div>
                                 )}
                             </div>
+                            {hasNextPage && (
+                                <Button
+                                    variant="ghost"
+                                    size="sm"
+                                    className="mt-4 w-full"
+                                    onClick={() => fetchNextPage()}
+                                    disabled={isFetchingNextPage}
+                                >
+                                    {isFetchingNextPage ? <Loader2 className="h-4 w-4 animate-spin" /> : "Load more"}
+                                </Button>
+                            )}
                         </CardContent>
                     </Card>
                 </TabsContent>
@@ -290,7 +303,7 @@ const TaskColumn = ({ title, tasks }) => (
             {tasks?.map((task) => (
                 <Card key={task.id} className="flex flex-col p-3 hover:shadow-md transition-shadow">
                     <Link
-                        href={`/workspaces/${task.project?.workspace}/projects/${task.project?.id}/tasks/${task.id}`}
+                        href={`/workspaces/${task.project?.workspace_id}/projects/${task.project?.id}/tasks/${task.id}`}
                         className="flex flex-col h-full"
                     >
                         <h3 className="font-medium">{task.title}</h3>
@@ -12,13 +12,26 @@ export default function NotificationsPage() {
     const router = useRouter();
     const [notifications, setNotifications] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
-    const fetchNotifications = async () => {
-        const res = await fetch(`${process.env.NEXT_PUBLIC_BASE_URL}/notifications/`, { headers: { Authorization: `Bearer ${token}` } });
-        if (res.ok) setNotifications(await res.json());
+    const fetchNotifications = async (before = null) => {
+        const query = before ? `?before=${encodeURIComponent(before)}` : "";
+        const res = await fetch(`${process.env.NEXT_PUBLIC_BASE_URL}/notifications/${query}`, { headers: { Authorization: `Bearer ${token}` } });
+        if (res.ok) {
+            const page = await res.json();
+            setNotifications((prev) => before ? [...prev, ...page.items] : page.items);
+            setNextCursor(page.next_cursor);
+        }
         setLoading(false);
     };
 
+    const handleLoadMore = async () => {
+        setLoadingMore(true);
+        await fetchNotifications(nextCursor);
+        setLoadingMore(false);
+    };
+
     useEffect(() => {
         if (!token) return;
         fetchNotifications();
@@ -26,6 +39,10 @@ export default function NotificationsPage() {
         const ws = new WebSocket(wsUrl);
         ws.onmessage = (event) => {
             const newNotif = JSON.parse(event.data);
+            // Answer heartbeats so the server knows we're still here
+            if (newNotif.type === "ping") return ws.send(JSON.stringify({ type: "pong" }));
+            // Server dropped queued messages for this socket, reload the list
+            if (newNotif.type === "resync") return fetchNotifications();
             setNotifications((prev) => [newNotif, ...prev]);
         };
         ws.onclose = () => console.log("WebSocket disconnected");
@@ -37,6 +54,11 @@ export default function NotificationsPage() {
         setNotifications((prev) => prev.map(n => n.id === id ? { ...n, is_read: true } : n));
     };
 
+    const handleMarkAllAsRead = async () => {
+        await fetch(`${process.env.NEXT_PUBLIC_BASE_URL}/notifications/mark-all-read`, { method: "POST", headers: { Authorization: `Bearer ${token}` } });
+        setNotifications((prev) => prev.map(n => ({ ...n, is_read: true })));
+    };
+
     const handleDelete = async (id) => {
         await fetch(`${process.env.NEXT_PUBLIC_BASE_URL}/notifications/${id}`, { method: "DELETE", headers: { Authorization: `Bearer ${token}` } });
         setNotifications((prev) => prev.filter(n => n.id !== id));
@@ -50,6 +72,7 @@ export default function NotificationsPage() {
         <div className="space-y-8">
             <div className="mb-4"><BackButton /></div>
             <h1 className="text-center text-2xl font-semibold">Notifications</h1>
+            {notifications.some(n => !n.is_read) && <div className="flex justify-end"><Button variant="outline" size="sm" onClick={handleMarkAllAsRead}><CheckCircle className="h-4 w-4 mr-2" />Mark all as read</Button></div>}
             <div className="space-y-4">
                 {!notifications.length ? (
                     <div className="text-center py-10 text-muted-foreground">No notifications yet</div>
@@ -67,6 +90,7 @@ export default function NotificationsPage() {
                     </div>
                 ))}
             </div>
+            {nextCursor && <div className="flex justify-center"><Button variant="outline" onClick={handleLoadMore} disabled={loadingMore}>{loadingMore && <Loader2 className="h-4 w-4 mr-2 animate-spin" />}Load more</Button></div>}
         </div>
     );
 }
@@ -1,7 +1,8 @@
 'use client'
 
 import {
-  UseProjectQuery,
+  UseProjectBoardQuery,
+  UseProjectBoardColumnQuery,
   UseArchiveProject,
   UseChangeProjectStatus,
   UseUpdateProjectTitle,
@@ -16,7 +17,6 @@ import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardHeader } from '@/components/ui/card'
 import { Progress } from '@/components/ui/progress'
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs'
-import { getProjectProgress } from '@/lib'
 import { AlertCircle, CheckCircle, Clock, Loader, Calendar, Archive, Edit, Trash2 } from 'lucide-react'
 import { useParams, useRouter } from 'next/navigation'
 import React, { useState } from 'react'
@@ -49,7 +49,7 @@ const ProjectDetails = () => {
   const [pendingRemoveUserId, setPendingRemoveUserId] = useState(null)
   const [selectedRole, setSelectedRole] = useState("contributor")
 
-  const { data, isLoading } = UseProjectQuery(Projectid)
+  const { data, isLoading } = UseProjectBoardQuery(Projectid)
 
   const archiveMutation = UseArchiveProject()
   const statusMutation = UseChangeProjectStatus()
@@ -89,8 +89,11 @@ const ProjectDetails = () => {
     )
   }
 
-  const { project, tasks } = data
-  const projectProgress = getProjectProgress(tasks)
+  const { project, columns } = data
+  // Progress over live tasks, from the column counts
+  const activeCount = ['todo', 'in_progress', 'review', 'done']
+    .reduce((sum, column) => sum + columns[column].count, 0)
+  const projectProgress = activeCount ? Math.round((columns.done.count / activeCount) * 100) : 0
 
   const handleTaskClick = (taskId) => {
     try {
@@ -380,16 +383,16 @@ const ProjectDetails = () => {
               <TabsTrigger value="in_progress" onClick={() => setTaskFilter('in_progress')}>In Progress</TabsTrigger>
               <TabsTrigger value="done" onClick={() => setTaskFilter('done')}>Done</TabsTrigger>
               <TabsTrigger value="archived" onClick={() => setTaskFilter('archived')}>
-                Archived ({tasks.filter((t) => t.is_archived).length})
+                Archived ({columns.archived.count})
               </TabsTrigger>
             </TabsList>
 
             <div className="flex items-center gap-4 flex-wrap">
               <div className="flex items-center text-sm gap-2">
                 <span className="text-muted-foreground">Status:</span>
-                <Badge variant="outline" className="bg-background">{tasks.filter((task) => task.status === 'todo').length} To Do</Badge>
-                <Badge variant="outline" className="bg-background">{tasks.filter((task) => task.status === 'in_progress').length} In Progress</Badge>
-                <Badge variant="outline" className="bg-background">{tasks.filter((task) => task.status === 'done').length} Done</Badge>
+                <Badge variant="outline" className="bg-background">{columns.todo.count} To Do</Badge>
+                <Badge variant="outline" className="bg-background">{columns.in_progress.count} In Progress</Badge>
+                <Badge variant="outline" className="bg-background">{columns.done.count} Done</Badge>
               </div>
 
               <Select value={sortBy} onValueChange={(val) => setSortBy(val)}>
@@ -405,15 +408,15 @@ const ProjectDetails = () => {
           {/* Tasks content */}
           <TabsContent value="all" className="flex-1 m-0">
             <div className="grid grid-cols-1 md:grid-cols-3 gap-4 h-full min-h-0">
-              <TaskColumn title="To Do" tasks={sortTasks(tasks.filter((task) => task.status === "todo"))} onTaskClick={handleTaskClick} />
-              <TaskColumn title="In Progress" tasks={sortTasks(tasks.filter((task) => task.status === "in_progress"))} onTaskClick={handleTaskClick} />
-              <TaskColumn title="Done" tasks={sortTasks(tasks.filter((task) => task.status === "done"))} onTaskClick={handleTaskClick} />
+              <BoardColumn projectId={Projectid} column="todo" board={columns.todo} title="To Do" sortTasks={sortTasks} onTaskClick={handleTaskClick} />
+              <BoardColumn projectId={Projectid} column="in_progress" board={columns.in_progress} title="In Progress" sortTasks={sortTasks} onTaskClick={handleTaskClick} />
+              <BoardColumn projectId={Projectid} column="done" board={columns.done} title="Done" sortTasks={sortTasks} onTaskClick={handleTaskClick} />
             </div>
           </TabsContent>
-          <TabsContent value="todo"><TaskColumn title="To Do" tasks={sortTasks(tasks.filter((t) => t.status === "todo"))} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
-          <TabsContent value="in_progress"><TaskColumn title="In Progress" tasks={sortTasks(tasks.filter((t) => t.status === "in_progress"))} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
-          <TabsContent value="done"><TaskColumn title="Done" tasks={sortTasks(tasks.filter((t) => t.status === "done"))} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
-          <TabsContent value="archived"><TaskColumn title="Archived" tasks={sortTasks(tasks.filter((t) => t.is_archived))} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
+          <TabsContent value="todo"><BoardColumn projectId={Projectid} column="todo" board={columns.todo} title="To Do" sortTasks={sortTasks} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
+          <TabsContent value="in_progress"><BoardColumn projectId={Projectid} column="in_progress" board={columns.in_progress} title="In Progress" sortTasks={sortTasks} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
+          <TabsContent value="done"><BoardColumn projectId={Projectid} column="done" board={columns.done} title="Done" sortTasks={sortTasks} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
+          <TabsContent value="archived"><BoardColumn projectId={Projectid} column="archived" board={columns.archived} title="Archived" sortTasks={sortTasks} onTaskClick={handleTaskClick} isFullWidth /></TabsContent>
         </Tabs>
       </div>
 
@@ -424,13 +427,34 @@ const ProjectDetails = () => {
 
 export default ProjectDetails
 
+// BoardColumn: the cards the board returned plus any loaded with "Load more"
+const BoardColumn = ({ projectId, column, board, title, sortTasks, onTaskClick, isFullWidth = false }) => {
+  const { data, fetchNextPage, hasNextPage, isFetching } = UseProjectBoardColumnQuery(projectId, column, board.next_cursor)
+  const loaded = data?.pages.flatMap((page) => page.items) ?? []
+  const tasks = [...board.items, ...loaded]
+  const hasMore = data ? hasNextPage : !!board.next_cursor
+
+  return (
+    <TaskColumn
+      title={title}
+      count={board.count}
+      tasks={sortTasks(tasks)}
+      onTaskClick={onTaskClick}
+      isFullWidth={isFullWidth}
+      hasMore={hasMore}
+      isLoadingMore={isFetching}
+      onLoadMore={() => fetchNextPage()}
+    />
+  )
+}
+
 // TaskColumn
-const TaskColumn = ({ title, tasks, onTaskClick, isFullWidth = false }) => (
+const TaskColumn = ({ title, count, tasks, onTaskClick, isFullWidth = false, hasMore = false, isLoadingMore = false, onLoadMore }) => (
   <div className="flex flex-col bg-muted/10 rounded-lg p-3 mb-5 shadow">
     {!isFullWidth && (
       <div className="flex items-center justify-between mb-3 sticky top-0 z-10">
         <h1 className="font-medium">{title}</h1>
-        <Badge variant="outline">{tasks.length}</Badge>
+        <Badge variant="outline">{count ?? tasks.length}</Badge>
       </div>
     )}
 
@@ -448,6 +472,12 @@ const TaskColumn = ({ title, tasks, onTaskClick, isFullWidth = false }) => (
         ))
       )}
     </div>
+
+    {hasMore && (
+      <Button variant="ghost" size="sm" className="mt-3" onClick={onLoadMore} disabled={isLoadingMore}>
+        {isLoadingMore ? "Loading..." : "Load more"}
+      </Button>
+    )}
   </div>
 )
 
@@ -513,7 +543,7 @@ const TaskCard = ({ task, onClick }) => {
                     className="relative size-8 bg-gray-700 rounded-full border-2 border-background overflow-hidden"
                     title={member.name}
                   >
-                    <AvatarImage src={member.profilePicture} />
+                    <AvatarImage src={member.profile_picture} />
                     <AvatarFallback>{member.name.charAt(0)}</AvatarFallback>
                   </Avatar>
                 ))}
@@ -534,10 +564,9 @@ const TaskCard = ({ task, onClick }) => {
           )}
         </div>
 
-        {task.subtasks && task.subtasks.length > 0 && (
+        {task.subtask_total > 0 && (
           <div className="mt-2 text-xs text-muted-foreground">
-            {task.subtasks.filter((subtask) => subtask.completed).length} /{" "}
-            {task.subtasks.length} subtasks
+            {task.subtask_done} / {task.subtask_total} subtasks
           </div>
         )}
       </CardContent>
@@ -66,7 +66,7 @@ const WorkspaceCard = ({ workspace }) => {
                         <div className='flex items-center text-muted-foreground'>
                             <Users className='size-4 mr-1' />
                             <span className='text-xs'>
-                                {workspace.members.length}
+                                {workspace.member_count}
                             </span>
                         </div>
                     </div>
@@ -76,7 +76,7 @@ const WorkspaceCard = ({ workspace }) => {
                 </CardHeader>
                 <CardContent>
                     <div className='text-sm text-muted-foreground'>
-                        {"Projects: " + workspace.projects.length || "No projects"}
+                        {"Projects: " + workspace.project_count || "No projects"}
                     </div>
                     <div className='text-sm text-muted-foreground mt-2'>
                         View Workspace details and projects
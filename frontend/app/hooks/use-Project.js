@@ -1,5 +1,5 @@
 import { getData, postData, deleteData, updateData } from '@/lib/fetch-utils'
-import { useMutation, useQueryClient, useQuery } from '@tanstack/react-query'
+import { useMutation, useQueryClient, useQuery, useInfiniteQuery } from '@tanstack/react-query'
 
 /**
  * Create Project inside a workspace
@@ -89,12 +89,29 @@ export const UseToggleProjectMember = () => {
 }
 
 /**
- * Fetch tasks of a project
+ * Fetch a project with its board: task cards grouped by column, the newest
+ * few per column
  */
-export const UseProjectQuery = (projectId) => {
+export const UseProjectBoardQuery = (projectId) => {
     return useQuery({
-        queryKey: ['project', projectId],
-        queryFn: async () => getData(`/projects/${projectId}/tasks`),
+        queryKey: ['project', projectId, 'board'],
+        queryFn: async () => getData(`/projects/${projectId}/board`),
+    })
+}
+
+/**
+ * "Load more" for one board column, continuing from the board's cursor.
+ * Nothing is fetched until fetchNextPage is called.
+ */
+export const UseProjectBoardColumnQuery = (projectId, column, cursor) => {
+    return useInfiniteQuery({
+        queryKey: ['project', projectId, 'board', column, cursor],
+        queryFn: ({ pageParam }) => getData(
+            `/projects/${projectId}/board/${column}?before=${encodeURIComponent(pageParam)}`
+        ),
+        initialPageParam: cursor,
+        getNextPageParam: (lastPage) => lastPage.next_cursor,
+        enabled: false,
     })
 }
 
@@ -1,5 +1,5 @@
 import { deleteData, getData, postData, updateData } from "@/lib/fetch-utils"
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query"
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from "@tanstack/react-query"
 
 // Create Task
 export const useCreateTaskMutation = () => {
@@ -117,17 +117,21 @@ export const useAddCommentMutation = () => {
     return useMutation({
         mutationFn: (data) => postData(`/tasks/${data.taskId}/add-comment`, { text: data.text }),
         onSuccess: (data) => {
-            queryClient.invalidateQueries({ queryKey: ['comments', data.id] })
-            queryClient.invalidateQueries({ queryKey: ['task', data.id] })
+            queryClient.invalidateQueries({ queryKey: ['comments', data.task_id] })
+            queryClient.invalidateQueries({ queryKey: ['task', data.task_id] })
         }
     })
 }
 
 // Comments
 export const useCommentByIdQuery = (taskId) => {
-    return useQuery({
+    return useInfiniteQuery({
         queryKey: ['comments', taskId],
-        queryFn: () => getData(`/tasks/${taskId}/comments`),
+        queryFn: ({ pageParam }) => getData(
+            `/tasks/${taskId}/comments${pageParam ? `?before=${encodeURIComponent(pageParam)}` : ''}`
+        ),
+        initialPageParam: null,
+        getNextPageParam: (lastPage) => lastPage.next_cursor,
         enabled: !!taskId,
     })
 }
@@ -156,10 +160,16 @@ export const useArchivedTaskMutation = () => {
     })
 }
 
-export const useGetMyTasksQuery = () => {
-    return useQuery({
-        queryKey: ['my-tasks', 'user'],
-        queryFn: () => getData('/tasks/mytasks'),
+export const useGetMyTasksQuery = (filters = {}) => {
+    return useInfiniteQuery({
+        queryKey: ['my-tasks', 'user', filters],
+        queryFn: ({ pageParam }) => {
+            const params = new URLSearchParams(filters)
+            if (pageParam) params.set('before', pageParam)
+            return getData(`/tasks/mytasks?${params.toString()}`)
+        },
+        initialPageParam: null,
+        getNextPageParam: (lastPage) => lastPage.next_cursor,
     })
 }
 
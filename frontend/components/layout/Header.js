@@ -47,12 +47,12 @@ const Header = ({
     )
 
     // Notifications
-    const { data: notifications } = useSWR(
-        token ? "/notifications/" : null,
+    const { data: unread } = useSWR(
+        token ? "/notifications/unread-count" : null,
         (url) => fetcher(url, token),
         { refreshInterval: 10000 } // auto-refresh every 10s
     )
-    const unreadCount = notifications?.filter((n) => !n.is_read).length || 0
+    const unreadCount = unread?.count || 0
 
     const handleWorkspaceChange = (workspace) => {
         onWorkspaceSelected(workspace, false)
@@ -12,7 +12,7 @@ import { formatDistanceToNow } from 'date-fns'
 const CommentSection = ({ taskId, members }) => {
     const [newComment, setNewComment] = useState("")
     const { mutate: addComment, isPending: isAdding } = useAddCommentMutation()
-    const { data: comments, isLoading } = useCommentByIdQuery(taskId)
+    const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useCommentByIdQuery(taskId)
     if (isLoading) {
         return (
             <div className="flex justify-center items-center h-screen">
@@ -20,6 +20,7 @@ const CommentSection = ({ taskId, members }) => {
             </div>
         )
     }
+    const comments = data?.pages.flatMap((page) => page.items) ?? []
     const handleAddComment = () => {
         if (!newComment.trim()) return
         addComment({ taskId, text: newComment }, {
@@ -63,6 +64,13 @@ const CommentSection = ({ taskId, members }) => {
                         <p className='text-sm text-muted-foreground'>No comments yet</p>
                     </div>)
                 }
+                {
+                    hasNextPage && (
+                        <Button variant='ghost' size='sm' className='mt-2 w-full' onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                            {isFetchingNextPage ? <Loader className='animate-spin' /> : 'Show older comments'}
+                        </Button>
+                    )
+                }
             </ScrollArea>
 
             <Separator className='my-4' />
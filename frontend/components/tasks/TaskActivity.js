@@ -1,16 +1,22 @@
 import { getData } from '@/lib/fetch-utils'
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { Loader } from 'lucide-react'
 import React from 'react'
+import { Button } from '@/components/ui/button'
 import { getActivityIcon } from './TaskIcon'
 
 const TaskActivity = ({ resourceId }) => {
-    const { data, isPending } = useQuery({
+    const { data, isPending, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
         queryKey: ['task-activity', resourceId],
-        queryFn: () => getData(`/tasks/${resourceId}/activity`),
+        queryFn: ({ pageParam }) => getData(
+            `/tasks/${resourceId}/activity${pageParam ? `?before=${encodeURIComponent(pageParam)}` : ''}`
+        ),
+        initialPageParam: null,
+        getNextPageParam: (lastPage) => lastPage.next_cursor,
     })
 
     if (isPending) return <Loader className='animate-spin' />
+    const activities = data.pages.flatMap((page) => page.items)
     return (
 
         <div className='bg-card rounded-lg p-6 shadow-sm'>
@@ -18,7 +24,7 @@ const TaskActivity = ({ resourceId }) => {
 
             <div className='space-y-4'>
                 {
-                    data.map((activity) => (
+                    activities.map((activity) => (
                         <div key={activity.id} className='flex gap-2'>
                             <div className='size-8 rounded-full flex items-center justify-center text-primary'>
                                 {
@@ -37,8 +43,15 @@ const TaskActivity = ({ resourceId }) => {
                     ))
                 }
             </div>
+            {
+                hasNextPage && (
+                    <Button variant='ghost' size='sm' className='mt-4 w-full' onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                        {isFetchingNextPage ? <Loader className='animate-spin' /> : 'Show older activity'}
+                    </Button>
+                )
+            }
         </div>
     )
 }
 
-export default TaskActivity
\ No newline at end of file
+export default TaskActivity